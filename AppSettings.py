@@ -0,0 +1,117 @@
+# AppSettings.py
+"""GUI(main.py)와 헤드리스 실행(headless.py, benchmark.py)이 함께 쓰는 기본 설정값과 설정 파일 경로 (Tk에 의존하지 않음)"""
+import os
+
+from CaptureBackend import CAPTURE_BACKENDS
+from OcrEngine import OCR_ENGINES
+from TranslationBackend import TRANSLATION_BACKENDS, DEFAULT_LOCAL_URL
+from PipelineStats import STATS_EXPORT_FORMATS
+from SessionLogWriter import SESSION_LOG_FORMATS
+
+# 이미지/변화 감지 선택지는 PIL, numpy 없이 설정 화면을 띄울 수 있도록 여기서 정의 (ImageEncoder, FrameChangeDetector가 사용)
+IMAGE_FORMATS = ["JPEG", "WEBP", "PNG"]
+RESAMPLE_FILTERS = [
+    "LANCZOS", # 가장 선명하지만 느림 (기존 기본값)
+    "BICUBIC",
+    "BILINEAR",
+    "NEAREST", # 가장 빠름, 글자 가장자리가 거칠어질 수 있음
+]
+CHANGE_DETECTION_METHODS = ["dhash", "ahash", "diff"]
+
+CONFIG_FILE = 'transconfig.ini'
+CACHE_FILE = os.path.join(os.path.dirname(CONFIG_FILE), 'translation_cache.db')
+MEMORY_FILE = os.path.join(os.path.dirname(CONFIG_FILE), 'translation_memory.db')
+DEFAULT_PROMPT = "이 이미지의 일본어를 한국어로 번역해줘. 다른 설명이나 마크다운 없이 오직 한국어 번역문만 제공해줘."
+DEFAULT_TEXT_PROMPT = "다음 일본어 텍스트를 한국어로 번역해줘. 다른 설명이나 마크다운 없이 오직 한국어 번역문만 제공해줘."
+GEMINI_MODELS = [
+    "gemini-2.0-flash-lite",
+    "gemini-2.0-flash",
+    "gemini-1.5-flash",
+]
+# 모델별 기본 요청 한도 (무료 등급 기준). 설정 파일 [Quota] 섹션에서 '모델 = rpm,tpm,rpd' 형식으로 변경 가능
+GEMINI_MODEL_QUOTAS = {
+    "gemini-2.0-flash-lite": {"rpm": 30, "tpm": 1000000, "rpd": 1500},
+    "gemini-2.0-flash": {"rpm": 15, "tpm": 1000000, "rpd": 1500},
+    "gemini-1.5-flash": {"rpm": 15, "tpm": 1000000, "rpd": 1500},
+}
+
+DEFAULT_APP_SETTINGS = {
+    "api_key": "",
+    "prompt": DEFAULT_PROMPT,
+    "model": GEMINI_MODELS[0],
+    "interval": 0.5,
+    "max_concurrent_requests": 1,
+    "use_streaming": False,
+    "translation_backend": TRANSLATION_BACKENDS[0],
+    "local_url": DEFAULT_LOCAL_URL,
+    "local_model": "",
+    "pool_api_keys": "", # 함께 쓸 추가 API 키 (쉼표 구분). 키/모델이 둘 이상이면 요청을 나눠 보내고 할당량 오류 시 자동 전환
+    "pool_models": "", # 선택한 모델 다음으로 사용할 모델 (쉼표 구분, 우선순위 순)
+    "hedge_requests": False, # 응답이 늦으면 중복 요청을 보내 먼저 온 응답 사용
+    "hedge_percentile": 95, # 최근 응답 시간의 이 백분위수를 넘기면 중복 요청
+    "hedge_max_extra_rate": 0.1, # 중복 요청은 전체 요청의 이 비율까지만
+    "hedge_alternate_model": "", # 중복 요청에 쓸 모델 (비우면 같은 모델)
+    "warm_up_backend": True, # 키/모델이 정해지면 백그라운드에서 클라이언트를 만들고 연결을 미리 맺어 둠
+    "use_resize": True,
+    "resize_percentage": 50,
+    "resample_filter": "LANCZOS",
+    "image_format": IMAGE_FORMATS[0],
+    "image_quality": 75,
+    "grayscale": False,
+    "autocontrast": False,
+    "binarize": False,
+    "auto_crop": False,
+    "change_method": CHANGE_DETECTION_METHODS[0],
+    "change_threshold": 6,
+    "ignore_regions": "",
+    "settle_time": 0.4, # 글자 출력(타자 효과)이 멈춘 뒤 요청하기까지 대기 (초, 0이면 변화 즉시 요청)
+    "max_settle_time": 3.0, # 계속 움직이는 화면도 이 시간이 지나면 요청
+    "use_cache": True,
+    "cache_max_entries": 5000,
+    "cache_max_age_days": 30,
+    "use_translation_memory": True,
+    "memory_fuzzy_threshold": 0.9,
+    "stats_export_format": STATS_EXPORT_FORMATS[0],
+    "stats_export_path": "translator_stats.jsonl",
+    "stats_export_interval": 10,
+    "history_max_lines": 500,
+    "session_log_format": SESSION_LOG_FORMATS[0],
+    "session_log_dir": "sessions",
+    "ocr_engine": OCR_ENGINES[0],
+    "ocr_language": "jpn",
+    "ocr_text_only": False,
+    "capture_backend": CAPTURE_BACKENDS[0],
+    "replay_dir": "",
+    "overlay_font_family": 'Malgun Gothic',
+    "overlay_font_size": 40,
+    "overlay_font_color": '#FFFFFF',
+    "overlay_bg_color": '#000000',
+    "overlay_alpha": 0.7,
+    "overlay_x": 100,
+    "overlay_y": 100,
+    "overlay_width": 1200,
+    "overlay_height": 250,
+}
+
+def parse_quota_section(config, model_quotas):
+    """설정 파일 [Quota] 섹션의 '모델 = rpm,tpm,rpd' 값으로 model_quotas를 갱신"""
+    if not config.has_section('Quota'): return model_quotas
+    for model, value in config.items('Quota'):
+        try:
+            rpm, tpm, rpd = (int(v) for v in value.split(','))
+            model_quotas[model] = {"rpm": rpm, "tpm": tpm, "rpd": rpd}
+        except ValueError: print(f"[Quota] 설정 형식 오류 (건너뜀): {model} = {value}")
+    return model_quotas
+
+def parse_ignore_regions(text):
+    """'x,y,w,h; x,y,w,h' 형식의 문자열을 좌표 튜플 목록으로 변환"""
+    regions = []
+    for chunk in (text or "").split(';'):
+        chunk = chunk.strip()
+        if not chunk: continue
+        try:
+            x, y, w, h = (int(v) for v in chunk.split(','))
+        except ValueError:
+            print(f"무시 영역 형식 오류 (건너뜀): {chunk}"); continue
+        if w > 0 and h > 0: regions.append((x, y, w, h))
+    return regions
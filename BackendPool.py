@@ -0,0 +1,158 @@
+# BackendPool.py
+import math
+import time
+import threading
+from collections import deque
+
+from TranslationBackend import TranslationBackend, QuotaExceededError, is_transient_error, get_translation_backend
+from AppSettings import GEMINI_MODELS, GEMINI_MODEL_QUOTAS, DEFAULT_APP_SETTINGS
+
+DEFAULT_QUOTA_COOLDOWN = 60.0 # 할당량 오류에 재시도 대기 시간이 없을 때 쉬는 시간 (초)
+DAILY_QUOTA_COOLDOWN = 3600.0 # 일일 한도 초과는 한 시간마다 다시 확인
+ERROR_COOLDOWN = 5.0 # 일시적 오류(네트워크, 서버 5xx)는 연속 실패 횟수만큼 늘려서 쉼 (최대 MAX_ERROR_COOLDOWN)
+MAX_ERROR_COOLDOWN = 120.0
+ERROR_RATE_SMOOTHING = 0.2 # 오류율 지수 이동 평균의 가중치
+
+def parse_key_list(text):
+    """쉼표/줄바꿈으로 구분된 API 키 또는 모델 목록 (빈 항목과 중복 제거, 순서 유지)"""
+    items = []
+    for item in (text or "").replace('\n', ',').split(','):
+        item = item.strip()
+        if item and item not in items: items.append(item)
+    return items
+
+def model_quota(model_quotas, model):
+    return model_quotas.get(model, GEMINI_MODEL_QUOTAS[DEFAULT_APP_SETTINGS["model"]])
+
+def translation_backend_plan(backend_name, model_quotas, keys=(), model=None, fallback_models="", local_url=None, local_model=None):
+    """[(get_translation_backend 인자, 표시 이름, 분당 요청 한도, 모델 우선순위)]. Gemini 키/모델이 여러 개면 키 x 모델 조합 전체.
+    GUI(main.py)와 명령줄 도구(headless.py 등)가 같은 규칙으로 풀을 구성하도록 함께 사용"""
+    if backend_name != "gemini":
+        options = {'name': backend_name, 'api_key': keys[0] if keys else None, 'model': local_model, 'base_url': local_url}
+        return [(options, local_url, 0, 0)]
+    models = [model] + [name for name in parse_key_list(fallback_models) if name in GEMINI_MODELS and name != model]
+    plan = []
+    for rank, name in enumerate(models):
+        rpm = model_quota(model_quotas, name)['rpm']
+        for index, key in enumerate(keys or [""]):
+            plan.append(({'name': "gemini", 'api_key': key, 'model': name}, f"{name} #{index + 1}", rpm, rank))
+    return plan
+
+def plan_quota(plan, model_quotas):
+    """파이프라인에 줄 요청 한도. 키 x 모델마다 한도가 따로 있으므로 풀 전체의 한도는 합계 (로컬 서버는 할당량 없음)"""
+    quota = {"rpm": 0, "tpm": 0, "rpd": 0}
+    for options, _, _, _ in plan:
+        if options['name'] != "gemini": continue
+        for name in quota: quota[name] += model_quota(model_quotas, options['model'])[name]
+    return quota
+
+def create_planned_backend(plan):
+    # 이미 만든 클라이언트는 get_translation_backend가 재사용하고, 풀의 상태(오류율/대기)는 번역을 시작할 때마다 새로 시작
+    backends = [(get_translation_backend(**options), label, rpm, rank) for options, label, rpm, rank in plan]
+    return backends[0][0] if len(backends) == 1 else BackendPool(backends)
+
+class PoolMember:
+    """풀에 속한 백엔드 하나 (API 키 x 모델)의 상태"""
+
+    def __init__(self, backend, label, rpm=0, rank=0):
+        self.backend = backend
+        self.label = label # 화면 표시용 ('모델 #키 번호', 키 자체는 표시하지 않음)
+        self.rpm = rpm
+        self.rank = rank # 모델 우선순위 (작을수록 먼저 사용)
+        self.recent = deque() # 최근 60초 요청 시각
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.quota_limited = False # 할당량 초과로 쉬는 중인지 (일시적 오류로 쉬는 백엔드는 다른 백엔드가 없으면 다시 시도)
+        self.consecutive_errors = 0
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def load(self, now):
+        """분당 한도 대비 최근 요청 비율 (한도가 없으면 진행 중인 요청 수로만 비교)"""
+        while self.recent and self.recent[0] <= now - 60: self.recent.popleft()
+        if not self.rpm: return 0.0
+        return (len(self.recent) + self.in_flight) / self.rpm
+
+    def is_available(self, now):
+        return now >= self.cooldown_until and (not self.rpm or self.load(now) < 1.0)
+
+class BackendPool(TranslationBackend):
+    """여러 API 키와 모델의 백엔드를 묶어 요청을 나눠 보내고, 할당량 오류나 일시적 오류가 난 백엔드는 잠시 빼고 다음 백엔드로 재시도.
+    그 밖의 오류(잘못된 요청 등)는 다른 백엔드로 넘기지 않고 그대로 전달. 결과의 model은 실제로 응답한 백엔드의 모델.
+    members: [(백엔드, 표시 이름, 분당 요청 한도, 모델 우선순위)]. 모든 백엔드가 할당량 대기 중이면 가장 빨리 돌아오는 시간을 담은 QuotaExceededError"""
+    name = "pool"
+
+    def __init__(self, members):
+        if not members: raise ValueError("풀에 사용할 백엔드가 없습니다.")
+        self.members = [PoolMember(backend, label, rpm, rank) for backend, label, rpm, rank in members]
+        self.model = self.members[0].backend.model
+        self._lock = threading.Lock()
+
+    def _acquire(self, tried):
+        now = time.monotonic()
+        with self._lock:
+            candidates = [member for member in self.members if member not in tried and now >= member.cooldown_until]
+            # 일시적 오류로 쉬는 백엔드만 남았으면 그대로 시도해 실제 오류를 전달 (할당량 초과만 확실히 제외)
+            if not candidates: candidates = [member for member in self.members if member not in tried and not member.quota_limited]
+            if not candidates: return None
+            # 분당 한도에 여유가 있는 백엔드 중 우선순위가 높은 모델 → 부하가 적고 오류율이 낮은 키 순서
+            available = [member for member in candidates if member.is_available(now)] or candidates
+            member = min(available, key=lambda m: (m.rank, m.load(now) + m.error_rate, m.in_flight))
+            member.in_flight += 1; member.requests += 1
+            member.recent.append(now)
+            return member
+
+    def _release(self, member, error=None, bench=True):
+        now = time.monotonic()
+        with self._lock:
+            member.in_flight -= 1
+            member.error_rate += ERROR_RATE_SMOOTHING * ((1.0 if error else 0.0) - member.error_rate)
+            if error is None: member.consecutive_errors = 0; member.quota_limited = False; return
+            member.failures += 1
+            if not bench: return
+            member.consecutive_errors += 1
+            member.quota_limited = isinstance(error, QuotaExceededError)
+            if member.quota_limited:
+                details = error.details or {}
+                if "PerDay" in details.get("quota_id", ""): cooldown = DAILY_QUOTA_COOLDOWN
+                else:
+                    try: cooldown = float(error.retry_delay)
+                    except (TypeError, ValueError): cooldown = DEFAULT_QUOTA_COOLDOWN
+            else: cooldown = min(MAX_ERROR_COOLDOWN, ERROR_COOLDOWN * member.consecutive_errors)
+            member.cooldown_until = max(member.cooldown_until, now + cooldown)
+            print(f"{member.label} 일시 제외 ({cooldown:.0f}초): {type(error).__name__}")
+
+    def translate(self, prompt, source_text=None, image=None, on_partial=None):
+        tried = set()
+        last_error = None
+        while True:
+            member = self._acquire(tried)
+            if member is None: break
+            tried.add(member)
+            try: result = member.backend.translate(prompt, source_text=source_text, image=image, on_partial=on_partial)
+            except QuotaExceededError as e: self._release(member, e); last_error = e; continue
+            except Exception as e:
+                # 요청 자체의 문제는 다른 키/모델로 보내도 같으므로 백엔드를 빼지 않고 원래 오류를 그대로 전달
+                if not is_transient_error(e): self._release(member, e, bench=False); raise
+                self._release(member, e); last_error = e; continue
+            self._release(member)
+            if result is not None and result.model is None: result.model = member.backend.model
+            return result
+        if last_error is not None and not isinstance(last_error, QuotaExceededError): raise last_error
+        wait = max(1, math.ceil(min(member.cooldown_until for member in self.members) - time.monotonic()))
+        raise QuotaExceededError("모든 API 키/모델이 할당량 대기 중입니다.", {"quota_id": "BackendPool", "retry_delay": str(wait)})
+
+    def warm_up(self):
+        for member in self.members:
+            try: member.backend.warm_up()
+            except Exception as e: print(f"{member.label} 미리 연결 실패: {type(e).__name__} - {e}")
+
+    def status(self):
+        """멤버별 상태 (통계 패널 표시용)"""
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                'label': member.label, 'requests': member.requests, 'failures': member.failures,
+                'error_rate': member.error_rate, 'cooldown': max(0.0, member.cooldown_until - now), 'load': member.load(now),
+            } for member in self.members]
@@ -0,0 +1,124 @@
+# CaptureBackend.py
+import os
+import threading
+
+CAPTURE_BACKENDS = ["pyautogui", "mss", "replay"]
+REPLAY_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+
+def crop_region(image, region):
+    """저장된 화면 이미지에서 영역을 잘라냄. 영역이 이미지 밖으로 나가면(이미 잘라 둔 이미지 등) 전체를 그대로 사용"""
+    if region and region['left'] + region['width'] <= image.width and region['top'] + region['height'] <= image.height:
+        return image.crop((region['left'], region['top'], region['left'] + region['width'], region['top'] + region['height']))
+    return image
+
+class CaptureBackend:
+    """화면 캡처 방식 공통 인터페이스. grab()은 RGB PIL 이미지를 반환 (리플레이가 끝나면 None)"""
+    name = None
+
+    def grab(self, region):
+        raise NotImplementedError
+
+    def grab_regions(self, regions):
+        """같은 순간의 여러 영역 이미지 목록 (하나라도 None이면 None)"""
+        images = [self.grab(region) for region in regions]
+        return None if any(image is None for image in images) else images
+
+    def screen_size(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class PyAutoGuiCapture(CaptureBackend):
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def grab(self, region):
+        image = self._pyautogui.screenshot(region=(region['left'], region['top'], region['width'], region['height']))
+        return image.convert('RGB') if image.mode != 'RGB' else image
+
+    def screen_size(self):
+        return tuple(self._pyautogui.size())
+
+class MssCapture(CaptureBackend):
+    """mss(X11 XShm/GDI/CoreGraphics)로 캡처. mss 핸들은 만든 스레드에서만 써야 하므로 스레드별로 재사용"""
+    name = "mss"
+
+    def __init__(self):
+        import mss
+        from PIL import Image # 설정 화면만 띄울 때는 불러오지 않도록 캡처 방식을 만들 때 불러옴
+        self._mss = mss
+        self._image = Image
+        self._local = threading.local()
+
+    def _handle(self):
+        handle = getattr(self._local, 'handle', None)
+        if handle is None:
+            handle = self._local.handle = self._mss.mss()
+        return handle
+
+    def grab(self, region):
+        shot = self._handle().grab(region)
+        # BGRA 원본 버퍼에서 RGB로 한 번에 디코딩 (RGBA 이미지를 만든 뒤 다시 convert 하지 않음)
+        return self._image.frombuffer('RGB', shot.size, shot.bgra, 'raw', 'BGRX')
+
+    def screen_size(self):
+        monitor = self._handle().monitors[1] # 0번은 전체 가상 화면, 1번이 주 모니터
+        return monitor['width'], monitor['height']
+
+    def close(self):
+        handle = getattr(self._local, 'handle', None)
+        if handle is not None:
+            handle.close(); self._local.handle = None
+
+class ReplayCapture(CaptureBackend):
+    """폴더에 저장된 이미지를 이름순으로 한 장씩 돌려주는 테스트/재현용 캡처"""
+    name = "replay"
+
+    def __init__(self, replay_dir, loop=True):
+        if not replay_dir or not os.path.isdir(replay_dir):
+            raise ValueError(f"리플레이 폴더를 찾을 수 없습니다: {replay_dir}")
+        self.paths = sorted(
+            os.path.join(replay_dir, name) for name in os.listdir(replay_dir)
+            if name.lower().endswith(REPLAY_IMAGE_EXTENSIONS)
+        )
+        if not self.paths:
+            raise ValueError(f"리플레이 폴더에 이미지가 없습니다: {replay_dir}")
+        from PIL import Image
+        self._image = Image
+        self.loop = loop
+        self.position = 0
+        self._lock = threading.Lock()
+
+    def _next_frame(self):
+        with self._lock:
+            if self.position >= len(self.paths):
+                if not self.loop: return None
+                self.position = 0
+            path = self.paths[self.position]; self.position += 1
+        with self._image.open(path) as image:
+            return image.convert('RGB')
+
+    def grab(self, region):
+        image = self._next_frame()
+        return crop_region(image, region) if image is not None else None
+
+    def grab_regions(self, regions):
+        # 한 프레임에서 모든 영역을 잘라냄 (영역마다 다음 프레임으로 넘어가지 않도록)
+        image = self._next_frame()
+        return [crop_region(image, region) for region in regions] if image is not None else None
+
+    def screen_size(self):
+        with self._image.open(self.paths[0]) as image:
+            return image.size
+
+def create_capture_backend(name, replay_dir=None):
+    if name == "replay":
+        return ReplayCapture(replay_dir)
+    if name == "mss":
+        try: return MssCapture()
+        except ImportError: print("mss 패키지가 없어 pyautogui 캡처를 사용합니다. (pip install mss)")
+    return PyAutoGuiCapture()
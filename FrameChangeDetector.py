@@ -0,0 +1,116 @@
+# FrameChangeDetector.py
+import time
+import numpy as np
+from PIL import Image
+
+from AppSettings import CHANGE_DETECTION_METHODS
+DIFF_PIXEL_THRESHOLD = 24 # diff 방식에서 '바뀐 픽셀'로 볼 밝기 차이
+
+def _thumbnail(image, width, extra_column=False):
+    # 글자 모양이 뭉개지지 않도록 원본 비율을 유지한 가로 width 크기의 흑백 썸네일
+    height = min(64, max(8, round(width * image.height / max(1, image.width))))
+    small = image.convert('L').resize((width + 1 if extra_column else width, height), Image.BILINEAR)
+    return np.asarray(small, dtype=np.int16)
+
+class FrameChangeDetector:
+    """축소된 흑백 썸네일을 비교해 화면 변화 여부를 판단 (커서 깜빡임, 작은 애니메이션 등은 무시)
+
+    settle_time > 0이면 글자가 한 자씩 출력되는 동안은 요청하지 않고, 변화가 시작된 뒤 연속 프레임 사이에
+    settle_time초 동안 변화가 없을 때(또는 변화가 계속되어도 max_settle_time초가 지나면) 한 번만 True를 반환
+    """
+
+    def __init__(self, method="dhash", threshold=6, hash_width=64, ignore_regions=None, settle_time=0.0, max_settle_time=3.0):
+        if method not in CHANGE_DETECTION_METHODS:
+            raise ValueError(f"지원하지 않는 변화 감지 방식: {method}")
+        self.method = method
+        self.threshold = threshold # 썸네일에서 달라진 칸 수 (dhash/ahash: 비트, diff: 밝기 차이가 큰 픽셀)
+        self.hash_width = hash_width
+        self.ignore_regions = ignore_regions or [] # 영역 기준 픽셀 좌표 (x, y, w, h) 목록
+        self._mask_cache = {} # (원본 크기) -> 썸네일 크기의 유효 픽셀 마스크
+        self._reference = None # 마지막으로 '변화'로 판정된 프레임의 지문
+        self.settle_time = settle_time
+        self.max_settle_time = max(settle_time, max_settle_time)
+        self._previous = None # 직전 프레임의 지문 (출력이 아직 진행 중인지 판단용)
+        self._change_started = None # 기준과 달라지기 시작한 시각. None이면 안정 상태
+        self._last_change = None # 연속 프레임 사이에 마지막으로 변화가 있었던 시각
+
+    @property
+    def is_settling(self):
+        """변화가 감지되어 화면이 멈추기를 기다리는 중인지"""
+        return self._change_started is not None
+
+    def reset(self):
+        self._reference = None
+        self._previous = None
+        self._change_started = self._last_change = None
+
+    def thumbnail(self, image):
+        """비교용 흑백 썸네일을 NumPy 배열로 반환 (dhash는 가로 1픽셀 더 큼)"""
+        return _thumbnail(image, self.hash_width, extra_column=(self.method == "dhash"))
+
+    def _ignore_mask(self, image_size, thumb_shape):
+        key = (image_size, thumb_shape)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = np.ones(thumb_shape, dtype=bool)
+            img_w, img_h = image_size
+            rows, cols = thumb_shape
+            for x, y, w, h in self.ignore_regions:
+                # 원본 좌표를 썸네일 좌표로 변환 (조금이라도 겹치는 칸은 모두 제외)
+                c1 = int(np.floor(x / img_w * cols)); c2 = int(np.ceil((x + w) / img_w * cols))
+                r1 = int(np.floor(y / img_h * rows)); r2 = int(np.ceil((y + h) / img_h * rows))
+                mask[max(0, r1):max(0, r2), max(0, c1):max(0, c2)] = False
+            self._mask_cache[key] = mask
+        return mask
+
+    def fingerprint(self, image):
+        """프레임 지문 계산. dhash/ahash는 bool 비트 배열, diff는 썸네일 밝기 배열"""
+        thumb = self.thumbnail(image)
+        if self.method == "dhash":
+            bits = thumb[:, 1:] > thumb[:, :-1]
+        elif self.method == "ahash":
+            bits = thumb > thumb.mean()
+        else:
+            bits = thumb
+        if self.ignore_regions:
+            mask = self._ignore_mask(image.size, bits.shape)
+            bits = np.where(mask, bits, 0).astype(bits.dtype)
+        return bits
+
+    def distance(self, fp_a, fp_b):
+        if fp_a is None or fp_b is None or fp_a.shape != fp_b.shape:
+            return float('inf')
+        if self.method == "diff":
+            return int(np.count_nonzero(np.abs(fp_a - fp_b) > DIFF_PIXEL_THRESHOLD))
+        return int(np.count_nonzero(fp_a != fp_b))
+
+    def has_changed(self, image, now=None):
+        """기준 프레임과 비교해 임계값을 넘으면 (settle_time이 있으면 화면이 멈춘 뒤) 기준을 갱신하고 True 반환"""
+        current = self.fingerprint(image)
+        if self.settle_time <= 0:
+            if self.distance(current, self._reference) > self.threshold:
+                self._reference = current
+                return True
+            return False
+        now = time.monotonic() if now is None else now
+        previous, self._previous = self._previous, current
+        if self._change_started is None:
+            # 안정 상태: 기준과 달라지면 대기 상태로 전환
+            if self.distance(current, self._reference) <= self.threshold: return False
+            self._change_started = self._last_change = now
+            return False
+        # 대기 상태: 직전 프레임과 달라졌으면 아직 출력 중 (프레임 사이에 늘어나는 글자는 몇 자뿐이므로 임계값의 1/4로 판단)
+        if self.distance(current, previous) > self.threshold // 4: self._last_change = now
+        if now - self._last_change < self.settle_time and now - self._change_started < self.max_settle_time: return False
+        self._change_started = self._last_change = None
+        if self.distance(current, self._reference) <= self.threshold: return False # 잠깐 바뀌었다가 원래 화면으로 돌아온 경우
+        self._reference = current
+        return True
+
+def format_ignore_regions(regions):
+    return "; ".join(f"{x},{y},{w},{h}" for x, y, w, h in regions)
+
+def image_fingerprint(image, hash_width=64):
+    """캐시 키 등에 쓰는 dHash 지문을 16진수 문자열로 반환"""
+    thumb = _thumbnail(image, hash_width, extra_column=True)
+    return np.packbits(thumb[:, 1:] > thumb[:, :-1]).tobytes().hex()
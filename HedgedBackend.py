@@ -0,0 +1,114 @@
+# HedgedBackend.py
+import time
+import queue
+import threading
+from collections import deque
+
+from TranslationBackend import TranslationBackend
+from PipelineStats import percentile
+
+MAX_HEDGE_BURST = 3.0 # 추가 요청 예산이 쌓일 수 있는 최대치 (연속으로 보낼 수 있는 중복 요청 수)
+
+class _Race:
+    """한 번의 번역에서 원래 요청과 중복 요청이 결과를 주고받는 곳"""
+
+    def __init__(self, on_partial):
+        self.on_partial = on_partial
+        self.results = queue.Queue()
+        self.finished = False
+        self.streamer = None # 부분 번역문을 화면에 보내는 요청 (먼저 조각을 보낸 쪽)
+        self._lock = threading.Lock()
+
+    def partial(self, attempt, text):
+        with self._lock:
+            if self.finished: return False # 결과가 정해졌으므로 나머지 스트림은 중단
+            if self.streamer is None: self.streamer = attempt
+            if self.streamer != attempt: return None # 다른 요청의 조각은 표시하지 않고 계속 받음
+        return self.on_partial(text)
+
+    def finish(self):
+        with self._lock: self.finished = True
+
+class HedgedBackend(TranslationBackend):
+    """요청이 최근 응답 시간의 hedge_percentile 백분위수 안에 끝나지 않으면 같은(또는 alternate) 백엔드로 한 번 더 보내고 먼저 온 응답을 사용.
+    늦은 쪽은 스트리밍이면 중단하고, 아니면 응답을 버림. 중복 요청은 전체 요청의 max_extra_rate 비율을 넘지 않고,
+    set_request_gate로 등록된 요청 한도에 여유가 없으면 보내지 않음"""
+    name = "hedged"
+
+    def __init__(self, backend, alternate=None, hedge_percentile=95, max_extra_rate=0.1, min_samples=20, min_delay=0.3, window=200):
+        self.backend = backend
+        self.alternate = alternate or backend
+        self.model = backend.model
+        self.hedge_percentile = hedge_percentile
+        self.max_extra_rate = max_extra_rate
+        self.min_samples = min_samples # 응답 시간 표본이 이만큼 모이기 전에는 중복 요청하지 않음
+        self.min_delay = min_delay
+        self._latencies = deque(maxlen=window)
+        self._budget = 0.0
+        self._request_gate = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0 # 보낸 중복 요청 수
+        self.hedge_wins = 0 # 중복 요청이 먼저 도착한 횟수
+
+    def hedge_delay(self):
+        """중복 요청을 보내기까지 기다릴 시간 (표본이 부족하면 None)"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples: return None
+            return max(self.min_delay, percentile(sorted(self._latencies), self.hedge_percentile))
+
+    def _attempt(self, race, attempt, backend, prompt, source_text, image):
+        started = time.monotonic()
+        on_partial = (lambda text: race.partial(attempt, text)) if race.on_partial else None
+        try:
+            result = backend.translate(prompt, source_text=source_text, image=image, on_partial=on_partial)
+            # 늦게 끝난 요청의 시간도 기록해야 분포가 중복 요청 때문에 짧게 잘리지 않음 (중단된 스트림은 제외)
+            if result is not None:
+                with self._lock: self._latencies.append(time.monotonic() - started)
+            race.results.put((attempt, result, None))
+        except Exception as e: race.results.put((attempt, None, e))
+
+    def _start(self, race, attempt, backend, prompt, source_text, image):
+        threading.Thread(
+            target=self._attempt, args=(race, attempt, backend, prompt, source_text, image), name=f"hedged-request-{attempt}", daemon=True
+        ).start()
+
+    def set_request_gate(self, gate):
+        self._request_gate = gate
+
+    def _take_budget(self):
+        with self._lock:
+            if self._budget < 1.0: return False
+            # 중복 요청도 분당/일일 요청 수와 토큰 한도에 포함되므로 한도에 여유가 있을 때만 보냄
+            if self._request_gate is not None and not self._request_gate(): return False
+            self._budget -= 1.0; self.hedged += 1
+            return True
+
+    def translate(self, prompt, source_text=None, image=None, on_partial=None):
+        with self._lock:
+            self.requests += 1
+            self._budget = min(MAX_HEDGE_BURST, self._budget + self.max_extra_rate)
+        delay = self.hedge_delay()
+        race = _Race(on_partial)
+        self._start(race, 0, self.backend, prompt, source_text, image)
+        try: attempt, result, error = race.results.get(timeout=delay)
+        except queue.Empty:
+            if not self._take_budget(): attempt, result, error = race.results.get()
+            else:
+                self._start(race, 1, self.alternate, prompt, source_text, image)
+                attempt, result, error = race.results.get()
+                if error is not None: attempt, result, error = race.results.get() # 먼저 끝난 쪽이 실패하면 남은 쪽을 기다림
+                if attempt == 1 and error is None:
+                    with self._lock: self.hedge_wins += 1
+        race.finish()
+        if error is not None: raise error
+        return result
+
+    def warm_up(self):
+        self.backend.warm_up()
+        if self.alternate is not self.backend: self.alternate.warm_up()
+
+    def status(self):
+        with self._lock: requests, hedged, wins = self.requests, self.hedged, self.hedge_wins
+        delay = self.hedge_delay()
+        return {'requests': requests, 'hedged': hedged, 'hedge_wins': wins, 'delay': delay}
@@ -0,0 +1,99 @@
+# ImageEncoder.py
+import io
+import time
+import numpy as np
+from PIL import Image, ImageOps
+
+from AppSettings import IMAGE_FORMATS, RESAMPLE_FILTERS
+
+IMAGE_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+RESAMPLE_FILTER_VALUES = {name: getattr(Image, name) for name in RESAMPLE_FILTERS}
+CROP_EDGE_THRESHOLD = 48 # 이웃 픽셀과 밝기 차이가 이 이상이면 윤곽선(글자 획 후보)으로 봄
+CROP_MIN_DENSITY = 0.02 # 행/열에서 윤곽선 픽셀 비율이 이 이상이어야 글자가 있는 줄로 봄
+CROP_MIN_SAVING = 0.1 # 잘라서 줄어드는 면적이 이보다 작으면 자르지 않음
+
+def _active_span(profile, smooth=5):
+    # 글자 줄 사이 빈 줄에서 끊기지 않도록 이동 평균으로 다듬은 뒤, 밀도가 기준 이상인 첫/마지막 위치
+    if len(profile) > smooth: profile = np.convolve(profile, np.ones(smooth) / smooth, mode='same')
+    active = np.flatnonzero(profile >= max(CROP_MIN_DENSITY, profile.max() * 0.15))
+    return (int(active[0]), int(active[-1]) + 1) if active.size else None
+
+def find_text_bbox(image):
+    """윤곽선 밀도의 행/열 투영으로 글자가 모여 있는 영역 (left, top, right, bottom)을 찾음. 없으면 None"""
+    gray = np.asarray(image.convert('L'), dtype=np.int16)
+    if gray.shape[0] < 8 or gray.shape[1] < 8: return None
+    edges = np.zeros(gray.shape, dtype=bool)
+    edges[:, 1:] |= np.abs(np.diff(gray, axis=1)) > CROP_EDGE_THRESHOLD
+    edges[1:, :] |= np.abs(np.diff(gray, axis=0)) > CROP_EDGE_THRESHOLD
+    rows = _active_span(edges.mean(axis=1))
+    columns = _active_span(edges.mean(axis=0))
+    if rows is None or columns is None: return None
+    return columns[0], rows[0], columns[1], rows[1]
+
+class ImageEncoder:
+    """전송 전 이미지 가공(리사이즈, 흑백, 대비, 이진화)과 인코딩을 담당하고 마지막 프레임 크기/시간을 기록"""
+
+    def __init__(self, use_resize=True, resize_percentage=50, resample="LANCZOS", image_format="JPEG", quality=75,
+                 grayscale=False, autocontrast=False, binarize=False, binarize_threshold=128, auto_crop=False, crop_margin=12):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"지원하지 않는 이미지 형식: {image_format}")
+        self.resize_ratio = resize_percentage / 100.0 if use_resize else 1.0
+        self.resample = RESAMPLE_FILTER_VALUES.get(resample, Image.LANCZOS)
+        self.image_format = image_format
+        self.mime_type = IMAGE_MIME_TYPES[image_format]
+        self.quality = quality
+        self.grayscale = grayscale or binarize # 이진화는 흑백 이미지에서 수행
+        self.autocontrast = autocontrast
+        self.binarize = binarize
+        self.binarize_threshold = binarize_threshold
+        self._binarize_table = [255 if value > binarize_threshold else 0 for value in range(256)]
+        self.auto_crop = auto_crop
+        self.crop_margin = crop_margin
+        self.last_size = 0
+        self.last_encode_ms = 0.0
+
+    @classmethod
+    def from_settings(cls, settings):
+        """파이프라인 설정 dict로 생성 (실시간 번역과 일괄 번역이 같은 전처리를 쓰도록)"""
+        return cls(
+            use_resize=settings['use_resize'], resize_percentage=settings['resize_percentage'],
+            resample=settings.get('resample_filter', "LANCZOS"), image_format=settings.get('image_format', "JPEG"),
+            quality=settings.get('image_quality', 75), grayscale=settings.get('grayscale', False),
+            autocontrast=settings.get('autocontrast', False), binarize=settings.get('binarize', False),
+            auto_crop=settings.get('auto_crop', False)
+        )
+
+    def prepare(self, image):
+        """자동 자르기, 리사이즈와 색 가공을 적용한 이미지를 반환 (지문 계산과 인코딩 모두 이 결과를 사용)"""
+        if self.auto_crop: image = self.crop_to_text(image)
+        if 0 < self.resize_ratio < 1.0:
+            original_width, original_height = image.size
+            new_width = int(original_width * self.resize_ratio); new_height = int(original_height * self.resize_ratio)
+            if new_width > 0 and new_height > 0: image = image.resize((new_width, new_height), self.resample)
+        if self.grayscale: image = image.convert('L')
+        if self.autocontrast: image = ImageOps.autocontrast(image, cutoff=1)
+        if self.binarize: image = image.point(self._binarize_table)
+        return image
+
+    def crop_to_text(self, image):
+        # 글자 영역 바깥의 배경 그림을 잘라 이미지 토큰과 전송량을 줄임 (여백 crop_margin px 유지)
+        box = find_text_bbox(image)
+        if box is None: return image
+        margin = self.crop_margin
+        left, top = max(0, box[0] - margin), max(0, box[1] - margin)
+        right, bottom = min(image.width, box[2] + margin), min(image.height, box[3] + margin)
+        if (right - left) * (bottom - top) > (1.0 - CROP_MIN_SAVING) * image.width * image.height: return image
+        return image.crop((left, top, right, bottom))
+
+    def encode(self, image):
+        """(바이트, MIME 형식) 반환"""
+        started = time.perf_counter()
+        img_byte_arr = io.BytesIO()
+        if self.image_format == "PNG":
+            image.save(img_byte_arr, format="PNG", optimize=False)
+        else:
+            image.save(img_byte_arr, format=self.image_format, quality=self.quality)
+        data = img_byte_arr.getvalue()
+        self.last_encode_ms = (time.perf_counter() - started) * 1000
+        self.last_size = len(data)
+        return data, self.mime_type
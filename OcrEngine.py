@@ -0,0 +1,44 @@
+# OcrEngine.py
+import re
+import itertools
+
+OCR_ENGINES = ["none", "tesseract"]
+
+class OcrEngine:
+    """로컬 OCR 공통 인터페이스. recognize()는 이미지에서 읽은 원문 텍스트를 반환"""
+    name = None
+
+    def recognize(self, image):
+        raise NotImplementedError
+
+class TesseractOcrEngine(OcrEngine):
+    name = "tesseract"
+
+    def __init__(self, language="jpn"):
+        import pytesseract
+        self._pytesseract = pytesseract
+        self.language = language
+
+    def recognize(self, image):
+        return self._pytesseract.image_to_string(image.convert('L'), lang=self.language)
+
+class FakeOcrEngine(OcrEngine):
+    """테스트/리플레이용. 주어진 문장 목록을 차례로 돌려주거나, 이미지에 대해 함수를 호출한 결과를 반환"""
+    name = "fake"
+
+    def __init__(self, texts=None, recognize_func=None):
+        self._texts = itertools.cycle(texts) if texts else None
+        self._recognize_func = recognize_func
+
+    def recognize(self, image):
+        if self._recognize_func: return self._recognize_func(image)
+        return next(self._texts) if self._texts else ""
+
+def normalize_ocr_text(text):
+    # 공백/줄바꿈 차이나 OCR이 흔히 섞는 잡음 문자 때문에 같은 문장이 다르게 판정되지 않도록 정규화
+    return re.sub(r'[\s|_~`]+', '', text or "")
+
+def create_ocr_engine(name, language="jpn"):
+    """name이 'none'이면 None. 필요한 패키지가 없으면 ImportError를 그대로 전달"""
+    if name == "tesseract": return TesseractOcrEngine(language)
+    return None
@@ -2,6 +2,8 @@
 import tkinter as tk
 from tkinter import font as tkFont
 
+RENDER_INTERVAL_MS = 16 # 텍스트 갱신을 모아서 최대 한 프레임(약 60Hz)에 한 번만 그림
+
 class OverlayWindow(tk.Toplevel):
     def __init__(self, master, initial_config=None):
         super().__init__(master)
@@ -35,6 +37,18 @@ class OverlayWindow(tk.Toplevel):
         )
         self.text_label.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
 
+        # 렌더링 상태: 실제로 표시 중인 텍스트/줄바꿈 폭/외형을 기억해 바뀐 것만 다시 설정
+        self._displayed_text = self.current_config['text']
+        self._pending_text = None
+        self._render_scheduled = False
+        self._wraplength = self.current_config['width'] - 20
+        self._appearance = (
+            self.current_config['font_family'], int(self.current_config['font_size']),
+            self.current_config['font_color'], self.current_config['bg_color']
+        )
+        self._visible = False
+        self.bind("<Configure>", self.on_configure)
+
         # 창 이동을 위한 변수 및 이벤트 바인딩
         self._offset_x = 0
         self._offset_y = 0
@@ -61,18 +75,30 @@ class OverlayWindow(tk.Toplevel):
         self.withdraw() # 처음에는 숨김
 
     def show_text(self, text):
+        # 연속된 갱신은 마지막 것만 다음 프레임에 반영 (번역 결과가 몰려도 Tk 메인 루프가 밀리지 않도록)
         self.current_config['text'] = text
-        self.text_label.config(text=text)
-        self.update_wraplength()
-        if not self.winfo_viewable():
-            self.deiconify()
+        self._pending_text = text
+        if not self._render_scheduled:
+            self._render_scheduled = True
+            self.after(RENDER_INTERVAL_MS, self._render)
+
+    def _render(self):
+        self._render_scheduled = False
+        text, self._pending_text = self._pending_text, None
+        if text is None or not self.winfo_exists(): return
+        if text != self._displayed_text:
+            self.text_label.config(text=text)
+            self._displayed_text = text
+        if not self._visible:
+            self.deiconify(); self._visible = True
 
     def hide(self):
-        self.withdraw()
+        self.withdraw(); self._visible = False
         self.save_geometry_to_config() # 숨길 때 현재 위치/크기 저장
 
     def set_alpha(self, alpha_value):
         self.current_config['alpha'] = float(alpha_value)
+        self._alpha = self.current_config['alpha']
         try:
             self.attributes("-alpha", self.current_config['alpha'])
         except tk.TclError:
@@ -84,21 +110,26 @@ class OverlayWindow(tk.Toplevel):
             'font_family': font_family, 'font_size': int(font_size),
             'font_color': font_color, 'bg_color': bg_color
         })
-        self.label_font.config(family=self.current_config['font_family'], size=self.current_config['font_size'])
-        self.text_label.config(
-            font=self.label_font,
-            fg=self.current_config['font_color'],
-            bg=self.current_config['bg_color']
-        )
-        self.set_alpha(alpha)
-        self.update_wraplength()
+        appearance = (font_family, int(font_size), font_color, bg_color)
+        if appearance != self._appearance: # 투명도 슬라이더 등으로 자주 호출되므로 글꼴/색이 바뀐 경우만 다시 설정
+            if appearance[:2] != self._appearance[:2]:
+                self.label_font.config(family=self.current_config['font_family'], size=self.current_config['font_size'])
+            self.text_label.config(fg=self.current_config['font_color'], bg=self.current_config['bg_color'])
+            self._appearance = appearance
+        if float(alpha) != self._alpha: self.set_alpha(alpha)
+
 
+    def on_configure(self, event):
+        # 창 크기가 실제로 바뀐 경우에만 줄바꿈 폭을 다시 계산 (이동만 한 경우는 생략)
+        if event.widget is self: self.update_wraplength(event.width)
 
-    def update_wraplength(self):
+    def update_wraplength(self, window_width=None):
         # 레이블의 wraplength를 현재 창 너비에 맞게 조절
-        new_wraplength = self.winfo_width() - 20 # 양쪽 여백 10px씩 고려
+        new_wraplength = (window_width if window_width is not None else self.winfo_width()) - 20 # 양쪽 여백 10px씩 고려
         if new_wraplength < 1: new_wraplength = 1 # 최소값
-        self.text_label.config(wraplength=new_wraplength)
+        if new_wraplength != self._wraplength:
+            self.text_label.config(wraplength=new_wraplength)
+            self._wraplength = new_wraplength
 
 
     def on_window_press(self, event):
@@ -129,8 +160,7 @@ class OverlayWindow(tk.Toplevel):
         new_width = max(80, new_width)  # 최소 너비
         new_height = max(40, new_height) # 최소 높이
 
-        self.geometry(f"{new_width}x{new_height}")
-        self.update_wraplength() # 크기 변경 시 wraplength 업데이트
+        self.geometry(f"{new_width}x{new_height}") # wraplength는 <Configure>에서 갱신
 
     def on_resize_release(self, event):
         # self.grab_release() # grab_set 사용 시
@@ -0,0 +1,112 @@
+# PipelineStats.py
+import os
+import csv
+import json
+import time
+import threading
+from collections import deque
+
+PIPELINE_STAGES = ["capture", "detect", "ocr", "prepare", "encode", "translate", "render", "total"]
+STATS_EXPORT_FORMATS = ["none", "csv", "jsonl", "prometheus"]
+STATS_PERCENTILES = (50, 95, 99)
+SKIPPED_FRAME_COUNTERS = ("frames_unchanged", "frames_settling", "frames_text_unchanged", "cache_hits", "memory_hits")
+
+def percentile(sorted_values, p):
+    """정렬된 값 목록의 p 백분위수 (nearest-rank). 빈 목록이면 0"""
+    if not sorted_values: return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+class PipelineStats:
+    """단계별 소요 시간을 최근 window_seconds 동안(단계당 최대 max_samples개) 보관하고
+    p50/p95/p99, 분당 요청 수, 건너뛴 프레임 비율 스냅샷과 파일 내보내기를 제공 (record는 워커 스레드에서 호출 가능)"""
+
+    def __init__(self, window_seconds=300, max_samples=2000):
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self._samples = {}
+        self._request_history = deque() # (시각, 누적 요청 수): 분당 요청 수 계산용
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        now = time.monotonic()
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None: samples = self._samples[stage] = deque(maxlen=self.max_samples)
+            samples.append((now, seconds))
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear(); self._request_history.clear()
+
+    def snapshot(self, counters=None):
+        """counters: TranslationPipeline.counters (없으면 단계별 시간만)"""
+        counters = counters or {}
+        now = time.monotonic()
+        stages = {}
+        with self._lock:
+            for stage in PIPELINE_STAGES:
+                samples = self._samples.get(stage)
+                if not samples: continue
+                while samples and samples[0][0] < now - self.window_seconds: samples.popleft()
+                values = sorted(seconds for _, seconds in samples)
+                if not values: continue
+                stages[stage] = {'count': len(values), **{f"p{p}": percentile(values, p) for p in STATS_PERCENTILES}}
+            requests = counters.get('requests', 0)
+            history = self._request_history
+            history.append((now, requests))
+            while len(history) > 1 and history[1][0] <= now - 60: history.popleft()
+            elapsed = now - history[0][0]
+            requests_per_min = (requests - history[0][1]) * 60.0 / elapsed if elapsed >= 1.0 else 0.0
+        frames_captured = counters.get('frames_captured', 0)
+        skipped = sum(counters.get(name, 0) for name in SKIPPED_FRAME_COUNTERS)
+        return {
+            'timestamp': time.time(), 'stages': stages, 'requests_per_min': requests_per_min,
+            'skip_rate': skipped / frames_captured if frames_captured else 0.0,
+            'requests': requests, 'frames_captured': frames_captured, 'frames_skipped': skipped,
+            'quota_errors': counters.get('quota_errors', 0), 'errors': counters.get('errors', 0),
+            'bytes_uploaded': counters.get('bytes_uploaded', 0),
+        }
+
+def _csv_row(snapshot):
+    row = {
+        'timestamp': round(snapshot['timestamp'], 3), 'requests_per_min': round(snapshot['requests_per_min'], 2),
+        'skip_rate': round(snapshot['skip_rate'], 4), 'requests': snapshot['requests'],
+        'quota_errors': snapshot['quota_errors'], 'errors': snapshot['errors'], 'bytes_uploaded': snapshot['bytes_uploaded'],
+    }
+    for stage in PIPELINE_STAGES:
+        stats = snapshot['stages'].get(stage, {})
+        for p in STATS_PERCENTILES:
+            value = stats.get(f"p{p}")
+            row[f"{stage}_p{p}_ms"] = round(value * 1000, 2) if value is not None else ""
+    return row
+
+def _prometheus_text(snapshot, prefix="screen_translator"):
+    lines = [f"# TYPE {prefix}_stage_seconds summary"]
+    for stage, stats in snapshot['stages'].items():
+        for p in STATS_PERCENTILES:
+            lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="{p / 100:g}"}} {stats[f"p{p}"]:.6f}')
+        lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+    for name, kind in (("requests", "counter"), ("frames_captured", "counter"), ("frames_skipped", "counter"),
+                       ("quota_errors", "counter"), ("errors", "counter"), ("bytes_uploaded", "counter"),
+                       ("requests_per_min", "gauge"), ("skip_rate", "gauge")):
+        metric = f"{prefix}_{name}_total" if kind == "counter" else f"{prefix}_{name}"
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric} {snapshot[name]:g}")
+    return "\n".join(lines) + "\n"
+
+def export_stats(snapshot, path, export_format):
+    """csv/jsonl은 한 줄씩 덧붙이고, prometheus는 textfile collector가 읽을 수 있도록 파일 전체를 원자적으로 교체"""
+    if export_format == "jsonl":
+        with open(path, 'a', encoding='utf-8') as f: f.write(json.dumps(snapshot, ensure_ascii=False) + "\n")
+    elif export_format == "csv":
+        row = _csv_row(snapshot)
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, 'a', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(row))
+            if write_header: writer.writeheader()
+            writer.writerow(row)
+    elif export_format == "prometheus":
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f: f.write(_prometheus_text(snapshot))
+        os.replace(temp_path, path)
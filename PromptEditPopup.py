@@ -2,7 +2,7 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 
-DEFAULT_PROMPT = "이 이미지의 일본어를 한국어로 번역해줘. 다른 설명이나 마크다운 없이 오직 한국어 번역문만 제공해줘."
+from AppSettings import DEFAULT_PROMPT
 
 class PromptEditPopup(tk.Toplevel):
     def __init__(self, master, current_prompt, callback):
@@ -0,0 +1,66 @@
+# RegionLayout.py
+import re
+
+REGION_GAP = 12 # 합성 이미지에서 영역 사이 구분선 두께 (px)
+REGION_GAP_COLOR = (128, 128, 128)
+REGION_MARKER_PATTERN = re.compile(r'^[ \t]*\[([^\[\]\n]+)\][ \t]*:?[ \t]*', re.MULTILINE)
+
+def default_region_name(index):
+    return f"영역{index + 1}"
+
+def assign_region_names(regions, names_text=""):
+    """쉼표로 구분된 이름을 순서대로 붙임. 비었거나 중복된 이름은 기본 이름으로 대체"""
+    names = [name.strip() for name in (names_text or "").split(',')]
+    used = set()
+    for index, region in enumerate(regions):
+        name = names[index] if index < len(names) else ""
+        name = re.sub(r'[\[\],]', '', name) # 응답 표시 '[이름]'과 설정 형식을 깨지 않도록
+        if not name or name in used: name = default_region_name(index)
+        region['name'] = name; used.add(name)
+    return regions
+
+def compose_regions(images, gap=REGION_GAP):
+    """여러 영역 이미지를 세로로 이어 붙인 (합성 이미지, 영역별 (left, top, right, bottom) 목록). 한 장이면 그대로 반환"""
+    if len(images) == 1: return images[0], [(0, 0, images[0].width, images[0].height)]
+    from PIL import Image # GUI 시작 시에는 영역 이름/좌표 함수만 쓰므로 합성할 때 불러옴
+    width = max(image.width for image in images)
+    height = sum(image.height for image in images) + gap * (len(images) - 1)
+    composite = Image.new('RGB', (width, height), REGION_GAP_COLOR)
+    boxes = []
+    top = 0
+    for image in images:
+        composite.paste(image, (0, top))
+        boxes.append((0, top, image.width, top + image.height))
+        top += image.height + gap
+    return composite, boxes
+
+def build_region_prompt(prompt, names, text_only=False):
+    """영역이 둘 이상이면 응답을 영역별로 나눌 수 있도록 '[이름]' 표시 규칙을 프롬프트에 덧붙임"""
+    if len(names) < 2: return prompt
+    labels = ", ".join(f"[{name}]" for name in names)
+    if text_only: layout = f"원문은 {len(names)}개의 화면 영역({labels})이 '[영역 이름]' 줄로 구분되어 있다."
+    else: layout = f"이미지는 위에서부터 {len(names)}개의 화면 영역({labels})을 회색 줄로 구분해 이어 붙인 것이다."
+    return (f"{prompt}\n{layout} 각 영역의 번역을 '[영역 이름]' 줄로 시작해 순서대로 출력하고, "
+            "글자가 없는 영역은 '[영역 이름]' 줄만 남겨줘.")
+
+def split_region_translations(text, names):
+    """'[이름]'으로 구분된 응답을 {이름: 번역문}으로 나눔. 표시가 하나도 없으면 전체를 첫 영역에 배정"""
+    result = {name: "" for name in names}
+    matches = [match for match in REGION_MARKER_PATTERN.finditer(text) if match.group(1).strip() in result]
+    if not matches:
+        if names: result[names[0]] = text.strip()
+        return result
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        result[match.group(1).strip()] = text[match.end():end].strip()
+    return result
+
+def format_region(region):
+    return f"{region['left']},{region['top']},{region['width']},{region['height']},{region.get('name', '')}"
+
+def parse_region(value):
+    """'left,top,width,height,이름' 형식 (이름 생략 가능). 형식이 틀리면 ValueError"""
+    parts = [part.strip() for part in value.split(',', 4)]
+    left, top, width, height = (int(part) for part in parts[:4])
+    if width <= 0 or height <= 0: raise ValueError(f"영역 크기가 올바르지 않습니다: {value}")
+    return {'left': left, 'top': top, 'width': width, 'height': height, 'name': parts[4] if len(parts) > 4 else ""}
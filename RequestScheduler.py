@@ -0,0 +1,130 @@
+# RequestScheduler.py
+import threading
+import time
+import random
+import datetime
+
+IMAGE_TILE_SIZE = 768 # Gemini는 큰 이미지를 768x768 타일로 나눠 타일당 258 토큰으로 계산
+IMAGE_TOKENS_PER_TILE = 258
+
+def estimate_request_tokens(prompt, image_size=None, expected_output_tokens=150):
+    """요청 한 번에 쓰일 토큰 수를 대략 추정 (응답의 usage_metadata로 나중에 보정)"""
+    tokens = len(prompt) // 2 + expected_output_tokens # 한글/일본어는 글자당 토큰이 많으므로 넉넉하게
+    if image_size:
+        width, height = image_size
+        if width <= 384 and height <= 384:
+            tokens += IMAGE_TOKENS_PER_TILE
+        else:
+            tiles = -(-width // IMAGE_TILE_SIZE) * -(-height // IMAGE_TILE_SIZE)
+            tokens += IMAGE_TOKENS_PER_TILE * tiles
+    return tokens
+
+class TokenBucket:
+    """capacity만큼 쌓이고 초당 refill_rate씩 채워지는 토큰 버킷"""
+
+    def __init__(self, capacity, refill_rate):
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """amount만큼 쓸 수 있을 때까지 기다려야 하는 시간(초)"""
+        self._refill(now)
+        amount = min(amount, self.capacity) # 버킷보다 큰 요청은 가득 찼을 때 허용
+        if self.tokens >= amount: return 0.0
+        return (amount - self.tokens) / self.refill_rate if self.refill_rate > 0 else float('inf')
+
+    def consume(self, amount, now):
+        self._refill(now)
+        self.tokens -= amount # 추정치 보정으로 음수가 될 수 있음 (그만큼 다음 요청이 늦춰짐)
+
+class RequestScheduler:
+    """모델별 RPM/TPM/RPD 한도를 토큰 버킷으로 관리하고, 할당량 오류 시 지수 백오프(+지터)와 요청 간격 조절을 수행
+    (한도가 0이면 제한 없음: 로컬 추론 서버 등)"""
+
+    def __init__(self, rpm, tpm, rpd, base_interval, max_interval=30.0, base_backoff=2.0, max_backoff=120.0):
+        self.rpm_bucket = TokenBucket(rpm, rpm / 60.0) if rpm else None
+        self.tpm_bucket = TokenBucket(tpm, tpm / 60.0) if tpm else None
+        self.rpd = rpd
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval, base_interval)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.effective_interval = base_interval
+        self.daily_count = 0
+        self.day = datetime.date.today()
+        self.blocked_until = 0.0
+        self.consecutive_errors = 0
+        self._last_dispatch = 0.0
+        self._lock = threading.Lock()
+
+    def _roll_day(self):
+        # 일일 한도는 로컬 날짜 기준으로 초기화 (서버 기준 시각과 몇 시간 차이날 수 있음)
+        today = datetime.date.today()
+        if today != self.day: self.day = today; self.daily_count = 0
+
+    def wait_time(self, estimated_tokens):
+        """지금 요청을 보내려면 기다려야 하는 시간(초). 일일 한도를 모두 쓰면 inf"""
+        with self._lock:
+            now = time.monotonic()
+            self._roll_day()
+            if self.rpd and self.daily_count >= self.rpd: return float('inf')
+            return max(
+                0.0, self.blocked_until - now, self._last_dispatch + self.effective_interval - now,
+                self.rpm_bucket.wait_time(1, now) if self.rpm_bucket else 0.0,
+                self.tpm_bucket.wait_time(estimated_tokens, now) if self.tpm_bucket else 0.0
+            )
+
+    def consume(self, estimated_tokens):
+        with self._lock:
+            now = time.monotonic()
+            if self.rpm_bucket: self.rpm_bucket.consume(1, now)
+            if self.tpm_bucket: self.tpm_bucket.consume(estimated_tokens, now)
+            self.daily_count += 1
+            self._last_dispatch = now
+
+    def try_acquire(self, estimated_tokens):
+        """기다리지 않고 지금 요청 한도에 여유가 있을 때만 한 번을 차감하고 True (중복 요청처럼 추가로 보내는 요청용).
+        요청 간격은 정기 요청에만 적용하므로 여기서는 보지 않음"""
+        with self._lock:
+            now = time.monotonic()
+            self._roll_day()
+            if self.rpd and self.daily_count >= self.rpd: return False
+            if now < self.blocked_until: return False
+            if self.rpm_bucket and self.rpm_bucket.wait_time(1, now) > 0: return False
+            if self.tpm_bucket and self.tpm_bucket.wait_time(estimated_tokens, now) > 0: return False
+            if self.rpm_bucket: self.rpm_bucket.consume(1, now)
+            if self.tpm_bucket: self.tpm_bucket.consume(estimated_tokens, now)
+            self.daily_count += 1
+            return True
+
+    def report_success(self, estimated_tokens, used_tokens=None):
+        with self._lock:
+            if used_tokens and self.tpm_bucket: self.tpm_bucket.consume(used_tokens - estimated_tokens, time.monotonic())
+            self.consecutive_errors = 0
+            # 성공이 이어지면 넓혀 둔 간격을 설정값까지 천천히 좁힘
+            self.effective_interval = max(self.base_interval, self.effective_interval * 0.8)
+
+    def _backoff(self, minimum_delay):
+        self.consecutive_errors += 1
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** (self.consecutive_errors - 1)))
+        delay = max(minimum_delay, backoff) * random.uniform(1.0, 1.25) # 여러 요청이 동시에 재시도하지 않도록 지터 추가
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        return delay
+
+    def report_quota_error(self, retry_delay=None):
+        """할당량 초과. 서버가 알려준 retry_delay 이상 기다리고 요청 간격을 넓힘. 실제 대기 시간(초) 반환"""
+        with self._lock:
+            self.effective_interval = min(self.max_interval, max(self.effective_interval, 0.5) * 2)
+            if self.rpm_bucket: self.rpm_bucket.tokens = min(self.rpm_bucket.tokens, 0.0) # 서버 기준으로는 이미 한도에 도달한 상태
+            return self._backoff(float(retry_delay) if retry_delay else 0.0)
+
+    def report_error(self):
+        """할당량과 무관한 일시적 오류. 간격은 유지하고 짧은 백오프만 적용"""
+        with self._lock:
+            return self._backoff(self.base_interval)
@@ -1,10 +1,11 @@
 # ScreenRegionSelector.py
 import tkinter as tk
 import platform
-import pyautogui
+
+from CaptureBackend import PyAutoGuiCapture
 
 class ScreenRegionSelector(tk.Toplevel):
-    def __init__(self, master, callback): # __init__으로 변경
+    def __init__(self, master, callback, capture_backend=None, existing_regions=None): # __init__으로 변경
         super().__init__(master)
         self.master = master
         self.callback = callback
@@ -14,7 +15,7 @@ class ScreenRegionSelector(tk.Toplevel):
 
         # OS 및 화면 크기 확인
         self.os_name = platform.system()
-        screen_width, screen_height = pyautogui.size()
+        screen_width, screen_height = (capture_backend or PyAutoGuiCapture()).screen_size()
 
         # 화면 전체를 덮는 투명한 창 생성
         self.overrideredirect(True)
@@ -26,6 +27,12 @@ class ScreenRegionSelector(tk.Toplevel):
         self.canvas = tk.Canvas(self, cursor="cross", bg="grey")
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
+        # 영역 추가 시 이미 지정된 영역을 이름과 함께 표시
+        for region in existing_regions or []:
+            x1, y1 = region['left'], region['top']
+            self.canvas.create_rectangle(x1, y1, x1 + region['width'], y1 + region['height'], outline="yellow", width=2)
+            self.canvas.create_text(x1 + 4, y1 + 4, text=region.get('name', ''), anchor="nw", fill="yellow")
+
         # 마우스 이벤트 바인딩
         self.canvas.bind("<ButtonPress-1>", self.on_button_press)
         self.canvas.bind("<B1-Motion>", self.on_mouse_drag)
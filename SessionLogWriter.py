@@ -0,0 +1,88 @@
+# SessionLogWriter.py
+import os
+import json
+import time
+import queue
+import datetime
+import threading
+
+SESSION_LOG_FORMATS = ["none", "jsonl", "srt"]
+SRT_DEFAULT_DURATION = 4.0 # 다음 자막이 없을 때 마지막 자막을 표시하는 시간 (초)
+SRT_MAX_DURATION = 10.0
+
+def _srt_time(seconds):
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
+
+def srt_entry(index, start, end, text):
+    """SRT 자막 한 항목 (시각은 초)"""
+    return f"{index}\n{_srt_time(start)} --> {_srt_time(end)}\n{text.strip()}\n\n"
+
+def session_log_path(log_dir, log_format):
+    return os.path.join(log_dir, f"session_{datetime.datetime.now():%Y%m%d_%H%M%S}.{log_format}")
+
+class SessionLogWriter:
+    """번역 기록 전체를 백그라운드 스레드에서 파일로 저장 (JSONL 또는 SRT). write()는 큐에 넣기만 하므로 UI 스레드에서 호출해도 됨.
+    flush_interval초마다 또는 batch_size개가 모이면 한 번에 기록"""
+
+    def __init__(self, path, log_format="jsonl", flush_interval=1.0, batch_size=50):
+        if log_format not in SESSION_LOG_FORMATS[1:]: raise ValueError(f"지원하지 않는 기록 형식: {log_format}")
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.log_format = log_format
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.started = time.monotonic()
+        self._queue = queue.Queue()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._srt_index = 0
+        self._srt_pending = None # SRT는 다음 자막이 와야 끝 시각이 정해지므로 한 항목을 보류
+        self._thread = threading.Thread(target=self._run, name="session-log", daemon=True)
+        self._thread.start()
+
+    def write(self, text, seq=None, kind="translation"):
+        """kind: translation(번역 결과) 또는 message(상태/오류 메시지, SRT에는 기록하지 않음)"""
+        self._queue.put({'time': time.time(), 'offset': time.monotonic() - self.started, 'seq': seq, 'kind': kind, 'text': text})
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+
+    def _run(self):
+        closing = False
+        while not closing:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try: entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty: break
+                if entry is None: closing = True; break
+                batch.append(entry)
+            try:
+                for entry in batch: self._write_entry(entry)
+                if closing and self._srt_pending: self._write_srt(self._srt_pending, self._srt_pending['offset'] + SRT_DEFAULT_DURATION)
+                if batch or closing: self._file.flush()
+            except OSError as e: print(f"세션 기록 저장 실패: {e}")
+        self._file.close()
+
+    def _write_entry(self, entry):
+        if self.log_format == "jsonl":
+            record = {
+                'time': datetime.datetime.fromtimestamp(entry['time']).isoformat(timespec='milliseconds'),
+                'offset': round(entry['offset'], 3), 'seq': entry['seq'], 'kind': entry['kind'], 'text': entry['text'],
+            }
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        elif entry['kind'] == "translation" and entry['text'].strip():
+            if self._srt_pending:
+                end = min(entry['offset'], self._srt_pending['offset'] + SRT_MAX_DURATION)
+                self._write_srt(self._srt_pending, end)
+            self._srt_pending = entry
+
+    def _write_srt(self, entry, end):
+        self._srt_index += 1
+        self._file.write(srt_entry(self._srt_index, entry['offset'], end, entry['text']))
+        self._srt_pending = None
@@ -0,0 +1,69 @@
+# StartupProfiler.py
+import sys
+import time
+import builtins
+import importlib
+import threading
+
+class StartupProfiler:
+    """--profile-startup 옵션용. 모듈 import와 초기화 단계별 소요 시간을 기록해 출력 (꺼져 있으면 mark()는 아무것도 하지 않음)"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self._last_mark = self.started
+        self.marks = [] # (단계 이름, 초)
+        self.imports = {} # 처음 불러온 모듈 -> 소요 시간 (그 모듈이 불러온 하위 모듈 포함)
+        self._original_import = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if enabled: self._install_import_hook()
+
+    def _install_import_hook(self):
+        original_import = self._original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # 아직 불러오지 않은 모듈의 가장 바깥쪽 import만 측정 (하위 import 시간은 바깥 모듈에 포함)
+            if level or name in sys.modules or getattr(self._local, 'depth', 0):
+                return original_import(name, globals, locals, fromlist, level)
+            self._local.depth = 1
+            started = time.perf_counter()
+            try: return original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._local.depth = 0
+                self.record_import(name, time.perf_counter() - started)
+
+        builtins.__import__ = timed_import
+
+    def record_import(self, name, seconds):
+        with self._lock: self.imports[name] = self.imports.get(name, 0.0) + seconds
+
+    def mark(self, label):
+        """직전 mark 이후의 소요 시간을 label 단계로 기록"""
+        if not self.enabled: return
+        now = time.perf_counter()
+        self.marks.append((label, now - self._last_mark))
+        self._last_mark = now
+
+    def report(self, top=15):
+        if not self.enabled: return
+        if self._original_import: builtins.__import__ = self._original_import; self._original_import = None
+        print(f"== 시작 시간 {(time.perf_counter() - self.started) * 1000:.0f} ms")
+        for label, seconds in self.marks: print(f"  {label:<24}{seconds * 1000:>8.1f} ms")
+        with self._lock: imports = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+        print(f"-- import 소요 시간 상위 {min(top, len(imports))}개")
+        for name, seconds in imports[:top]: print(f"  {name:<24}{seconds * 1000:>8.1f} ms")
+
+def preload_modules(module_names, profiler=None):
+    """무거운 모듈(번역 SDK, 캡처/OCR 라이브러리)을 백그라운드 스레드에서 미리 불러옴.
+    설치되지 않은 모듈은 건너뛰고, 실제 오류는 사용하는 시점에 다시 보고됨"""
+    def _run():
+        for name in module_names:
+            if name in sys.modules: continue
+            started = time.perf_counter()
+            try: importlib.import_module(name)
+            except Exception: continue
+            if profiler and profiler.enabled: print(f"  (미리 불러오기) {name:<24}{(time.perf_counter() - started) * 1000:>8.1f} ms")
+    thread = threading.Thread(target=_run, name="module-preload", daemon=True)
+    thread.start()
+    return thread
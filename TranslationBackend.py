@@ -0,0 +1,228 @@
+# TranslationBackend.py
+import re
+import json
+import time
+import base64
+import random
+import itertools
+import threading
+
+TRANSLATION_BACKENDS = ["gemini", "openai"]
+DEFAULT_LOCAL_URL = "http://127.0.0.1:8080/v1" # llama.cpp server / OpenAI 호환 서버의 기본 주소
+WARM_UP_TEXT = "ping"
+
+_backend_pool = {} # (백엔드, API 키, 모델, 주소) -> 백엔드. 번역을 멈췄다 다시 시작해도 같은 클라이언트/연결을 재사용
+_backend_pool_lock = threading.Lock()
+_gemini_configure_lock = threading.Lock() # genai.configure는 전역 설정이므로 클라이언트를 만드는 동안 다른 키로 바뀌지 않도록
+
+def parse_quota_error_details(error_message_string):
+    details = {}
+    try:
+        quota_id_match = re.search(r'quota_id:\s*"([^"]+)"', error_message_string, re.IGNORECASE)
+        if quota_id_match: details["quota_id"] = quota_id_match.group(1)
+        quota_value_match = re.search(r'quota_value:\s*(\d+)', error_message_string, re.IGNORECASE)
+        if quota_value_match: details["quota_value"] = quota_value_match.group(1)
+        retry_delay_match = re.search(r'retry_delay\s*{\s*seconds:\s*(\d+)\s*}', error_message_string, re.IGNORECASE)
+        if retry_delay_match: details["retry_delay"] = retry_delay_match.group(1)
+        else:
+            retry_delay_simple_match = re.search(r'retry_delay[:\s]*(\d+)', error_message_string, re.IGNORECASE)
+            if retry_delay_simple_match : details["retry_delay"] = retry_delay_simple_match.group(1)
+        return details if details else None
+    except Exception as parse_error: print(f"할당량 오류 메시지 파싱 중 에러: {parse_error}"); return None
+
+class QuotaExceededError(Exception):
+    """백엔드 종류와 무관한 할당량/요청 빈도 초과 오류. details는 parse_quota_error_details 형식의 dict 또는 None"""
+
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details
+        self.retry_delay = details.get("retry_delay") if details else None
+
+class TransientBackendError(RuntimeError):
+    """서버 쪽 일시적 오류 (HTTP 5xx 등). 잠시 뒤나 다른 키/모델로 다시 요청하면 성공할 수 있음"""
+
+def is_transient_error(error):
+    """다른 키/모델로 넘겨 재시도할 만한 일시적 오류인지 (네트워크 오류, 시간 초과, 서버 5xx).
+    잘못된 요청/키 같은 오류는 재시도해도 같으므로 False"""
+    if isinstance(error, (TransientBackendError, OSError, TimeoutError)): return True
+    code = getattr(error, 'code', None) # google.api_core 예외는 HTTP 상태 코드를 code로 가짐
+    return isinstance(code, int) and 500 <= code < 600
+
+class TranslationResult:
+    """번역 응답. ok가 False면 text는 실패 사유이며 캐시/메모리에 저장하지 않음"""
+
+    def __init__(self, text, ok=True, used_tokens=None, model=None):
+        self.text = text
+        self.ok = ok
+        self.used_tokens = used_tokens # 서버가 알려준 실제 사용 토큰 수 (모르면 None)
+        self.model = model # 실제로 응답한 모델 (키/모델 풀에서 다른 모델로 넘어간 경우). None이면 요청한 모델
+
+class TranslationBackend:
+    """번역 요청 공통 인터페이스.
+    translate(prompt, source_text, image, on_partial): image는 (바이트, MIME 형식), 없으면 source_text만 전송.
+    on_partial이 있으면 스트리밍으로 받아 지금까지의 번역문으로 호출하고, False를 반환하면 나머지 응답은 받지 않음 (None 반환)
+    """
+    name = None
+    model = None
+
+    def translate(self, prompt, source_text=None, image=None, on_partial=None):
+        raise NotImplementedError
+
+    def warm_up(self):
+        """연결을 미리 맺어 두기 위한 가벼운 요청 (지원하지 않는 백엔드는 아무것도 하지 않음)"""
+        pass
+
+    def set_request_gate(self, gate):
+        """백엔드가 스스로 추가 요청(중복 요청 등)을 보내기 전에 호출할 함수. gate()가 False면 보내지 않음.
+        요청 한도를 관리하는 쪽(파이프라인)이 등록하며, 추가 요청을 보내지 않는 백엔드는 무시"""
+        pass
+
+class GeminiBackend(TranslationBackend):
+    name = "gemini"
+
+    def __init__(self, api_key, model):
+        import google.generativeai as genai
+        from google.generativeai import client as genai_client
+        from google.api_core.exceptions import ResourceExhausted
+        self._resource_exhausted = ResourceExhausted
+        with _gemini_configure_lock:
+            genai.configure(api_key=api_key)
+            self._client = genai.GenerativeModel(model)
+            # GenerativeModel은 첫 요청 때 그 시점의 전역 클라이언트를 가져가므로, 이 키로 만든 클라이언트를 지금 묶어 둠.
+            # 모델별로 클라이언트를 넘기는 공개 API가 없어 내부 속성을 쓰므로 SDK는 requirements.txt에서 0.8.x로 고정.
+            # 다른 버전이라 속성이 없으면 묶지 않음 (키 하나는 그대로 동작하고, 키 여러 개는 마지막 키로 요청될 수 있음)
+            if hasattr(self._client, '_client'): self._client._client = genai_client.get_default_generative_client()
+            else: print(f"google-generativeai {getattr(genai, '__version__', '?')}: 키별 클라이언트를 지정할 수 없습니다. (0.8.x 권장)")
+        self.model = model
+        self._warmed_up = False
+
+    def translate(self, prompt, source_text=None, image=None, on_partial=None):
+        if image is None: request_parts = [f"{prompt}\n\n{source_text}"]
+        else: request_parts = [prompt, {"mime_type": image[1], "data": image[0]}]
+        try:
+            response = self._client.generate_content(request_parts, stream=on_partial is not None)
+            if on_partial is not None:
+                streamed_text = ""
+                for chunk in response:
+                    if chunk.parts:
+                        streamed_text += chunk.text
+                        if on_partial(streamed_text) is False: return None
+        except self._resource_exhausted as e:
+            raise QuotaExceededError(str(e), parse_quota_error_details(str(e))) from e
+        usage = getattr(response, 'usage_metadata', None)
+        used_tokens = getattr(usage, 'total_token_count', None)
+        if response.parts: return TranslationResult(response.text.strip(), used_tokens=used_tokens)
+        if response.prompt_feedback and response.prompt_feedback.block_reason:
+            return TranslationResult(f"차단됨: {response.prompt_feedback.block_reason_message}", ok=False, used_tokens=used_tokens)
+        if not response.candidates: return TranslationResult("응답 후보 없음", ok=False, used_tokens=used_tokens)
+        return TranslationResult("번역 실패", ok=False, used_tokens=used_tokens)
+
+    def warm_up(self):
+        # 토큰 수 세기는 할당량을 쓰지 않는 가벼운 호출이라 TLS/gRPC 채널만 미리 열어 둠
+        if self._warmed_up: return
+        self._client.count_tokens(WARM_UP_TEXT)
+        self._warmed_up = True
+
+class OpenAICompatibleBackend(TranslationBackend):
+    """OpenAI 호환 /chat/completions 엔드포인트 (llama.cpp server, vLLM, Ollama 등 LAN 추론 서버)"""
+    name = "openai"
+
+    def __init__(self, base_url=DEFAULT_LOCAL_URL, model="", api_key="", timeout=60.0):
+        if not base_url: raise ValueError("로컬 서버 URL이 비어 있습니다.")
+        self.url = base_url.rstrip('/') + "/chat/completions"
+        self.model = model or base_url
+        self._model_field = model
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _request(self, prompt, source_text, image, stream):
+        import urllib.request # 로컬 서버를 쓸 때만 필요하므로 시작 시간을 줄이기 위해 여기서 불러옴
+        import urllib.error
+        if image is None: content = f"{prompt}\n\n{source_text}"
+        else:
+            image_url = f"data:{image[1]};base64,{base64.b64encode(image[0]).decode('ascii')}"
+            content = [{"type": "text", "text": prompt}, {"type": "image_url", "image_url": {"url": image_url}}]
+        body = {"messages": [{"role": "user", "content": content}], "stream": stream}
+        if self._model_field: body["model"] = self._model_field
+        headers = {"Content-Type": "application/json"}
+        if self.api_key: headers["Authorization"] = f"Bearer {self.api_key}"
+        request = urllib.request.Request(self.url, data=json.dumps(body).encode('utf-8'), headers=headers)
+        try: return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                retry_after = e.headers.get('Retry-After')
+                raise QuotaExceededError(f"HTTP 429: {e.reason}", {"retry_delay": retry_after} if retry_after else None) from e
+            error_class = TransientBackendError if e.code >= 500 else RuntimeError
+            raise error_class(f"HTTP {e.code}: {e.read()[:200].decode('utf-8', 'replace')}") from e
+
+    def translate(self, prompt, source_text=None, image=None, on_partial=None):
+        with self._request(prompt, source_text, image, stream=on_partial is not None) as response:
+            if on_partial is None:
+                data = json.load(response)
+                choices = data.get('choices') or []
+                text = ((choices[0].get('message') or {}).get('content') or "") if choices else ""
+                used_tokens = (data.get('usage') or {}).get('total_tokens')
+            else:
+                # 서버 전송 이벤트(SSE): 'data: {...}' 줄마다 delta 조각, 마지막은 'data: [DONE]'
+                text, used_tokens = "", None
+                for raw_line in response:
+                    line = raw_line.decode('utf-8').strip()
+                    if not line.startswith("data:"): continue
+                    payload = line[5:].strip()
+                    if payload == "[DONE]": break
+                    chunk = json.loads(payload)
+                    used_tokens = (chunk.get('usage') or {}).get('total_tokens', used_tokens)
+                    choices = chunk.get('choices') or []
+                    piece = (choices[0].get('delta') or {}).get('content') if choices else None
+                    if piece:
+                        text += piece
+                        if on_partial(text) is False: return None
+        if not text.strip(): return TranslationResult("응답 후보 없음", ok=False, used_tokens=used_tokens)
+        return TranslationResult(text.strip(), used_tokens=used_tokens)
+
+class FakeTranslationBackend(TranslationBackend):
+    """테스트/리플레이용. 주어진 번역문 목록을 차례로 돌려주거나 함수를 호출한 결과를 latency초 뒤에 반환.
+    quota_error_rate 비율의 요청은 retry_delay초를 권장하는 QuotaExceededError로 실패"""
+    name = "fake"
+
+    def __init__(self, texts=None, translate_func=None, latency=0.0, latency_jitter=0.0, quota_error_rate=0.0,
+                 retry_delay=1, model="fake"):
+        self._texts = itertools.cycle(texts) if texts else None
+        self._translate_func = translate_func
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.quota_error_rate = quota_error_rate
+        self.retry_delay = retry_delay
+        self.model = model
+        self.calls = 0
+
+    def translate(self, prompt, source_text=None, image=None, on_partial=None):
+        self.calls += 1
+        latency = max(0.0, self.latency + random.uniform(-self.latency_jitter, self.latency_jitter))
+        if self.quota_error_rate and random.random() < self.quota_error_rate:
+            time.sleep(latency / 2)
+            raise QuotaExceededError("simulated quota error", {"quota_id": "FakeRequestsPerMinute", "retry_delay": str(self.retry_delay)})
+        if self._translate_func: text = self._translate_func(prompt, source_text, image)
+        elif self._texts: text = next(self._texts)
+        else: text = f"[번역] {source_text}" if source_text else "번역 결과"
+        if on_partial is not None:
+            # 응답을 몇 조각으로 나눠 스트리밍처럼 전달
+            step = max(1, len(text) // 3)
+            for end in range(step, len(text) + step, step):
+                time.sleep(latency / 3)
+                if on_partial(text[:end]) is False: return None
+        elif latency: time.sleep(latency)
+        return TranslationResult(text)
+
+def create_translation_backend(name, api_key=None, model=None, base_url=None):
+    """name이 'openai'면 로컬 OpenAI 호환 서버, 그 외에는 Gemini. Gemini 패키지가 없으면 ImportError를 그대로 전달"""
+    if name == "openai": return OpenAICompatibleBackend(base_url or DEFAULT_LOCAL_URL, model or "", api_key or "")
+    return GeminiBackend(api_key, model)
+
+def get_translation_backend(name, api_key=None, model=None, base_url=None):
+    """create_translation_backend와 같지만 같은 설정으로 만든 백엔드가 있으면 그대로 반환"""
+    key = (name, api_key or "", model or "", (base_url or DEFAULT_LOCAL_URL) if name == "openai" else "")
+    with _backend_pool_lock:
+        backend = _backend_pool.get(key)
+        if backend is None: backend = _backend_pool[key] = create_translation_backend(name, api_key, model, base_url)
+        return backend
@@ -0,0 +1,137 @@
+# TranslationCache.py
+import sqlite3
+import threading
+import time
+import hashlib
+from collections import OrderedDict
+
+LAST_USED_FLUSH_SIZE = 64 # 메모리에서 찾은 항목의 사용 시각을 이만큼 모이면 디스크에 한 번에 기록
+LAST_USED_FLUSH_INTERVAL = 30.0 # 또는 마지막 기록 후 이 시간(초)이 지나면 기록
+
+class TranslationCache:
+    """프레임 지문 + 프롬프트 + 모델을 키로 번역 결과를 저장 (메모리 LRU + SQLite 디스크 저장소)"""
+
+    def __init__(self, db_path, memory_size=256, max_entries=5000, max_age_days=30):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict() # (namespace, fingerprint) -> (text, created)
+        self._pending_last_used = {} # 메모리 적중 때마다 디스크에 쓰지 않도록 모아 둔 (namespace, fingerprint) -> 사용 시각
+        self._last_used_flushed = time.monotonic()
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " namespace TEXT NOT NULL, fingerprint TEXT NOT NULL, text TEXT NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL,"
+            " PRIMARY KEY (namespace, fingerprint))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+        self._conn.commit()
+        self.evict()
+
+    @staticmethod
+    def namespace(prompt, model):
+        # 프롬프트나 모델이 바뀌면 같은 화면이라도 다른 결과가 나오므로 키에 포함
+        return hashlib.sha1(f"{model}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def _is_expired(self, created):
+        return self.max_age_seconds > 0 and time.time() - created > self.max_age_seconds
+
+    def get(self, namespace, fingerprint):
+        key = (namespace, fingerprint)
+        with self._lock:
+            text = None
+            entry = self._memory.get(key)
+            if entry is not None:
+                # 메모리에 남아 있어도 디스크와 같은 기한을 적용하고, 사용 시각은 모아서 디스크에 기록 (LRU 삭제 순서 유지)
+                if self._is_expired(entry[1]): del self._memory[key]
+                else:
+                    text, created = entry
+                    self._pending_last_used[key] = time.time()
+                    if (len(self._pending_last_used) >= LAST_USED_FLUSH_SIZE
+                            or time.monotonic() - self._last_used_flushed >= LAST_USED_FLUSH_INTERVAL):
+                        self._flush_last_used_locked(); self._conn.commit()
+            else:
+                row = self._conn.execute(
+                    "SELECT text, created FROM translations WHERE namespace=? AND fingerprint=?", key
+                ).fetchone()
+                if row and not self._is_expired(row[1]):
+                    text, created = row
+                    self._conn.execute("UPDATE translations SET last_used=? WHERE namespace=? AND fingerprint=?", (time.time(),) + key)
+                    self._conn.commit()
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(namespace, fingerprint, text, created)
+            return text
+
+    def put(self, namespace, fingerprint, text):
+        now = time.time()
+        with self._lock:
+            self._remember(namespace, fingerprint, text, now)
+            self._pending_last_used.pop((namespace, fingerprint), None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (namespace, fingerprint, text, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (namespace, fingerprint, text, now, now)
+            )
+            self._conn.commit()
+            self._puts_since_evict += 1
+            if self._puts_since_evict >= 100:
+                self._evict_locked()
+
+    def _remember(self, namespace, fingerprint, text, created):
+        key = (namespace, fingerprint)
+        self._memory[key] = (text, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def evict(self):
+        with self._lock:
+            self._evict_locked()
+
+    def _flush_last_used_locked(self):
+        # 커밋은 호출하는 쪽에서
+        if self._pending_last_used:
+            self._conn.executemany(
+                "UPDATE translations SET last_used=? WHERE namespace=? AND fingerprint=?",
+                [(used,) + key for key, used in self._pending_last_used.items()]
+            )
+            self._pending_last_used.clear()
+        self._last_used_flushed = time.monotonic()
+
+    def _evict_locked(self):
+        # 메모리에서 사용한 항목이 지워지지 않도록 사용 시각을 먼저 기록하고, 오래된 항목 삭제 후
+        # 최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 삭제
+        self._flush_last_used_locked()
+        if self.max_age_seconds > 0:
+            self._conn.execute("DELETE FROM translations WHERE created < ?", (time.time() - self.max_age_seconds,))
+        if self.max_entries > 0:
+            self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN ("
+                " SELECT rowid FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+            )
+        self._conn.commit()
+        self._puts_since_evict = 0
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear(); self._pending_last_used.clear()
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+            self.hits = 0; self.misses = 0
+
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self):
+        with self._lock:
+            self._flush_last_used_locked(); self._conn.commit()
+            self._conn.close()
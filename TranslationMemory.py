@@ -0,0 +1,110 @@
+# TranslationMemory.py
+import sqlite3
+import threading
+import time
+import re
+import difflib
+from collections import defaultdict
+
+from OcrEngine import normalize_ocr_text
+
+SOURCE_SENTENCE_PATTERN = re.compile(r'[^。！？!?\n]+[。！？!?」』）)]*')
+TARGET_SENTENCE_PATTERN = re.compile(r'[^.!?。！？\n]+[.!?。！？"”’」』)]*')
+
+def split_sentences(text, pattern=SOURCE_SENTENCE_PATTERN):
+    return [sentence.strip() for sentence in pattern.findall(text or "") if sentence.strip()]
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TranslationMemory:
+    """원문 문장 → 번역 문장 쌍을 저장하고 정확히 일치 / 유사(트라이그램 + 편집 거리) 검색을 제공 (SQLite에 영구 저장)"""
+
+    def __init__(self, db_path, fuzzy_threshold=0.9, max_candidates=20):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.max_candidates = max_candidates
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self._lock = threading.Lock()
+        self._entries = {} # 정규화된 원문 -> 번역문
+        self._index = defaultdict(set) # 트라이그램 -> 정규화된 원문 집합
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            " source_key TEXT PRIMARY KEY, source TEXT NOT NULL, target TEXT NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+        self._conn.commit()
+        for source_key, target in self._conn.execute("SELECT source_key, target FROM memory"):
+            self._add_to_index(source_key, target)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add_to_index(self, source_key, target):
+        self._entries[source_key] = target
+        for gram in _trigrams(source_key): self._index[gram].add(source_key)
+
+    def _find(self, source_key):
+        """(번역문, 유사 일치 여부) 또는 None"""
+        target = self._entries.get(source_key)
+        if target is not None: return target, False
+        if self.fuzzy_threshold >= 1.0 or len(source_key) < 4: return None # 너무 짧은 문장은 유사 검색이 부정확
+        # 겹치는 트라이그램이 많은 후보만 골라 편집 거리 비율로 최종 확인
+        counts = defaultdict(int)
+        for gram in _trigrams(source_key):
+            for candidate in self._index.get(gram, ()): counts[candidate] += 1
+        candidates = sorted(counts, key=counts.get, reverse=True)[:self.max_candidates]
+        best, best_ratio = None, self.fuzzy_threshold
+        for candidate in candidates:
+            matcher = difflib.SequenceMatcher(None, source_key, candidate)
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio: continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio: best, best_ratio = candidate, ratio
+        return (self._entries[best], True) if best else None
+
+    def lookup(self, source_text):
+        """원문 전체 또는 모든 문장이 메모리에 있으면 번역문을 반환, 아니면 None"""
+        source_key = normalize_ocr_text(source_text)
+        if not source_key: return None
+        with self._lock:
+            found = self._find(source_key)
+            if found is None:
+                sentences = split_sentences(source_text)
+                if len(sentences) < 2: return None
+                parts = [self._find(normalize_ocr_text(sentence)) for sentence in sentences]
+                if any(part is None for part in parts): return None
+                found = ("\n".join(part[0] for part in parts), any(part[1] for part in parts))
+            self.hits += 1
+            if found[1]: self.fuzzy_hits += 1
+            return found[0]
+
+    def add(self, source_text, target_text):
+        """원문/번역문 쌍 저장. 문장 수가 같으면 문장 단위 쌍도 함께 저장"""
+        pairs = [(source_text, target_text)]
+        source_sentences = split_sentences(source_text)
+        target_sentences = split_sentences(target_text, TARGET_SENTENCE_PATTERN)
+        if len(source_sentences) > 1 and len(source_sentences) == len(target_sentences):
+            pairs.extend(zip(source_sentences, target_sentences))
+        now = time.time()
+        with self._lock:
+            for source, target in pairs:
+                source_key = normalize_ocr_text(source)
+                if not source_key or not target.strip(): continue
+                self._add_to_index(source_key, target.strip())
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO memory (source_key, source, target, created) VALUES (?, ?, ?, ?)",
+                    (source_key, source.strip(), target.strip(), now)
+                )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear(); self._index.clear()
+            self._conn.execute("DELETE FROM memory"); self._conn.commit()
+            self.hits = 0; self.fuzzy_hits = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,341 @@
+# TranslationPipeline.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+import hashlib
+from collections import Counter
+
+from CaptureBackend import create_capture_backend
+from FrameChangeDetector import FrameChangeDetector, image_fingerprint
+from ImageEncoder import ImageEncoder
+from OcrEngine import create_ocr_engine, normalize_ocr_text
+from RequestScheduler import RequestScheduler, estimate_request_tokens
+from TranslationBackend import QuotaExceededError
+from RegionLayout import compose_regions, build_region_prompt
+from TranslationCache import TranslationCache
+
+class LatestFrameQueue:
+    """크기가 제한된 큐. 가득 차면 가장 오래된 항목을 버리고 새 항목을 넣음 (최신 프레임 우선)"""
+
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._items = []
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        with self._cond:
+            self._items.append(item)
+            while len(self._items) > self.maxsize:
+                self._items.pop(0); self.dropped += 1
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """새 항목이 없으면 timeout 동안 대기. 시간 초과나 닫힌 큐에서는 None 반환"""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            return self._items.pop(0) if self._items else None
+
+    def close(self):
+        with self._cond:
+            self._closed = True; self._items.clear()
+            self._cond.notify_all()
+
+class TranslationPipeline:
+    """캡처 → 전처리 → 번역 단계를 각각의 스레드로 실행하고 최신 프레임 큐로 연결
+
+    settings 키: regions (이름이 붙은 영역 목록, 둘 이상이면 한 장으로 합쳐 한 번에 요청) 또는 region, prompt, model, interval, max_concurrent_requests, use_resize, resize_percentage,
+    resample_filter, image_format, image_quality, grayscale, autocontrast, binarize, auto_crop,
+    change_method, change_threshold, ignore_regions, settle_time, max_settle_time, capture_backend, replay_dir,
+    quota ({'rpm', 'tpm', 'rpd'}: 현재 모델의 분당 요청/분당 토큰/일일 요청 한도, 0이면 제한 없음),
+    ocr_engine, ocr_language, ocr_text_only, text_prompt, use_streaming
+    output(text, on_overlay, seq): 결과/오류 메시지를 표시할 콜백 (워커 스레드에서 호출됨).
+    번역 결과에는 프레임 순번 seq가 붙으며, 오류 메시지는 seq=None
+    on_partial(text, seq): 스트리밍 모드에서 지금까지 받은 번역문 (청크마다 호출되므로 표시 쪽에서 묶어서 갱신)
+    on_stage_timing(stage, seconds): 단계별 소요 시간 (capture, detect, ocr, prepare, encode, translate, total)
+    counters: 프레임/요청 수, 전송 바이트 등 누적 카운터 (벤치마크/통계용)
+    """
+
+    def __init__(self, settings, backend, output, cache=None, on_cache_lookup=None, capture_backend=None, on_frame_encoded=None,
+                 on_schedule_update=None, ocr_engine=None, translation_memory=None, on_memory_lookup=None,
+                 on_partial=None, on_stage_timing=None):
+        self.settings = settings
+        self.capture_backend = capture_backend or create_capture_backend(settings.get('capture_backend', "pyautogui"), settings.get('replay_dir'))
+        self.backend = backend # TranslationBackend
+        self.output = output
+        self.cache = cache
+        self.on_cache_lookup = on_cache_lookup
+        self.on_frame_encoded = on_frame_encoded # (바이트 수, 인코딩 ms)
+        self.on_schedule_update = on_schedule_update # (RequestScheduler)
+        self.interval = max(0.2, settings['interval'])
+        self.max_concurrent_requests = max(1, settings.get('max_concurrent_requests', 1))
+        self.is_running = False
+        self.capture_queue = LatestFrameQueue(maxsize=1)
+        self.translate_queue = LatestFrameQueue(maxsize=1)
+        self.change_detector = FrameChangeDetector(
+            method=settings['change_method'], threshold=settings['change_threshold'],
+            ignore_regions=settings['ignore_regions'], settle_time=settings.get('settle_time', 0.0),
+            max_settle_time=settings.get('max_settle_time', 3.0)
+        )
+        self.encoder = ImageEncoder.from_settings(settings)
+        quota = settings.get('quota') or {}
+        self.scheduler = RequestScheduler(
+            rpm=quota.get('rpm', 15), tpm=quota.get('tpm', 1000000), rpd=quota.get('rpd', 1500), base_interval=self.interval
+        )
+        self._last_estimated_tokens = estimate_request_tokens(settings['prompt'], (0, 0))
+        self.backend.set_request_gate(self.try_extra_request)
+        # OCR 엔진을 쓰면 인식한 원문이 바뀌지 않은 프레임은 요청하지 않고, text_only면 원문 텍스트만 전송
+        self.ocr_engine = ocr_engine or create_ocr_engine(settings.get('ocr_engine', "none"), settings.get('ocr_language', "jpn"))
+        self.text_only = bool(self.ocr_engine) and settings.get('ocr_text_only', False)
+        self._last_source_text = None
+        # 변화 감지기와 직전 OCR 원문은 전처리 스레드만 다루고, 요청 스레드는 실패 시 초기화를 이 이벤트로 요청
+        self._reset_detection = threading.Event()
+        self.translation_memory = translation_memory # OCR 원문이 있을 때만 사용
+        self.on_memory_lookup = on_memory_lookup
+        self.use_streaming = settings.get('use_streaming', False)
+        self.on_partial = on_partial
+        self.on_stage_timing = on_stage_timing
+        self.counters = Counter()
+        self.capture_finished = False
+        self._counter_lock = threading.Lock()
+        self.regions = settings.get('regions') or [settings.get('region')]
+        self.region_names = [region.get('name') for region in self.regions] if len(self.regions) > 1 else []
+        self.request_prompt = build_region_prompt(
+            settings['text_prompt'] if self.text_only else settings['prompt'], self.region_names, self.text_only
+        )
+        self.cache_namespace = TranslationCache.namespace(self.request_prompt, settings['model'])
+        self._threads = []
+        self._next_seq = 0
+        self._request_slots = threading.BoundedSemaphore(self.max_concurrent_requests)
+        self._executor = None
+
+    def result_cache_namespace(self, result):
+        """응답을 저장할 캐시 구역. 키/모델 풀에서 다른 모델이 응답했으면 그 모델의 구역에 저장"""
+        if not result.model or result.model == self.settings['model']: return self.cache_namespace
+        return TranslationCache.namespace(self.request_prompt, result.model)
+
+    def count(self, name, amount=1):
+        with self._counter_lock: self.counters[name] += amount
+
+    def record_timing(self, stage, started):
+        """started(perf_counter 값)부터 지금까지를 stage의 소요 시간으로 보고"""
+        if self.on_stage_timing: self.on_stage_timing(stage, time.perf_counter() - started)
+
+    def is_idle(self):
+        """리플레이가 끝난 뒤 큐에 남은 프레임과 진행 중인 요청이 모두 처리되었는지"""
+        with self._counter_lock:
+            counters = self.counters
+            return (self.capture_finished
+                    and counters['frames_captured'] == counters['frames_preprocessed'] + self.capture_queue.dropped
+                    and counters['frames_queued'] == counters['requests'] + self.translate_queue.dropped
+                    and counters['requests'] == counters['responses'])
+
+    def start(self):
+        self.is_running = True
+        for name, target in (("capture", self.capture_loop), ("preprocess", self.preprocess_loop), ("translate", self.translate_loop)):
+            thread = threading.Thread(target=target, name=f"pipeline-{name}", daemon=True)
+            self._threads.append(thread); thread.start()
+
+    def stop(self):
+        self.is_running = False
+        self.capture_queue.close(); self.translate_queue.close()
+        if self._executor: self._executor.shutdown(wait=False)
+
+    def capture_loop(self):
+        next_capture = time.monotonic()
+        while self.is_running:
+            try:
+                started = time.perf_counter()
+                images = self.capture_backend.grab_regions(self.regions)
+                if images is None: print("리플레이 프레임을 모두 재생했습니다."); self.capture_finished = True; break
+                # 여러 영역은 세로로 이어 붙여 한 프레임으로 처리 (요청도 한 번)
+                screenshot_pil, region_boxes = compose_regions(images)
+                self.record_timing('capture', started)
+                self.count('frames_captured')
+                self.capture_queue.put({
+                    'seq': self._next_seq, 'image': screenshot_pil, 'region_boxes': region_boxes, 'captured_at': time.monotonic()
+                })
+                self._next_seq += 1
+            except Exception as e:
+                error_message = f"화면 캡처 중 오류: {type(e).__name__} - {e}\n"
+                print(error_message); self.output(error_message, on_overlay=True)
+                time.sleep(max(2.0, self.interval))
+            # 번역 요청 소요 시간과 무관하게 설정한 주기로 계속 캡처
+            next_capture = max(next_capture + self.interval, time.monotonic())
+            time.sleep(max(0.0, next_capture - time.monotonic()))
+        self.capture_backend.close()
+        print("캡처 루프 종료.")
+
+    def preprocess_loop(self):
+        while self.is_running:
+            frame = self.capture_queue.get(timeout=0.5)
+            if frame is None: continue
+            try:
+                screenshot_pil = frame['image']
+                if self._reset_detection.is_set():
+                    self._reset_detection.clear(); self.change_detector.reset(); self._last_source_text = None
+                # 원본 프레임의 썸네일 지문으로 변화 감지 (리사이즈/인코딩 전에 판단해 불필요한 작업 생략)
+                started = time.perf_counter()
+                changed = self.change_detector.has_changed(screenshot_pil, frame['captured_at'])
+                self.record_timing('detect', started)
+                if not changed:
+                    self.count('frames_settling' if self.change_detector.is_settling else 'frames_unchanged'); continue
+                source_text = None
+                if self.ocr_engine:
+                    started = time.perf_counter()
+                    source_text = self.recognize_text(screenshot_pil, frame['region_boxes'])
+                    self.record_timing('ocr', started)
+                    normalized_text = normalize_ocr_text(source_text)
+                    # 애니메이션 등으로 픽셀만 바뀌고 글자는 그대로인 경우 요청 생략
+                    if normalized_text == self._last_source_text: self.count('frames_text_unchanged'); continue
+                    self._last_source_text = normalized_text
+                    if self.text_only and not normalized_text: self.count('frames_text_unchanged'); continue
+                if not self.text_only:
+                    started = time.perf_counter()
+                    screenshot_pil = self.encoder.prepare(screenshot_pil)
+                    self.record_timing('prepare', started)
+                frame.update({'image_size': None if self.text_only else screenshot_pil.size, 'source_text': source_text})
+                if self.translation_memory is not None and source_text:
+                    remembered_text = self.translation_memory.lookup(source_text)
+                    if self.on_memory_lookup: self.on_memory_lookup()
+                    if remembered_text is not None:
+                        self.count('memory_hits')
+                        self.output(remembered_text + "\n---\n", on_overlay=True, seq=frame['seq']); continue
+                fingerprint = None
+                if self.cache:
+                    if self.text_only: fingerprint = "text:" + hashlib.sha1(normalize_ocr_text(source_text).encode('utf-8')).hexdigest()
+                    else: fingerprint = image_fingerprint(screenshot_pil)
+                    cached_text = self.cache.get(self.cache_namespace, fingerprint)
+                    if self.on_cache_lookup: self.on_cache_lookup()
+                    if cached_text is not None:
+                        self.count('cache_hits')
+                        self.output(cached_text + "\n---\n", on_overlay=True, seq=frame['seq']); continue
+                frame.update({'image': screenshot_pil, 'fingerprint': fingerprint})
+                if not self.text_only:
+                    started = time.perf_counter()
+                    img_bytes, mime_type = self.encoder.encode(screenshot_pil)
+                    self.record_timing('encode', started)
+                    if self.on_frame_encoded: self.on_frame_encoded(self.encoder.last_size, self.encoder.last_encode_ms)
+                    frame.update({'data': img_bytes, 'mime_type': mime_type})
+                self.count('frames_queued')
+                self.translate_queue.put(frame)
+            except Exception as e:
+                error_message = f"이미지 처리 중 오류: {type(e).__name__} - {e}\n"
+                print(error_message); self.output(error_message, on_overlay=True)
+            finally: self.count('frames_preprocessed')
+        print("전처리 루프 종료.")
+
+    def translate_loop(self):
+        # 동시 요청 수만큼 슬롯이 비어 있을 때만 큐에서 꺼내므로, 모든 슬롯이 사용 중이면 큐에는 최신 프레임만 남음
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_requests, thread_name_prefix="pipeline-request")
+        while self.is_running:
+            if not self._request_slots.acquire(timeout=0.5): continue
+            # 요청 한도에 여유가 생길 때까지 기다린 뒤 큐에서 꺼내야 대기 중 캡처된 최신 프레임을 보냄
+            if not self.wait_for_request_budget():
+                self._request_slots.release(); continue
+            frame = self.translate_queue.get(timeout=0.5)
+            if frame is None or not self.is_running:
+                self._request_slots.release(); continue
+            frame['estimated_tokens'] = self._last_estimated_tokens = estimate_request_tokens(
+                self.request_prompt + (frame['source_text'] or ""), frame['image_size']
+            )
+            self.scheduler.consume(frame['estimated_tokens'])
+            self.notify_schedule_update()
+            self.count('requests')
+            self.count('bytes_uploaded', len(frame['data']) if 'data' in frame else len((frame['source_text'] or "").encode('utf-8')))
+            try: self._executor.submit(self._run_request, frame)
+            except RuntimeError: self._request_slots.release() # 중지 중 executor가 이미 종료됨
+        print("번역 루프 종료.")
+
+    def recognize_text(self, image, region_boxes):
+        if not self.region_names: return self.ocr_engine.recognize(image).strip()
+        # 영역별로 따로 인식해 '[이름]' 줄로 구분 (응답도 같은 표시로 나뉘도록)
+        blocks = []
+        for name, box in zip(self.region_names, region_boxes):
+            text = self.ocr_engine.recognize(image.crop(box)).strip()
+            blocks.append(f"[{name}]\n{text}" if text else f"[{name}]")
+        # 모든 영역에 글자가 없으면 빈 문자열 (text_only에서 요청 생략)
+        return "\n".join(blocks) if any("\n" in block for block in blocks) else ""
+
+    def wait_for_request_budget(self):
+        daily_limit_reported = False
+        while self.is_running:
+            wait = self.scheduler.wait_time(self._last_estimated_tokens)
+            if wait <= 0: return True
+            if wait == float('inf') and not daily_limit_reported:
+                self.output("일일 요청 한도에 도달했습니다. 날짜가 바뀌면 다시 요청합니다.\n", on_overlay=True)
+                daily_limit_reported = True
+            time.sleep(min(wait, 0.5))
+        return False
+
+    def try_extra_request(self):
+        """백엔드가 스스로 보내는 추가 요청(중복 요청)도 요청 한도에서 차감. 여유가 없으면 False"""
+        if not self.scheduler.try_acquire(self._last_estimated_tokens): return False
+        self.count('extra_requests')
+        self.notify_schedule_update()
+        return True
+
+    def notify_schedule_update(self):
+        if self.on_schedule_update: self.on_schedule_update(self.scheduler)
+
+    def _run_request(self, frame):
+        try: self.translate_frame(frame)
+        finally:
+            self.count('responses')
+            self._request_slots.release()
+
+    def translate_frame(self, frame):
+        try:
+            image = None if self.text_only else (frame['data'], frame['mime_type'])
+            on_partial = None
+            if self.use_streaming:
+                def on_partial(text):
+                    if not self.is_running: return False # 중지되면 나머지 청크는 받지 않음
+                    if self.on_partial: self.on_partial(text, frame['seq'])
+            started = time.perf_counter()
+            result = self.backend.translate(self.request_prompt, frame['source_text'], image, on_partial=on_partial)
+            self.record_timing('translate', started)
+            if result is None: return
+            if result.ok:
+                if self.cache and frame['fingerprint']: self.cache.put(self.result_cache_namespace(result), frame['fingerprint'], result.text)
+                if self.translation_memory is not None and frame['source_text']: self.translation_memory.add(frame['source_text'], result.text)
+            self.scheduler.report_success(frame['estimated_tokens'], result.used_tokens)
+            self.notify_schedule_update()
+            if self.is_running:
+                self.output(result.text + "\n---\n", on_overlay=True, seq=frame['seq'])
+                if self.on_stage_timing: self.on_stage_timing('total', time.monotonic() - frame['captured_at'])
+
+        except QuotaExceededError as e:
+            error_message_detail = str(e)
+            parsed_details = e.details
+            user_message = f"API 할당량 초과: {error_message_detail}\n"
+            wait_time_for_user_info = "정보 없음"
+            if parsed_details:
+                quota_id_str = parsed_details.get("quota_id", "정보 없음")
+                quota_value_str = parsed_details.get("quota_value", "정보 없음")
+                retry_delay_str = parsed_details.get("retry_delay", "정보 없음")
+                user_message = (
+                    "API 할당량 초과\n"
+                    f"초과 사항 : {quota_id_str}\n할당량 : {quota_value_str}\n"
+                )
+                if retry_delay_str and retry_delay_str != "정보 없음":
+                     wait_time_for_user_info = f"{retry_delay_str}초"
+            self.count('quota_errors')
+            delay = self.scheduler.report_quota_error(e.retry_delay)
+            user_message += f"권장 재시도 대기: {wait_time_for_user_info}. {delay:.1f}초 후 재시도합니다."
+            print(user_message); self.output(user_message + "\n", on_overlay=True)
+            self._reset_detection.set() # 실패한 화면도 다음 캡처에서 다시 요청되도록
+            self.notify_schedule_update()
+
+        except Exception as e:
+            self.count('errors')
+            error_message = f"번역 중 오류: {type(e).__name__} - {e}\n"
+            print(error_message); self.output(error_message, on_overlay=True)
+            self._reset_detection.set()
+            if "rate limit" in str(e).lower():
+                delay = self.scheduler.report_quota_error()
+                self.output(f"API 요청 빈도 제한. {delay:.1f}초 후 재시도.\n", on_overlay=True)
+            else: self.scheduler.report_error()
+            self.notify_schedule_update()
@@ -0,0 +1,74 @@
+# VideoSource.py
+import os
+from PIL import Image, ImageSequence
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov', '.webm', '.m4v', '.wmv')
+DEFAULT_FRAME_DURATION = 0.1 # 프레임 길이 정보가 없는 GIF/APNG 프레임 (초)
+MIN_SAMPLE_INTERVAL = 0.05 # 표본 간격 하한 (멈춘 화면도 여러 번 봐야 출력 대기 판단이 가능)
+
+class VideoFrameReader:
+    """동영상 또는 움직이는 이미지(GIF/APNG/WebP)에서 sample_interval초 간격으로 (영상 시각 초, RGB 이미지)를 읽음.
+    동영상은 OpenCV(opencv-python)가 필요하고, 움직이는 이미지는 Pillow만으로 읽음"""
+
+    def __init__(self, path, sample_interval=0.5):
+        if not os.path.isfile(path): raise ValueError(f"파일을 찾을 수 없습니다: {path}")
+        self.path = path
+        self.sample_interval = max(MIN_SAMPLE_INTERVAL, sample_interval)
+        self.end_time = 0.0 # 지금까지 읽은 마지막 프레임이 끝나는 시각
+
+    def frames(self):
+        if self.path.lower().endswith(VIDEO_EXTENSIONS): return self._read_video()
+        return self._read_animation()
+
+    def _read_video(self):
+        try: import cv2
+        except ImportError: raise RuntimeError("동영상을 읽으려면 opencv-python 패키지가 필요합니다. (pip install opencv-python)") from None
+        capture = cv2.VideoCapture(self.path)
+        if not capture.isOpened(): raise ValueError(f"동영상을 열 수 없습니다: {self.path}")
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        index = 0
+        next_sample = 0.0
+        try:
+            # 표본 사이 프레임은 grab()만 해서 색 변환과 이미지 복사를 생략
+            while capture.grab():
+                timestamp = index / fps
+                index += 1; self.end_time = index / fps
+                if timestamp + 1e-6 < next_sample: continue
+                ok, frame = capture.retrieve()
+                if not ok: continue
+                next_sample = timestamp + self.sample_interval
+                yield timestamp, Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        finally: capture.release()
+
+    def _read_animation(self):
+        with Image.open(self.path) as image:
+            timestamp = 0.0
+            next_sample = 0.0
+            for frame in ImageSequence.Iterator(image):
+                duration = (frame.info.get('duration') or 0) / 1000.0 or DEFAULT_FRAME_DURATION
+                end = timestamp + duration
+                # 프레임 길이가 제각각이므로 표본 시각마다 그 시각에 보이는 프레임을 돌려줌 (오래 멈춘 화면은 같은 이미지를 여러 번)
+                rgb = None
+                while next_sample < end - 1e-6:
+                    if rgb is None: rgb = frame.convert('RGB')
+                    yield max(next_sample, timestamp), rgb
+                    next_sample = max(next_sample, timestamp) + self.sample_interval
+                timestamp = self.end_time = end
+
+def detect_keyframes(frames, detector, compose=None):
+    """(초, 이미지) 중 번역 영역의 글자가 바뀌고 화면이 멈춘 프레임만 (변화가 시작된 초, 이미지)로 돌려줌.
+    detector는 FrameChangeDetector이며 영상 시각을 now로 넘기므로 settle_time도 영상 시간 기준. compose는 영역 잘라내기/합치기"""
+    change_started = None
+    last = None
+    for timestamp, image in frames:
+        if compose: image = compose(image)
+        last = (timestamp, image)
+        if detector.has_changed(image, timestamp):
+            yield (timestamp if change_started is None else change_started), image
+            change_started = None
+        elif detector.is_settling:
+            if change_started is None: change_started = timestamp
+        else: change_started = None
+    # 영상이 글자 출력 도중에 끝나면 마지막 프레임을 멈춘 화면으로 보고 판단
+    if detector.is_settling and last is not None and detector.has_changed(last[1], last[0] + detector.max_settle_time):
+        yield change_started, last[1]
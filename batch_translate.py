@@ -0,0 +1,374 @@
+# batch_translate.py
+"""저장해 둔 스크린샷 폴더를 한 번에 번역 (QA 캡처, 위키 자료 추출 등)
+
+이미지 읽기/리사이즈/인코딩은 프로세스 풀에서 실시간 번역과 같은 전처리(ImageEncoder)로 하고, 거의 같은 화면은
+변화 감지와 같은 지문으로 묶어 한 번만 요청. 요청은 모델 한도(RequestScheduler) 안에서 동시에 보냄.
+결과는 이미지마다 바로 매니페스트(JSON 줄)에 기록되므로 중단한 뒤 다시 실행하면 끝난 이미지는 건너뜀
+
+예) python batch_translate.py screenshots --region 100,700,1200,250 --concurrency 4 --resize 50
+    python batch_translate.py screenshots --recursive --api-key KEY1,KEY2 --fallback-models gemini-2.0-flash
+매니페스트 줄 형식: {"file": ..., "ok": true, "text": ..., "source": "request" | "cache" | "duplicate" | "blank", "duplicate_of": ..., ...}
+"""
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import datetime
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from CaptureBackend import REPLAY_IMAGE_EXTENSIONS, crop_region
+from FrameChangeDetector import FrameChangeDetector, DIFF_PIXEL_THRESHOLD, image_fingerprint
+from ImageEncoder import ImageEncoder, find_text_bbox
+from RequestScheduler import RequestScheduler, estimate_request_tokens
+from TranslationBackend import QuotaExceededError
+from TranslationCache import TranslationCache
+from RegionLayout import assign_region_names, parse_region, compose_regions, build_region_prompt, split_region_translations
+from AppSettings import CACHE_FILE, GEMINI_MODEL_QUOTAS, parse_quota_section
+from headless import add_pipeline_arguments, add_backend_arguments, build_pipeline_settings, create_backend, load_config, load_prompt
+
+MANIFEST_NAME = "translations.jsonl"
+MAX_ATTEMPTS = 5 # 할당량 외 오류로 실패한 이미지를 다시 요청하는 최대 횟수
+PROGRESS_INTERVAL = 5.0 # 진행 상황 출력 주기 (초)
+
+def find_images(image_dir, recursive=False):
+    """폴더의 이미지 경로를 이름순으로 (recursive면 하위 폴더 포함)"""
+    if not recursive:
+        return sorted(os.path.join(image_dir, name) for name in os.listdir(image_dir) if name.lower().endswith(REPLAY_IMAGE_EXTENSIONS))
+    paths = []
+    for root, dirs, names in os.walk(image_dir):
+        dirs.sort()
+        paths.extend(os.path.join(root, name) for name in sorted(names) if name.lower().endswith(REPLAY_IMAGE_EXTENSIONS))
+    return paths
+
+class FramePreparer:
+    """실시간 번역과 같은 순서로 이미지 한 장을 요청용으로 처리 (영역 잘라내기 → 합치기 → 지문 → prepare → encode).
+    skip_blank면 글자 영역이 보이지 않는 이미지는 인코딩하지 않고 {'blank': True}"""
+
+    def __init__(self, settings, skip_blank=False):
+        self.encoder = ImageEncoder.from_settings(settings)
+        self.detector = FrameChangeDetector(
+            method=settings['change_method'], threshold=settings['change_threshold'], ignore_regions=settings['ignore_regions']
+        )
+        self.regions = settings['regions']
+        self.skip_blank = skip_blank
+
+    def compose(self, image):
+        return compose_regions([crop_region(image, region) for region in self.regions])[0]
+
+    def __call__(self, composed):
+        try:
+            if self.skip_blank and find_text_bbox(composed) is None: return {'blank': True}
+            prepared = self.encoder.prepare(composed)
+            data, mime_type = self.encoder.encode(prepared)
+            return {
+                'thumbnail': self.detector.fingerprint(composed), 'fingerprint': image_fingerprint(prepared),
+                'image_size': prepared.size, 'data': data, 'mime_type': mime_type,
+            }
+        except Exception as e:
+            return {'error': f"{type(e).__name__} - {e}"}
+
+_worker = {} # 프로세스 풀 워커마다 한 번 만드는 FramePreparer
+
+def _init_worker(settings):
+    _worker['preparer'] = FramePreparer(settings)
+
+def preprocess_image(path):
+    """워커 프로세스에서 실행"""
+    preparer = _worker['preparer']
+    try:
+        with Image.open(path) as image: image = image.convert('RGB')
+    except Exception as e:
+        return {'error': f"{type(e).__name__} - {e}"}
+    return preparer(preparer.compose(image))
+
+class FingerprintIndex:
+    """거의 같은 화면 찾기. 크기가 같은 썸네일 지문을 한 배열에 모아 두고 한 번에 거리 계산"""
+
+    def __init__(self, method, threshold):
+        self.method = method
+        self.threshold = threshold
+        self._blocks = {} # 지문 모양 -> [지문 배열 (용량만큼 미리 할당), 사용 중인 개수, 항목 목록]
+
+    def _distances(self, block, fingerprint):
+        if self.method == "diff": return np.count_nonzero(np.abs(block - fingerprint) > DIFF_PIXEL_THRESHOLD, axis=(1, 2))
+        return np.count_nonzero(block != fingerprint, axis=(1, 2))
+
+    def find(self, fingerprint):
+        """임계값 안에서 가장 가까운 항목 (없으면 None)"""
+        entry = self._blocks.get(fingerprint.shape)
+        if not entry or not entry[1]: return None
+        distances = self._distances(entry[0][:entry[1]], fingerprint)
+        index = int(np.argmin(distances))
+        return entry[2][index] if distances[index] <= self.threshold else None
+
+    def add(self, fingerprint, item):
+        entry = self._blocks.setdefault(fingerprint.shape, [np.empty((64,) + fingerprint.shape, dtype=fingerprint.dtype), 0, []])
+        if entry[1] == len(entry[0]): entry[0] = np.concatenate([entry[0], np.empty_like(entry[0])]) # 가득 차면 두 배로
+        entry[0][entry[1]] = fingerprint
+        entry[1] += 1; entry[2].append(item)
+
+class BatchTranslator:
+    """이미지 목록을 전처리 → 중복 제거 → 한도 안에서 동시 요청 → 매니페스트 기록 순으로 처리"""
+
+    def __init__(self, settings, backend, manifest_path, base_dir, cache=None, workers=None):
+        self.settings = settings
+        self.backend = backend
+        self.manifest_path = manifest_path
+        self.base_dir = base_dir
+        self.cache = cache
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrent_requests = max(1, settings.get('max_concurrent_requests', 1))
+        quota = settings.get('quota') or {}
+        # 캡처 주기가 없으므로 요청 간격은 한도(토큰 버킷)와 오류 백오프로만 조절
+        self.scheduler = RequestScheduler(rpm=quota.get('rpm', 15), tpm=quota.get('tpm', 1000000), rpd=quota.get('rpd', 1500), base_interval=0.0)
+        self.region_names = [region['name'] for region in settings['regions']] if len(settings['regions']) > 1 else []
+        self.request_prompt = build_region_prompt(settings['prompt'], self.region_names)
+        self._last_estimated_tokens = estimate_request_tokens(self.request_prompt, (0, 0))
+        self.backend.set_request_gate(self.try_extra_request)
+        self.cache_namespace = TranslationCache.namespace(self.request_prompt, settings['model'])
+        self.index = FingerprintIndex(settings['change_method'], settings['change_threshold'])
+        self.counters = Counter()
+        self.completed = {} # 파일 -> 매니페스트 기록 (성공한 것만)
+        self.by_fingerprint = {} # 이미지 지문 -> 성공한 기록 (이전 실행 포함)
+        self._retry = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.max_concurrent_requests)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._daily_limit = False
+        self._next_progress = 0.0
+        self.total = None # 처리할 항목 수 (모르면 None)
+
+    def result_cache_namespace(self, result):
+        """응답을 저장할 캐시 구역. 키/모델 풀에서 다른 모델이 응답했으면 그 모델의 구역에 저장"""
+        if not result.model or result.model == self.settings['model']: return self.cache_namespace
+        return TranslationCache.namespace(self.request_prompt, result.model)
+
+    def count(self, name, amount=1):
+        with self._lock: self.counters[name] += amount
+
+    def relative_path(self, path):
+        return os.path.relpath(path, self.base_dir).replace(os.sep, '/')
+
+    def load_manifest(self):
+        """이전 실행의 매니페스트를 읽어 성공한 이미지 목록을 복원 (같은 파일의 마지막 기록 기준)"""
+        if not os.path.exists(self.manifest_path): return
+        with open(self.manifest_path, encoding='utf-8') as f:
+            for line in f:
+                try: record = json.loads(line)
+                except ValueError: continue # 중단되면서 잘린 마지막 줄
+                if record.get('ok'):
+                    self.completed[record['file']] = record
+                    if record.get('fingerprint'): self.by_fingerprint[record['fingerprint']] = record
+                else: self.completed.pop(record.get('file'), None)
+
+    def is_done(self, item):
+        """이전 실행에서 같은 파일(크기/수정 시각 동일)의 번역을 마쳤는지"""
+        record = self.completed.get(item['file'])
+        return record is not None and record.get('size') == item['size'] and record.get('mtime') == item['mtime']
+
+    def write_record(self, item, ok, text=None, source=None, duplicate_of=None, error=None):
+        record = {
+            'file': item['file'], 'size': item['size'], 'mtime': item['mtime'], 'fingerprint': item.get('fingerprint'),
+            'ok': ok, 'text': text, 'source': source, 'duplicate_of': duplicate_of,
+            'time': datetime.datetime.now().isoformat(timespec='seconds'), **item.get('extra', {}),
+        }
+        if ok and self.region_names: record['regions'] = split_region_translations(text, self.region_names)
+        if error: record['error'] = error
+        with self._lock:
+            self.manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.manifest.flush()
+            self.counters['translated' if ok else 'failed'] += 1
+            if ok:
+                self.completed[record['file']] = record
+                if record['fingerprint']: self.by_fingerprint[record['fingerprint']] = record
+        self.report_progress()
+
+    def report_progress(self, final=False):
+        now = time.monotonic()
+        if not final and now < self._next_progress: return
+        self._next_progress = now + PROGRESS_INTERVAL
+        counters = self.counters
+        total = f"/{self.total}" if self.total is not None else ""
+        print(f"진행 {counters['translated'] + counters['failed']}{total}"
+              f" (요청 {counters['requests']}, 중복 {counters['duplicates']}, 캐시 {counters['cache_hits']},"
+              f" 할당량 오류 {counters['quota_errors']}, 실패 {counters['failed']})", file=sys.stderr)
+
+    def finish(self, item, ok, text=None, error=None):
+        """대표 이미지와 그 이미지에 묶인 중복 이미지들의 결과를 기록"""
+        self.write_record(item, ok, text, source="request" if ok else None, error=error)
+        with self._lock: followers, item['followers'] = item['followers'], []; item['result'] = (ok, text, error)
+        for follower in followers:
+            self.write_record(follower, ok, text, source="duplicate" if ok else None, duplicate_of=item['file'], error=error)
+
+    def handle_image(self, item, prepared):
+        if 'error' in prepared:
+            self.write_record(item, False, error=f"이미지 처리 오류: {prepared['error']}"); return
+        if prepared.get('blank'): self.count('blank'); self.write_record(item, True, "", source="blank"); return
+        item['fingerprint'] = fingerprint = prepared['fingerprint']
+        previous = self.by_fingerprint.get(fingerprint)
+        if previous is not None: # 이전 실행이나 앞선 이미지와 전처리 결과가 같음
+            self.count('duplicates')
+            self.write_record(item, True, previous['text'], source="duplicate", duplicate_of=previous['file']); return
+        if self.cache:
+            cached_text = self.cache.get(self.cache_namespace, fingerprint)
+            if cached_text is not None:
+                self.count('cache_hits')
+                self.write_record(item, True, cached_text, source="cache"); return
+        representative = self.index.find(prepared['thumbnail'])
+        if representative is not None:
+            self.count('duplicates')
+            with self._lock:
+                result = representative['result']
+                if result is None: representative['followers'].append(item); return # 대표 이미지의 응답이 오면 함께 기록
+            ok, text, error = result
+            self.write_record(item, ok, text, source="duplicate" if ok else None, duplicate_of=representative['file'], error=error)
+            return
+        item.update({
+            'data': prepared['data'], 'mime_type': prepared['mime_type'], 'followers': [], 'result': None, 'attempts': 0,
+            'estimated_tokens': estimate_request_tokens(self.request_prompt, prepared['image_size']),
+        })
+        self.index.add(prepared['thumbnail'], item)
+        self.dispatch(item)
+
+    def wait_for_request_budget(self, estimated_tokens):
+        while True:
+            wait = self.scheduler.wait_time(estimated_tokens)
+            if wait <= 0: return True
+            if wait == float('inf'):
+                if not self._daily_limit: print("일일 요청 한도에 도달했습니다. 남은 이미지는 다음 실행에서 이어서 번역합니다.", file=sys.stderr)
+                self._daily_limit = True
+                return False
+            time.sleep(min(wait, 0.5))
+
+    def dispatch(self, item):
+        """요청 슬롯과 한도에 여유가 생기면 요청을 보냄. 일일 한도에 도달했으면 기록하지 않고 남겨 둠 (다음 실행에서 번역)"""
+        if self._daily_limit: return
+        self._slots.acquire()
+        if not self.wait_for_request_budget(item['estimated_tokens']): self._slots.release(); return
+        self.scheduler.consume(item['estimated_tokens'])
+        self._last_estimated_tokens = item['estimated_tokens']
+        with self._lock: self._in_flight += 1; self.counters['requests'] += 1
+        self._executor.submit(self._run_request, item)
+
+    def try_extra_request(self):
+        """중복 요청도 요청 한도에서 차감. 여유가 없으면 False"""
+        if not self.scheduler.try_acquire(self._last_estimated_tokens): return False
+        self.count('extra_requests')
+        return True
+
+    def drain_retries(self):
+        while True:
+            try: item = self._retry.get_nowait()
+            except queue.Empty: return
+            self.dispatch(item)
+
+    def _run_request(self, item):
+        try: self.translate_image(item)
+        finally:
+            with self._lock: self._in_flight -= 1
+            self._slots.release()
+
+    def translate_image(self, item):
+        item['attempts'] += 1
+        try:
+            result = self.backend.translate(self.request_prompt, None, (item['data'], item['mime_type']))
+            if result is None: raise RuntimeError("응답이 없습니다.")
+        except QuotaExceededError as e:
+            # 한도 초과는 실패로 세지 않고 권장 대기 시간 뒤 다시 요청
+            self.count('quota_errors')
+            self.scheduler.report_quota_error(e.retry_delay)
+            self._retry.put(item); return
+        except Exception as e:
+            self.count('errors')
+            self.scheduler.report_error()
+            if item['attempts'] < MAX_ATTEMPTS: self._retry.put(item)
+            else: self.finish(item, False, error=f"{type(e).__name__} - {e}")
+            return
+        self.scheduler.report_success(item['estimated_tokens'], result.used_tokens)
+        if result.ok and self.cache: self.cache.put(self.result_cache_namespace(result), item['fingerprint'], result.text)
+        self.finish(item, result.ok, result.text if result.ok else None, error=None if result.ok else result.text)
+
+    def translate_prepared(self, prepared_items, resume=True):
+        """(항목, 전처리 결과)를 차례로 받아 중복 확인 후 요청하고, 남은 요청이 모두 끝날 때까지 기다림.
+        항목: {'file': 매니페스트 키, 'size', 'mtime', 'extra': 기록에 덧붙일 값 (선택)}"""
+        started = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_requests, thread_name_prefix="batch-request")
+        self.manifest = open(self.manifest_path, 'a' if resume else 'w', encoding='utf-8')
+        try:
+            for item, prepared in prepared_items:
+                self.drain_retries()
+                self.handle_image(item, prepared)
+                if self._daily_limit: break
+            while not self._daily_limit:
+                self.drain_retries()
+                with self._lock: busy = self._in_flight
+                if not busy and self._retry.empty(): break
+                time.sleep(0.1)
+        except KeyboardInterrupt: print("중단합니다. 다시 실행하면 남은 부분부터 이어서 번역합니다.", file=sys.stderr)
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self.manifest.close()
+        self.report_progress(final=True)
+        self.counters['elapsed'] = round(time.monotonic() - started, 1)
+        return self.counters
+
+    def run(self, paths, resume=True):
+        if resume: self.load_manifest()
+        pending = []
+        for path in paths:
+            stat = os.stat(path)
+            item = {'file': self.relative_path(path), 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+            if self.is_done(item): self.counters['skipped'] += 1; continue
+            pending.append((path, item))
+        self.total = len(pending)
+        if self.counters['skipped']: print(f"이전 실행에서 번역한 이미지 {self.counters['skipped']}장은 건너뜁니다.", file=sys.stderr)
+        if not pending: return self.counters
+        # 전처리는 여러 프로세스에서 미리 진행하고, 끝난 순서(이름순)대로 중복 확인 후 요청
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(pending)), initializer=_init_worker, initargs=(self.settings,)) as pool:
+            results = pool.map(preprocess_image, [path for path, _ in pending], chunksize=4)
+            counters = self.translate_prepared(((item, prepared) for (_, item), prepared in zip(pending, results)), resume)
+            if self._daily_limit: pool.shutdown(wait=False, cancel_futures=True)
+        return counters
+
+def run(args):
+    if args.ocr_engine != "none" or args.ocr_text_only: raise SystemExit("일괄 번역은 이미지 요청만 지원합니다. (OCR 옵션 없이 실행하세요)")
+    if not os.path.isdir(args.image_dir): raise SystemExit(f"이미지 폴더를 찾을 수 없습니다: {args.image_dir}")
+    paths = find_images(args.image_dir, args.recursive)
+    if not paths: raise SystemExit(f"이미지가 없습니다: {args.image_dir}")
+    config = load_config()
+    model_quotas = parse_quota_section(config, {model: dict(quota) for model, quota in GEMINI_MODEL_QUOTAS.items()})
+    backend, quota = create_backend(args, config, model_quotas)
+    regions = [parse_region(value) for value in args.region or []]
+    regions = assign_region_names(regions, ",".join(region['name'] for region in regions)) if regions else [None]
+    settings = build_pipeline_settings(args, quota, regions=regions, prompt=load_prompt(args), model=backend.model)
+    cache = TranslationCache(CACHE_FILE) if args.cache else None
+    translator = BatchTranslator(
+        settings, backend, args.output or os.path.join(args.image_dir, MANIFEST_NAME), args.image_dir, cache=cache, workers=args.workers
+    )
+    try: counters = translator.run(paths, resume=not args.restart)
+    finally:
+        if cache: cache.close()
+    print(json.dumps(dict(counters), ensure_ascii=False))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="스크린샷 폴더를 일괄 번역해 매니페스트(JSON 줄)로 저장 (중단 후 이어서 실행 가능)")
+    parser.add_argument('image_dir', help="이미지 폴더")
+    parser.add_argument('--output', help=f"매니페스트 파일 (기본: 이미지 폴더의 {MANIFEST_NAME})")
+    parser.add_argument('--recursive', action='store_true', help="하위 폴더의 이미지도 번역")
+    parser.add_argument('--region', action='append', help="이미지에서 번역할 영역 'left,top,width,height[,이름]' (지정하지 않으면 전체)")
+    parser.add_argument('--workers', type=int, default=0, help="이미지 전처리 프로세스 수 (0이면 CPU 코어 수)")
+    parser.add_argument('--cache', action='store_true', help="번역 캐시 사용 (실시간 번역과 공유)")
+    parser.add_argument('--restart', action='store_true', help="매니페스트의 이전 결과를 무시하고 처음부터 번역")
+    add_backend_arguments(parser)
+    add_pipeline_arguments(parser)
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    run(parse_args())
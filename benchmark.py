@@ -0,0 +1,112 @@
+# benchmark.py
+"""녹화해 둔 프레임 폴더를 실제 파이프라인(캡처 → 변화 감지 → 리사이즈 → 인코딩 → 번역)에 흘려보내고
+단계별 소요 시간, 건너뛴 프레임 수, 요청 수, 전송 바이트를 측정 (화면/Tk 창/API 키 없이 실행)
+
+예) python benchmark.py recorded_frames --resize 50 --interval 0.5 --latency 0.8 --quota-error-rate 0.05
+"""
+import sys
+import argparse
+import json
+import time
+from collections import defaultdict
+
+from CaptureBackend import ReplayCapture
+from OcrEngine import create_ocr_engine
+from TranslationBackend import FakeTranslationBackend
+from BackendPool import BackendPool
+from TranslationPipeline import TranslationPipeline
+from PipelineStats import PIPELINE_STAGES, percentile
+from AppSettings import GEMINI_MODEL_QUOTAS
+from headless import add_pipeline_arguments, build_pipeline_settings
+
+def summarize_timings(timings):
+    summary = {}
+    for stage in PIPELINE_STAGES:
+        values = sorted(timings.get(stage, ()))
+        if not values: continue
+        summary[stage] = {
+            'count': len(values), 'mean_ms': sum(values) / len(values) * 1000,
+            'p50_ms': percentile(values, 50) * 1000, 'p95_ms': percentile(values, 95) * 1000, 'max_ms': values[-1] * 1000,
+        }
+    return summary
+
+def build_settings(args):
+    quota = {"rpm": 0, "tpm": 0, "rpd": 0} if args.no_quota else GEMINI_MODEL_QUOTAS[args.model]
+    quota = {name: limit * args.pool for name, limit in quota.items()} # 풀 전체 한도는 키별 한도의 합
+    return build_pipeline_settings(args, quota, capture_backend="replay", replay_dir=args.replay_dir)
+
+def run_benchmark(args):
+    timings = defaultdict(list)
+    backends = [FakeTranslationBackend(
+        latency=args.latency, latency_jitter=args.latency_jitter,
+        quota_error_rate=args.quota_error_rate, retry_delay=args.retry_delay, model=args.model
+    ) for _ in range(max(1, args.pool))]
+    rpm = 0 if args.no_quota else GEMINI_MODEL_QUOTAS[args.model]['rpm']
+    backend = backends[0] if len(backends) == 1 else BackendPool([(fake, f"{args.model} #{index + 1}", rpm, 0) for index, fake in enumerate(backends)])
+    pipeline = TranslationPipeline(
+        build_settings(args), backend, lambda text, on_overlay=False, seq=None: None,
+        capture_backend=ReplayCapture(args.replay_dir, loop=False),
+        ocr_engine=create_ocr_engine(args.ocr_engine, args.ocr_language),
+        on_stage_timing=lambda stage, seconds: timings[stage].append(seconds)
+    )
+    started = time.perf_counter()
+    pipeline.start()
+    deadline = time.monotonic() + args.timeout
+    while not pipeline.is_idle() and time.monotonic() < deadline: time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    timed_out = not pipeline.is_idle()
+    pipeline.stop()
+    counters = dict(pipeline.counters)
+    requests = counters.get('requests', 0)
+    return {
+        'settings': {
+            'replay_dir': args.replay_dir, 'model': args.model, 'interval': args.interval, 'resize': args.resize,
+            'resample': args.resample, 'format': args.format, 'quality': args.quality, 'auto_crop': args.auto_crop,
+            'change_method': args.change_method, 'settle_time': args.settle_time,
+            'change_threshold': args.change_threshold, 'concurrency': args.concurrency, 'latency': args.latency,
+            'quota_error_rate': args.quota_error_rate, 'ocr_engine': args.ocr_engine, 'pool': args.pool,
+        },
+        'elapsed_s': elapsed, 'timed_out': timed_out,
+        'frames_captured': counters.get('frames_captured', 0),
+        'frames_unchanged': counters.get('frames_unchanged', 0),
+        'frames_settling': counters.get('frames_settling', 0),
+        'frames_text_unchanged': counters.get('frames_text_unchanged', 0),
+        'frames_dropped': pipeline.capture_queue.dropped + pipeline.translate_queue.dropped,
+        'requests': requests, 'quota_errors': counters.get('quota_errors', 0), 'errors': counters.get('errors', 0),
+        'bytes_uploaded': counters.get('bytes_uploaded', 0),
+        'bytes_per_request': counters.get('bytes_uploaded', 0) / requests if requests else 0,
+        'stages': summarize_timings(timings),
+    }
+
+def print_report(report):
+    print(f"\n== {report['settings']['replay_dir']} ({report['elapsed_s']:.1f}초{', 시간 초과' if report['timed_out'] else ''})")
+    print(f"캡처 {report['frames_captured']} / 변화 없음 {report['frames_unchanged']} / 출력 대기 {report['frames_settling']}"
+          f" / 텍스트 동일 {report['frames_text_unchanged']}"
+          f" / 큐에서 버림 {report['frames_dropped']}")
+    print(f"요청 {report['requests']} / 할당량 오류 {report['quota_errors']} / 기타 오류 {report['errors']}"
+          f" / 전송 {report['bytes_uploaded'] / 1024:.1f} KB (요청당 {report['bytes_per_request'] / 1024:.1f} KB)")
+    print(f"{'단계':<10}{'횟수':>6}{'평균':>10}{'p50':>10}{'p95':>10}{'최대':>10}  (ms)")
+    for stage, stats in report['stages'].items():
+        print(f"{stage:<10}{stats['count']:>6}{stats['mean_ms']:>10.1f}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="리플레이 프레임으로 번역 파이프라인 성능 측정 (번역은 가짜 백엔드로 대체)")
+    parser.add_argument('replay_dir', help="프레임 이미지 폴더 (이름순으로 재생)")
+    add_pipeline_arguments(parser)
+    parser.add_argument('--latency', type=float, default=0.8, help="가짜 번역 응답 지연 (초)")
+    parser.add_argument('--latency-jitter', type=float, default=0.2, help="응답 지연의 ± 변동 폭 (초)")
+    parser.add_argument('--quota-error-rate', type=float, default=0.0, help="할당량 오류로 실패시킬 요청 비율 (0~1)")
+    parser.add_argument('--retry-delay', type=int, default=1, help="할당량 오류가 권장하는 재시도 대기 (초)")
+    parser.add_argument('--pool', type=int, default=1, help="가짜 백엔드 여러 개를 키 풀로 묶어 측정 (키 개수)")
+    parser.add_argument('--timeout', type=float, default=600.0, help="최대 측정 시간 (초)")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON 한 줄로 출력 (회귀 비교용)")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    json_stream = sys.stdout
+    # 파이프라인 스레드의 진행 메시지(종료 메시지 포함)가 JSON 출력에 섞이지 않도록 stdout을 stderr로 돌림 (headless.py와 같음)
+    if args.json: sys.stdout = sys.stderr
+    report = run_benchmark(args)
+    if args.json: print(json.dumps(report, ensure_ascii=False), file=json_stream, flush=True)
+    else: print_report(report)
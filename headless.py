@@ -0,0 +1,196 @@
+# headless.py
+"""Tk 창 없이 번역 파이프라인을 실행하고 결과를 JSON 한 줄씩 표준 출력으로 내보냄 (캡처 서버, 다른 도구로 파이프, 처리량 측정용)
+
+예) python -m headless --region 100,700,1200,250,대사 --model gemini-2.0-flash-lite
+    python -m headless --replay recorded_frames --backend openai --local-url http://127.0.0.1:8080/v1
+API 키는 --api-key, 환경 변수 GEMINI_API_KEY, transconfig.ini 순서로 찾음. 진행/오류 메시지는 표준 오류로 출력
+
+출력 줄 형식: {"type": "translation" | "partial" | "message" | "stats", "time": ..., ...}
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import threading
+import configparser
+
+from CaptureBackend import CAPTURE_BACKENDS, ReplayCapture, create_capture_backend
+from OcrEngine import OCR_ENGINES, create_ocr_engine
+from TranslationBackend import TRANSLATION_BACKENDS, DEFAULT_LOCAL_URL
+from BackendPool import parse_key_list, translation_backend_plan, plan_quota, create_planned_backend
+from HedgedBackend import HedgedBackend
+from TranslationCache import TranslationCache
+from TranslationMemory import TranslationMemory
+from TranslationPipeline import TranslationPipeline
+from PipelineStats import PipelineStats
+from RegionLayout import assign_region_names, parse_region, split_region_translations
+from AppSettings import (
+    CONFIG_FILE, CACHE_FILE, MEMORY_FILE, DEFAULT_PROMPT, DEFAULT_TEXT_PROMPT, GEMINI_MODELS, GEMINI_MODEL_QUOTAS,
+    DEFAULT_APP_SETTINGS, IMAGE_FORMATS, RESAMPLE_FILTERS, CHANGE_DETECTION_METHODS, parse_quota_section, parse_ignore_regions
+)
+
+def add_pipeline_arguments(parser):
+    """파이프라인 공통 옵션 (이미지 처리, 변화 감지, OCR, 요청 한도). benchmark.py와 함께 사용"""
+    parser.add_argument('--model', choices=GEMINI_MODELS, default=DEFAULT_APP_SETTINGS["model"], help="Gemini 모델 (요청 한도 기준)")
+    parser.add_argument('--no-quota', action='store_true', help="요청 한도 없이 실행 (로컬 서버 가정)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_APP_SETTINGS["interval"], help="캡처 주기 (초)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_APP_SETTINGS["max_concurrent_requests"])
+    parser.add_argument('--resize', type=int, default=DEFAULT_APP_SETTINGS["resize_percentage"], help="리사이즈 비율 (100이면 원본)")
+    parser.add_argument('--resample', choices=RESAMPLE_FILTERS, default=DEFAULT_APP_SETTINGS["resample_filter"])
+    parser.add_argument('--format', choices=IMAGE_FORMATS, default=DEFAULT_APP_SETTINGS["image_format"])
+    parser.add_argument('--quality', type=int, default=DEFAULT_APP_SETTINGS["image_quality"])
+    parser.add_argument('--grayscale', action='store_true')
+    parser.add_argument('--autocontrast', action='store_true')
+    parser.add_argument('--binarize', action='store_true')
+    parser.add_argument('--auto-crop', action='store_true', help="글자 영역만 잘라서 전송")
+    parser.add_argument('--change-method', choices=CHANGE_DETECTION_METHODS, default=DEFAULT_APP_SETTINGS["change_method"])
+    parser.add_argument('--change-threshold', type=int, default=DEFAULT_APP_SETTINGS["change_threshold"])
+    parser.add_argument('--ignore-regions', default=DEFAULT_APP_SETTINGS["ignore_regions"])
+    parser.add_argument('--settle-time', type=float, default=DEFAULT_APP_SETTINGS["settle_time"], help="화면이 멈춘 뒤 요청하기까지 대기 (초, 0이면 즉시)")
+    parser.add_argument('--max-settle-time', type=float, default=DEFAULT_APP_SETTINGS["max_settle_time"])
+    parser.add_argument('--ocr-engine', choices=OCR_ENGINES, default=DEFAULT_APP_SETTINGS["ocr_engine"])
+    parser.add_argument('--ocr-language', default=DEFAULT_APP_SETTINGS["ocr_language"])
+    parser.add_argument('--ocr-text-only', action='store_true')
+
+def build_pipeline_settings(args, quota, **overrides):
+    """add_pipeline_arguments로 받은 옵션을 TranslationPipeline 설정 dict로 변환"""
+    settings = {
+        'region': None, 'prompt': DEFAULT_PROMPT, 'text_prompt': DEFAULT_TEXT_PROMPT, 'model': args.model,
+        'interval': args.interval, 'max_concurrent_requests': args.concurrency, 'use_streaming': False,
+        'use_resize': args.resize < 100, 'resize_percentage': args.resize,
+        'resample_filter': args.resample, 'image_format': args.format, 'image_quality': args.quality,
+        'grayscale': args.grayscale, 'autocontrast': args.autocontrast, 'binarize': args.binarize, 'auto_crop': args.auto_crop,
+        'change_method': args.change_method, 'change_threshold': args.change_threshold,
+        'ignore_regions': parse_ignore_regions(args.ignore_regions),
+        'settle_time': args.settle_time, 'max_settle_time': args.max_settle_time,
+        'ocr_engine': args.ocr_engine, 'ocr_language': args.ocr_language, 'ocr_text_only': args.ocr_text_only,
+        'quota': quota,
+    }
+    settings.update(overrides)
+    return settings
+
+def add_backend_arguments(parser):
+    """번역 백엔드/프롬프트 옵션. batch_translate.py와 함께 사용"""
+    parser.add_argument('--backend', choices=TRANSLATION_BACKENDS, default=DEFAULT_APP_SETTINGS["translation_backend"])
+    parser.add_argument('--api-key', help="API 키 (쉼표로 여러 개 지정하면 키 풀로 사용)")
+    parser.add_argument('--fallback-models', default="", help="할당량 초과 시 이어서 쓸 모델 (쉼표 구분)")
+    parser.add_argument('--local-url', default=DEFAULT_LOCAL_URL, help="OpenAI 호환 서버 주소 (--backend openai)")
+    parser.add_argument('--local-model', default="")
+    parser.add_argument('--prompt', help="번역 프롬프트 (기본: 일본어 → 한국어)")
+    parser.add_argument('--prompt-file', help="프롬프트를 읽을 텍스트 파일")
+    parser.add_argument('--hedge', type=int, default=0, help="응답이 최근 응답 시간의 이 백분위수를 넘기면 중복 요청 (0이면 사용 안 함)")
+    parser.add_argument('--hedge-rate', type=float, default=DEFAULT_APP_SETTINGS["hedge_max_extra_rate"], help="중복 요청 최대 비율")
+
+def load_prompt(args):
+    if args.prompt_file:
+        with open(args.prompt_file, encoding='utf-8') as f: return f.read().strip() or DEFAULT_PROMPT
+    return args.prompt or DEFAULT_PROMPT
+
+def load_config():
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE, encoding='utf-8')
+    return config
+
+def create_backend(args, config, model_quotas):
+    """(번역 백엔드, 파이프라인에 줄 요청 한도). Gemini 키/모델이 여러 개면 BackendPool로, --hedge면 HedgedBackend로 묶음"""
+    if args.backend == "openai": keys = [args.api_key] if args.api_key else []
+    else:
+        keys = parse_key_list(args.api_key or os.environ.get("GEMINI_API_KEY") or config.get('Gemini', 'api_key', fallback=""))
+        if not keys: raise SystemExit("Gemini API 키가 없습니다. --api-key 또는 환경 변수 GEMINI_API_KEY로 지정하세요.")
+    plan = translation_backend_plan(
+        args.backend, model_quotas, keys=keys, model=args.model, fallback_models=args.fallback_models,
+        local_url=args.local_url, local_model=args.local_model
+    )
+    backend = create_planned_backend(plan)
+    quota = {"rpm": 0, "tpm": 0, "rpd": 0} if args.no_quota else plan_quota(plan, model_quotas)
+    if args.hedge: backend = HedgedBackend(backend, hedge_percentile=args.hedge, max_extra_rate=args.hedge_rate)
+    return backend, quota
+
+class JsonLinesOutput:
+    """파이프라인 콜백을 JSON 줄로 변환. 워커 스레드 여러 곳에서 호출되므로 잠금을 잡고 한 줄씩 씀"""
+
+    def __init__(self, stream, region_names=None):
+        self.stream = stream
+        self.region_names = region_names or []
+        self.last_seq = -1
+        self._lock = threading.Lock()
+
+    def emit(self, record_type, **fields):
+        record = {'type': record_type, 'time': datetime.datetime.now().isoformat(timespec='milliseconds'), **fields}
+        with self._lock:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+    def output(self, text, on_overlay=False, seq=None):
+        text = text.replace("\n---\n", "").strip()
+        if seq is None: self.emit("message", text=text); return
+        with self._lock:
+            if seq <= self.last_seq: return # 동시 요청에서 늦게 도착한 이전 프레임 결과는 버림 (GUI와 같은 규칙)
+            self.last_seq = seq
+        fields = {'seq': seq, 'text': text}
+        if self.region_names: fields['regions'] = split_region_translations(text, self.region_names)
+        self.emit("translation", **fields)
+
+    def partial(self, text, seq):
+        if seq > self.last_seq: self.emit("partial", seq=seq, text=text)
+        return True
+
+def run(args):
+    json_stream = sys.stdout
+    sys.stdout = sys.stderr # 파이프라인/백엔드의 진행 메시지가 JSON 출력에 섞이지 않도록
+    config = load_config()
+    model_quotas = parse_quota_section(config, {model: dict(quota) for model, quota in GEMINI_MODEL_QUOTAS.items()})
+    backend, quota = create_backend(args, config, model_quotas)
+    if args.replay: capture_backend = ReplayCapture(args.replay, loop=args.loop)
+    elif not args.region: raise SystemExit("--region 또는 --replay 중 하나를 지정하세요.")
+    else: capture_backend = create_capture_backend(args.capture)
+    regions = [parse_region(value) for value in args.region or []]
+    regions = assign_region_names(regions, ",".join(region['name'] for region in regions)) if regions else [None]
+    settings = build_pipeline_settings(
+        args, quota, regions=regions, prompt=load_prompt(args), model=backend.model, use_streaming=args.stream,
+    )
+    ocr_engine = create_ocr_engine(args.ocr_engine, args.ocr_language)
+    cache = TranslationCache(CACHE_FILE) if args.cache else None
+    memory = TranslationMemory(MEMORY_FILE) if args.memory and ocr_engine else None
+    stats = PipelineStats()
+    writer = JsonLinesOutput(json_stream, [region['name'] for region in regions] if len(regions) > 1 else None)
+    pipeline = TranslationPipeline(
+        settings, backend, writer.output, cache=cache, capture_backend=capture_backend, ocr_engine=ocr_engine,
+        translation_memory=memory, on_partial=writer.partial if args.stream else None, on_stage_timing=stats.record
+    )
+    started = time.monotonic()
+    next_stats = started + args.stats_interval if args.stats_interval else None
+    pipeline.start()
+    try:
+        while True:
+            time.sleep(0.1)
+            now = time.monotonic()
+            if next_stats and now >= next_stats: writer.emit("stats", **stats.snapshot(pipeline.counters)); next_stats = now + args.stats_interval
+            if args.duration and now - started >= args.duration: break
+            if args.replay and not args.loop and pipeline.is_idle(): break
+    except KeyboardInterrupt: pass
+    finally:
+        pipeline.stop()
+        writer.emit("stats", final=True, elapsed=time.monotonic() - started, counters=dict(pipeline.counters), **stats.snapshot(pipeline.counters))
+        if cache: cache.close()
+        if memory: memory.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tk 창 없이 화면(또는 리플레이 폴더)을 번역해 JSON 줄로 출력")
+    parser.add_argument('--region', action='append', help="번역 영역 'left,top,width,height[,이름]' (여러 번 지정하면 한 요청으로 묶음)")
+    parser.add_argument('--replay', help="화면 대신 이 폴더의 이미지를 이름순으로 재생")
+    parser.add_argument('--loop', action='store_true', help="리플레이를 끝없이 반복")
+    parser.add_argument('--capture', choices=[name for name in CAPTURE_BACKENDS if name != "replay"], default=DEFAULT_APP_SETTINGS["capture_backend"])
+    add_backend_arguments(parser)
+    parser.add_argument('--stream', action='store_true', help="스트리밍 응답을 partial 줄로 출력")
+    parser.add_argument('--cache', action='store_true', help="번역 캐시 사용")
+    parser.add_argument('--memory', action='store_true', help="번역 메모리 사용 (OCR 엔진 필요)")
+    add_pipeline_arguments(parser)
+    parser.add_argument('--stats-interval', type=float, default=0, help="이 주기(초)마다 stats 줄 출력 (0이면 종료 시에만)")
+    parser.add_argument('--duration', type=float, default=0, help="이 시간(초)이 지나면 종료 (0이면 Ctrl+C까지)")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    run(parse_args())
@@ -1,46 +1,41 @@
 # app.py
+import sys
+import time
+from StartupProfiler import StartupProfiler, preload_modules
+startup_profiler = StartupProfiler(enabled='--profile-startup' in sys.argv) # 아래 import 시간도 측정되도록 가장 먼저 생성
+
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, colorchooser, font as tkFont
+from tkinter import ttk, messagebox, scrolledtext, colorchooser, filedialog, font as tkFont
 import configparser
-import threading
-import time
-import pyautogui
-from PIL import Image, ImageOps
-import io
-import google.generativeai as genai
-from google.api_core.exceptions import ResourceExhausted
 import webbrowser
-import re
+import threading
+import os
 
 from ScreenRegionSelector import ScreenRegionSelector
 from OverlayWindow import OverlayWindow
 from ApiKeyPopup import ApiKeyPopup
-from PromptEditPopup import PromptEditPopup, DEFAULT_PROMPT
-
-CONFIG_FILE = 'transconfig.ini'
-GEMINI_MODELS = [
-    "gemini-2.0-flash-lite",
-    "gemini-2.0-flash",
-    "gemini-1.5-flash",
-]
-
-DEFAULT_APP_SETTINGS = {
-    "api_key": "",
-    "prompt": DEFAULT_PROMPT,
-    "model": GEMINI_MODELS[0],
-    "interval": 0.5,
-    "use_resize": True,
-    "resize_percentage": 50,
-    "overlay_font_family": 'Malgun Gothic',
-    "overlay_font_size": 40,
-    "overlay_font_color": '#FFFFFF',
-    "overlay_bg_color": '#000000',
-    "overlay_alpha": 0.7,
-    "overlay_x": 100,
-    "overlay_y": 100,
-    "overlay_width": 1200,
-    "overlay_height": 250,
-}
+from CaptureBackend import CAPTURE_BACKENDS, create_capture_backend
+from OcrEngine import OCR_ENGINES, create_ocr_engine
+from TranslationCache import TranslationCache
+from TranslationMemory import TranslationMemory
+from TranslationBackend import TRANSLATION_BACKENDS, get_translation_backend
+from BackendPool import BackendPool, parse_key_list, translation_backend_plan, plan_quota, create_planned_backend
+from HedgedBackend import HedgedBackend
+from PipelineStats import PipelineStats, STATS_EXPORT_FORMATS, export_stats
+from SessionLogWriter import SessionLogWriter, SESSION_LOG_FORMATS, session_log_path
+from RegionLayout import assign_region_names, split_region_translations, format_region, parse_region
+from PromptEditPopup import PromptEditPopup
+from AppSettings import (
+    CONFIG_FILE, CACHE_FILE, MEMORY_FILE, DEFAULT_PROMPT, DEFAULT_TEXT_PROMPT, GEMINI_MODELS, GEMINI_MODEL_QUOTAS,
+    DEFAULT_APP_SETTINGS, IMAGE_FORMATS, RESAMPLE_FILTERS, CHANGE_DETECTION_METHODS, parse_quota_section, parse_ignore_regions
+)
+
+STREAM_UPDATE_INTERVAL_MS = 50 # 스트리밍 중 화면 갱신 최소 간격 (청크마다 Tk 콜백이 쌓이지 않도록)
+STATS_UPDATE_INTERVAL_MS = 1000
+PRELOAD_DELAY_MS = 500 # 창이 뜬 뒤 번역에 필요한 무거운 모듈을 미리 불러오기까지의 대기
+# 설정값(번역 백엔드/캡처 방식/OCR 엔진)별로 첫 번역 시작 때 필요한 무거운 모듈
+PRELOAD_MODULES = {"gemini": ["google.generativeai"], "pyautogui": ["pyautogui"], "mss": ["mss"], "tesseract": ["pytesseract"]}
+COMMON_FONTS = ['Arial', 'Calibri', 'Consolas', 'Courier New', 'Georgia', 'Malgun Gothic', 'NanumGothic', 'Tahoma', 'Times New Roman', 'Verdana']
 
 class App:
     def __init__(self, root):
@@ -52,8 +47,51 @@ class App:
         self.selected_model = tk.StringVar(value=DEFAULT_APP_SETTINGS["model"])
         self.custom_prompt = tk.StringVar(value=DEFAULT_APP_SETTINGS["prompt"])
         self.translation_interval = tk.DoubleVar(value=DEFAULT_APP_SETTINGS["interval"])
+        self.max_concurrent_requests = tk.IntVar(value=DEFAULT_APP_SETTINGS["max_concurrent_requests"])
+        self.use_streaming = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["use_streaming"])
+        self.hedge_requests = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["hedge_requests"])
+        self.hedge_percentile = DEFAULT_APP_SETTINGS["hedge_percentile"]
+        self.hedge_max_extra_rate = DEFAULT_APP_SETTINGS["hedge_max_extra_rate"]
+        self.hedge_alternate_model = DEFAULT_APP_SETTINGS["hedge_alternate_model"]
+        self.translation_backend_name = tk.StringVar(value=DEFAULT_APP_SETTINGS["translation_backend"])
+        self.local_url = tk.StringVar(value=DEFAULT_APP_SETTINGS["local_url"])
+        self.local_model = tk.StringVar(value=DEFAULT_APP_SETTINGS["local_model"])
+        self.warm_up_backend = DEFAULT_APP_SETTINGS["warm_up_backend"]
+        self.pool_api_keys = DEFAULT_APP_SETTINGS["pool_api_keys"]
+        self.pool_models = DEFAULT_APP_SETTINGS["pool_models"]
         self.use_resize = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["use_resize"])
         self.resize_percentage = tk.IntVar(value=DEFAULT_APP_SETTINGS["resize_percentage"])
+        self.resample_filter = tk.StringVar(value=DEFAULT_APP_SETTINGS["resample_filter"])
+        self.image_format = tk.StringVar(value=DEFAULT_APP_SETTINGS["image_format"])
+        self.image_quality = tk.IntVar(value=DEFAULT_APP_SETTINGS["image_quality"])
+        self.grayscale = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["grayscale"])
+        self.autocontrast = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["autocontrast"])
+        self.binarize = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["binarize"])
+        self.auto_crop = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["auto_crop"])
+        self.change_method = tk.StringVar(value=DEFAULT_APP_SETTINGS["change_method"])
+        self.change_threshold = tk.IntVar(value=DEFAULT_APP_SETTINGS["change_threshold"])
+        self.ignore_regions = tk.StringVar(value=DEFAULT_APP_SETTINGS["ignore_regions"])
+        self.settle_time = tk.DoubleVar(value=DEFAULT_APP_SETTINGS["settle_time"])
+        self.max_settle_time = DEFAULT_APP_SETTINGS["max_settle_time"]
+        self.use_cache = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["use_cache"])
+        self.ocr_engine = tk.StringVar(value=DEFAULT_APP_SETTINGS["ocr_engine"])
+        self.ocr_language = tk.StringVar(value=DEFAULT_APP_SETTINGS["ocr_language"])
+        self.ocr_text_only = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["ocr_text_only"])
+        self.capture_backend_name = tk.StringVar(value=DEFAULT_APP_SETTINGS["capture_backend"])
+        self.replay_dir = tk.StringVar(value=DEFAULT_APP_SETTINGS["replay_dir"])
+        self.cache_max_entries = DEFAULT_APP_SETTINGS["cache_max_entries"]
+        self.cache_max_age_days = DEFAULT_APP_SETTINGS["cache_max_age_days"]
+        self.model_quotas = {model: dict(quota) for model, quota in GEMINI_MODEL_QUOTAS.items()}
+        self.use_translation_memory = tk.BooleanVar(value=DEFAULT_APP_SETTINGS["use_translation_memory"])
+        self.memory_fuzzy_threshold = DEFAULT_APP_SETTINGS["memory_fuzzy_threshold"]
+        # 통계 내보내기는 설정 파일 [Stats] 섹션에서만 지정 (format: none/csv/jsonl/prometheus)
+        self.stats_export_format = DEFAULT_APP_SETTINGS["stats_export_format"]
+        self.stats_export_path = DEFAULT_APP_SETTINGS["stats_export_path"]
+        self.stats_export_interval = DEFAULT_APP_SETTINGS["stats_export_interval"]
+        # 메인 창에는 최근 history_max_lines줄만 남기고, 전체 기록은 [History] 섹션 설정에 따라 세션 파일(jsonl/srt)로 저장
+        self.history_max_lines = DEFAULT_APP_SETTINGS["history_max_lines"]
+        self.session_log_format = DEFAULT_APP_SETTINGS["session_log_format"]
+        self.session_log_dir = DEFAULT_APP_SETTINGS["session_log_dir"]
         self.overlay_font_family = tk.StringVar(value=DEFAULT_APP_SETTINGS["overlay_font_family"])
         self.overlay_font_size = tk.IntVar(value=DEFAULT_APP_SETTINGS["overlay_font_size"])
         self.overlay_font_color = tk.StringVar(value=DEFAULT_APP_SETTINGS["overlay_font_color"])
@@ -65,12 +103,28 @@ class App:
         self.overlay_width = DEFAULT_APP_SETTINGS["overlay_width"]
         self.overlay_height = DEFAULT_APP_SETTINGS["overlay_height"]
 
-        self.selected_region = None
+        self.selected_regions = [] # 이름이 붙은 번역 영역 목록 (여러 개면 한 요청으로 묶어 보냄)
+        self.region_names = tk.StringVar(value="")
+        self.region_overlays = [] # 두 번째 영역부터 사용하는 오버레이 창 (첫 영역은 overlay_window)
+        self.region_overlay_geometry = {} # 영역 번호 -> 저장된 오버레이 위치/크기
+        self.active_region_names = []
         self.is_translating = False
-        self.translation_thread = None
-        self.gemini_client = None
+        self.pipeline = None
+        self.last_displayed_seq = -1
+        self.streaming_seq = -1 # 메인 창에 부분 번역문을 표시 중인 프레임 순번
+        self.stream_active = False
+        self._pending_partial = None
+        self._partial_flush_scheduled = False
+        self.translation_backend = None
+        self.translation_cache = None
+        self.translation_memory = None
+        self.pipeline_stats = PipelineStats()
+        self.session_log = None
+        self._stats_after_id = None
+        self._last_stats_export = 0.0
 
         self.load_config()
+        startup_profiler.mark("설정 불러오기")
 
         overlay_initial_cfg = {
             'x': self.overlay_x, 'y': self.overlay_y,
@@ -82,6 +136,7 @@ class App:
             'alpha': self.overlay_alpha.get()
         }
         self.overlay_window = OverlayWindow(self.root, initial_config=overlay_initial_cfg)
+        startup_profiler.mark("오버레이 창")
 
         # --- GUI 구성 ---
         main_controls_frame = ttk.Frame(root, padding=5)
@@ -102,8 +157,13 @@ class App:
         # *** 오류 수정: _weight 옵션 제거 ***
         overlay_settings_frame.grid(row=2, column=0, padx=5, pady=5, sticky="ew")
 
+        stats_frame = ttk.LabelFrame(main_controls_frame, text="성능 통계", padding=10)
+        stats_frame.grid(row=3, column=0, padx=5, pady=5, sticky="ew")
+        self.stats_label = ttk.Label(stats_frame, text="번역을 시작하면 단계별 소요 시간이 표시됩니다.", font="TkFixedFont", justify=tk.LEFT)
+        self.stats_label.pack(fill=tk.X)
+
         reset_frame = ttk.Frame(main_controls_frame, padding=10)
-        reset_frame.grid(row=3, column=0, padx=5, pady=10, sticky="ew")
+        reset_frame.grid(row=4, column=0, padx=5, pady=10, sticky="ew")
         self.reset_settings_button = ttk.Button(reset_frame, text="모든 설정 초기화", command=self.reset_all_settings)
         self.reset_settings_button.pack(fill=tk.X)
 
@@ -124,7 +184,10 @@ class App:
         self.prompt_edit_button.grid(row=1, column=0, columnspan=4, padx=5, pady=5, sticky="ew")
 
         ttk.Label(settings_frame, text="Gemini 모델:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
-        self.model_menu = ttk.OptionMenu(settings_frame, self.selected_model, self.selected_model.get(), *GEMINI_MODELS)
+        self.model_menu = ttk.OptionMenu(
+            settings_frame, self.selected_model, self.selected_model.get(), *GEMINI_MODELS,
+            command=lambda x: self.warm_up_translation_backend()
+        )
         self.model_menu.grid(row=2, column=1, columnspan=3, padx=5, pady=5, sticky="ew")
 
         ttk.Label(settings_frame, text="번역 주기 (초):").grid(row=3, column=0, padx=5, pady=5, sticky="w")
@@ -132,12 +195,21 @@ class App:
             settings_frame, from_=0.2, to=10.0, increment=0.1, textvariable=self.translation_interval, width=8
         )
         self.interval_spinbox.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        ttk.Label(settings_frame, text="동시 요청 수:").grid(row=3, column=2, padx=5, pady=5, sticky="w")
+        self.concurrency_spinbox = ttk.Spinbox(
+            settings_frame, from_=1, to=8, increment=1, textvariable=self.max_concurrent_requests, width=5
+        )
+        self.concurrency_spinbox.grid(row=3, column=3, padx=5, pady=5, sticky="w")
 
         self.select_region_button = ttk.Button(settings_frame, text="번역 영역 지정", command=self.open_region_selector)
-        self.select_region_button.grid(row=4, column=0, columnspan=4, padx=5, pady=10, sticky="ew")
+        self.select_region_button.grid(row=4, column=0, columnspan=2, padx=5, pady=10, sticky="ew")
+        self.add_region_button = ttk.Button(settings_frame, text="영역 추가", command=lambda: self.open_region_selector(append=True))
+        self.add_region_button.grid(row=4, column=2, columnspan=2, padx=5, pady=10, sticky="ew")
 
         self.region_label = ttk.Label(settings_frame, text="선택된 영역: 없음")
-        self.region_label.grid(row=5, column=0, columnspan=4, padx=5, pady=2, sticky="w")
+        self.region_label.grid(row=5, column=0, columnspan=2, padx=5, pady=2, sticky="w")
+        self.region_names_entry = ttk.Entry(settings_frame, textvariable=self.region_names, width=20)
+        self.region_names_entry.grid(row=5, column=2, columnspan=2, padx=5, pady=2, sticky="ew")
 
         self.start_button = ttk.Button(settings_frame, text="번역 시작", command=self.start_translation, state=tk.DISABLED)
         self.start_button.grid(row=6, column=0, padx=5, pady=10, sticky="ew")
@@ -146,6 +218,34 @@ class App:
         self.show_overlay_button = ttk.Button(settings_frame, text="오버레이 표시/숨김", command=self.toggle_overlay_visibility)
         self.show_overlay_button.grid(row=6, column=2, padx=5, pady=10, sticky="ew")
 
+        self.cache_checkbutton = ttk.Checkbutton(settings_frame, text="번역 캐시 사용", variable=self.use_cache)
+        self.cache_checkbutton.grid(row=7, column=0, padx=5, pady=5, sticky="w")
+        self.clear_cache_button = ttk.Button(settings_frame, text="캐시 비우기", command=self.clear_translation_cache)
+        self.clear_cache_button.grid(row=7, column=1, padx=5, pady=5, sticky="w")
+        self.cache_stats_label = ttk.Label(settings_frame, text="캐시 적중: 0 / 요청: 0 (0%)")
+        self.cache_stats_label.grid(row=7, column=2, columnspan=2, padx=5, pady=5, sticky="w")
+        self.memory_checkbutton = ttk.Checkbutton(settings_frame, text="번역 메모리 사용 (OCR 필요)", variable=self.use_translation_memory)
+        self.memory_checkbutton.grid(row=9, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        self.memory_stats_label = ttk.Label(settings_frame, text="저장 문장: - / 메모리 적중: 0")
+        self.memory_stats_label.grid(row=9, column=2, columnspan=2, padx=5, pady=5, sticky="w")
+        self.schedule_status_label = ttk.Label(settings_frame, text="요청 간격: - / 오늘 요청: -")
+        self.schedule_status_label.grid(row=8, column=0, columnspan=4, padx=5, pady=2, sticky="w")
+        self.streaming_checkbutton = ttk.Checkbutton(settings_frame, text="스트리밍 응답 (받는 대로 표시)", variable=self.use_streaming)
+        self.streaming_checkbutton.grid(row=10, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        self.hedge_checkbutton = ttk.Checkbutton(settings_frame, text="늦은 응답 중복 요청", variable=self.hedge_requests)
+        self.hedge_checkbutton.grid(row=10, column=2, columnspan=2, padx=5, pady=5, sticky="w")
+        ttk.Label(settings_frame, text="번역 백엔드:").grid(row=11, column=0, padx=5, pady=5, sticky="w")
+        self.backend_menu = ttk.OptionMenu(
+            settings_frame, self.translation_backend_name, self.translation_backend_name.get(), *TRANSLATION_BACKENDS,
+            command=lambda x: (self.toggle_backend_options_state(), self.update_start_button_state())
+        )
+        self.backend_menu.grid(row=11, column=1, padx=5, pady=5, sticky="w")
+        ttk.Label(settings_frame, text="로컬 서버 URL / 모델:").grid(row=12, column=0, padx=5, pady=5, sticky="w")
+        self.local_url_entry = ttk.Entry(settings_frame, textvariable=self.local_url, width=28)
+        self.local_url_entry.grid(row=12, column=1, padx=5, pady=5, sticky="ew")
+        self.local_model_entry = ttk.Entry(settings_frame, textvariable=self.local_model, width=14)
+        self.local_model_entry.grid(row=12, column=2, columnspan=2, padx=5, pady=5, sticky="w")
+
         # settings_frame 내부 열 확장 설정
         settings_frame.grid_columnconfigure(1, weight=1) # 모델, 주기 스핀박스 등이 있는 열
         settings_frame.grid_columnconfigure(2, weight=0) # API 키 상태 레이블, 오버레이 버튼 (확장 필요 없을 수 있음)
@@ -165,6 +265,65 @@ class App:
             state=(tk.NORMAL if self.use_resize.get() else tk.DISABLED)
         )
         self.resize_spinbox.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+        ttk.Label(image_process_frame, text="변화 감지 방식:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.change_method_menu = ttk.OptionMenu(image_process_frame, self.change_method, self.change_method.get(), *CHANGE_DETECTION_METHODS)
+        self.change_method_menu.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+        ttk.Label(image_process_frame, text="변화 임계값:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        self.change_threshold_spinbox = ttk.Spinbox(
+            image_process_frame, from_=0, to=512, increment=1, textvariable=self.change_threshold, width=8
+        )
+        self.change_threshold_spinbox.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        settle_frame = ttk.Frame(image_process_frame)
+        settle_frame.grid(row=3, column=2, padx=5, pady=5, sticky="w")
+        ttk.Label(settle_frame, text="출력 대기 (초):").pack(side=tk.LEFT)
+        self.settle_time_spinbox = ttk.Spinbox(settle_frame, from_=0.0, to=3.0, increment=0.1, textvariable=self.settle_time, width=5)
+        self.settle_time_spinbox.pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(image_process_frame, text="무시 영역 (x,y,w,h; ...):").grid(row=4, column=0, padx=5, pady=5, sticky="w")
+        self.ignore_regions_entry = ttk.Entry(image_process_frame, textvariable=self.ignore_regions, width=24)
+        self.ignore_regions_entry.grid(row=4, column=1, padx=5, pady=5, sticky="ew")
+        ttk.Label(image_process_frame, text="캡처 방식:").grid(row=5, column=0, padx=5, pady=5, sticky="w")
+        self.capture_backend_menu = ttk.OptionMenu(
+            image_process_frame, self.capture_backend_name, self.capture_backend_name.get(), *CAPTURE_BACKENDS,
+            command=lambda x: self.toggle_replay_options_state()
+        )
+        self.capture_backend_menu.grid(row=5, column=1, padx=5, pady=5, sticky="w")
+        ttk.Label(image_process_frame, text="리플레이 폴더:").grid(row=6, column=0, padx=5, pady=5, sticky="w")
+        self.replay_dir_entry = ttk.Entry(image_process_frame, textvariable=self.replay_dir, width=24)
+        self.replay_dir_entry.grid(row=6, column=1, padx=5, pady=5, sticky="ew")
+        self.replay_dir_button = ttk.Button(image_process_frame, text="찾아보기", command=self.choose_replay_dir)
+        self.replay_dir_button.grid(row=6, column=2, padx=5, pady=5, sticky="w")
+        ttk.Label(image_process_frame, text="리샘플링 필터:").grid(row=7, column=0, padx=5, pady=5, sticky="w")
+        self.resample_menu = ttk.OptionMenu(image_process_frame, self.resample_filter, self.resample_filter.get(), *RESAMPLE_FILTERS)
+        self.resample_menu.grid(row=7, column=1, padx=5, pady=5, sticky="w")
+        ttk.Label(image_process_frame, text="이미지 형식 / 품질:").grid(row=8, column=0, padx=5, pady=5, sticky="w")
+        self.image_format_menu = ttk.OptionMenu(image_process_frame, self.image_format, self.image_format.get(), *IMAGE_FORMATS)
+        self.image_format_menu.grid(row=8, column=1, padx=5, pady=5, sticky="w")
+        self.image_quality_spinbox = ttk.Spinbox(
+            image_process_frame, from_=10, to=100, increment=5, textvariable=self.image_quality, width=5
+        )
+        self.image_quality_spinbox.grid(row=8, column=2, padx=5, pady=5, sticky="w")
+        color_options_frame = ttk.Frame(image_process_frame)
+        color_options_frame.grid(row=9, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        self.grayscale_checkbutton = ttk.Checkbutton(color_options_frame, text="흑백", variable=self.grayscale)
+        self.grayscale_checkbutton.pack(side=tk.LEFT, padx=(0, 10))
+        self.autocontrast_checkbutton = ttk.Checkbutton(color_options_frame, text="대비 보정", variable=self.autocontrast)
+        self.autocontrast_checkbutton.pack(side=tk.LEFT, padx=(0, 10))
+        self.binarize_checkbutton = ttk.Checkbutton(color_options_frame, text="이진화", variable=self.binarize)
+        self.binarize_checkbutton.pack(side=tk.LEFT, padx=(0, 10))
+        self.auto_crop_checkbutton = ttk.Checkbutton(color_options_frame, text="글자 영역만 자르기", variable=self.auto_crop)
+        self.auto_crop_checkbutton.pack(side=tk.LEFT)
+        self.encode_stats_label = ttk.Label(image_process_frame, text="전송 크기: - / 인코딩: -")
+        self.encode_stats_label.grid(row=10, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        ttk.Label(image_process_frame, text="OCR 엔진 / 언어:").grid(row=11, column=0, padx=5, pady=5, sticky="w")
+        self.ocr_engine_menu = ttk.OptionMenu(
+            image_process_frame, self.ocr_engine, self.ocr_engine.get(), *OCR_ENGINES,
+            command=lambda x: self.toggle_ocr_options_state()
+        )
+        self.ocr_engine_menu.grid(row=11, column=1, padx=5, pady=5, sticky="w")
+        self.ocr_language_entry = ttk.Entry(image_process_frame, textvariable=self.ocr_language, width=8)
+        self.ocr_language_entry.grid(row=11, column=2, padx=5, pady=5, sticky="w")
+        self.ocr_text_only_checkbutton = ttk.Checkbutton(image_process_frame, text="인식한 텍스트만 전송 (이미지 미전송)", variable=self.ocr_text_only)
+        self.ocr_text_only_checkbutton.grid(row=12, column=0, columnspan=3, padx=5, pady=5, sticky="w")
         image_process_frame.grid_columnconfigure(1, weight=0) # 리사이즈 스핀박스 열 (확장 필요 없을 수 있음)
 
         # --- 오버레이 창 설정 GUI 요소 ---
@@ -185,12 +344,11 @@ class App:
         self.alpha_scale = ttk.Scale(overlay_settings_frame, from_=0.1, to=1.0, variable=self.overlay_alpha, orient=tk.HORIZONTAL, command=lambda x: self.apply_overlay_settings())
         self.alpha_scale.grid(row=2, column=1, columnspan=3, padx=5, pady=5, sticky="ew")
         ttk.Label(overlay_settings_frame, text="글꼴:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
-        available_fonts = sorted(list(tkFont.families())); common_fonts = ['Arial', 'Calibri', 'Consolas', 'Courier New', 'Georgia', 'Malgun Gothic', 'NanumGothic', 'Tahoma', 'Times New Roman', 'Verdana']
-        display_fonts = [f for f in common_fonts if f in available_fonts]
-        if not self.overlay_font_family.get() in display_fonts and self.overlay_font_family.get() in available_fonts: display_fonts.append(self.overlay_font_family.get())
-        if not display_fonts : display_fonts = [self.overlay_font_family.get()]
-        self.font_family_menu = ttk.OptionMenu(overlay_settings_frame, self.overlay_font_family, self.overlay_font_family.get() , *display_fonts, command=lambda x: self.apply_overlay_settings())
+        # 시스템 글꼴 목록 조회는 느릴 수 있으므로 메뉴를 처음 열 때 채움
+        self.font_family_menu = ttk.OptionMenu(overlay_settings_frame, self.overlay_font_family, self.overlay_font_family.get(), self.overlay_font_family.get(), command=lambda x: self.apply_overlay_settings())
         self.font_family_menu.grid(row=3, column=1, columnspan=3, padx=5, pady=5, sticky="ew")
+        self.font_family_menu['menu'].configure(postcommand=self.populate_font_menu)
+        self._font_menu_populated = False
         # overlay_settings_frame 내부 열 확장 설정
         overlay_settings_frame.grid_columnconfigure(1, weight=0) # 글꼴 크기, 배경색 선택 등
         overlay_settings_frame.grid_columnconfigure(3, weight=1) # 글꼴색 선택, 투명도, 글꼴 메뉴
@@ -201,9 +359,61 @@ class App:
         self.translated_text_area.config(state=tk.DISABLED)
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.update_region_label()
         self.update_start_button_state()
         self.apply_overlay_settings()
         self.toggle_resize_options_state()
+        self.toggle_replay_options_state()
+        self.toggle_ocr_options_state()
+        self.toggle_backend_options_state()
+        startup_profiler.mark("설정 화면 구성")
+        self.root.after(PRELOAD_DELAY_MS, self.preload_translation_modules)
+
+    def populate_font_menu(self):
+        if self._font_menu_populated: return
+        self._font_menu_populated = True
+        available_fonts = set(tkFont.families())
+        display_fonts = [f for f in COMMON_FONTS if f in available_fonts]
+        if not self.overlay_font_family.get() in display_fonts and self.overlay_font_family.get() in available_fonts: display_fonts.append(self.overlay_font_family.get())
+        if not display_fonts : display_fonts = [self.overlay_font_family.get()]
+        self.font_family_menu.set_menu(self.overlay_font_family.get(), *display_fonts)
+
+    def preload_translation_modules(self):
+        # 첫 번역 시작이 늦어지지 않도록 현재 설정에 필요한 SDK/캡처 모듈을 백그라운드에서 미리 불러옴
+        module_names = ["TranslationPipeline"]
+        for option in (self.translation_backend_name.get(), self.capture_backend_name.get(), self.ocr_engine.get()):
+            module_names += PRELOAD_MODULES.get(option, [])
+        preload_modules(module_names, startup_profiler)
+        self.warm_up_translation_backend()
+
+    def translation_backend_plan(self):
+        use_gemini = self.translation_backend_name.get() == "gemini"
+        return translation_backend_plan(
+            self.translation_backend_name.get(), self.model_quotas,
+            keys=parse_key_list(self.api_key.get() + "," + self.pool_api_keys) if use_gemini else (),
+            model=self.selected_model.get(), fallback_models=self.pool_models, local_url=self.local_url.get(), local_model=self.local_model.get()
+        )
+
+    def create_hedged_backend(self, backend):
+        # 대체 모델이 지정되어 있으면 중복 요청은 그 모델로 (풀을 쓰면 같은 풀의 다른 키로 나가도록 풀 그대로 사용)
+        alternate = None
+        use_alternate = (self.translation_backend_name.get() == "gemini" and self.hedge_alternate_model in GEMINI_MODELS
+                         and self.hedge_alternate_model != self.selected_model.get())
+        if use_alternate: alternate = get_translation_backend("gemini", api_key=self.api_key.get(), model=self.hedge_alternate_model)
+        elif self.hedge_alternate_model: print(f"[Hedging] 대체 모델을 사용할 수 없어 같은 모델로 중복 요청: {self.hedge_alternate_model}")
+        return HedgedBackend(
+            backend, alternate=alternate, hedge_percentile=self.hedge_percentile, max_extra_rate=max(0.0, self.hedge_max_extra_rate)
+        )
+
+    def warm_up_translation_backend(self):
+        # 첫 번역 요청이 연결 설정 시간까지 떠안지 않도록 백그라운드에서 클라이언트를 만들고 가벼운 요청을 보냄
+        if not self.warm_up_backend or self.is_translating: return
+        if self.translation_backend_name.get() == "gemini" and not self.api_key.get(): return
+        plan = self.translation_backend_plan()
+        def _run():
+            try: create_planned_backend(plan).warm_up()
+            except Exception as e: print(f"번역 백엔드 미리 연결 실패 (번역 시작 시 다시 시도): {type(e).__name__} - {e}")
+        threading.Thread(target=_run, name="backend-warm-up", daemon=True).start()
 
     def reset_all_settings(self):
         if messagebox.askyesno("설정 초기화 확인", "모든 설정을 기본값으로 초기화하시겠습니까?\nAPI 키 정보도 삭제됩니다."):
@@ -211,8 +421,49 @@ class App:
             self.custom_prompt.set(DEFAULT_APP_SETTINGS["prompt"])
             self.selected_model.set(DEFAULT_APP_SETTINGS["model"])
             self.translation_interval.set(DEFAULT_APP_SETTINGS["interval"])
+            self.max_concurrent_requests.set(DEFAULT_APP_SETTINGS["max_concurrent_requests"])
+            self.use_streaming.set(DEFAULT_APP_SETTINGS["use_streaming"])
+            self.hedge_requests.set(DEFAULT_APP_SETTINGS["hedge_requests"])
+            self.hedge_percentile = DEFAULT_APP_SETTINGS["hedge_percentile"]
+            self.hedge_max_extra_rate = DEFAULT_APP_SETTINGS["hedge_max_extra_rate"]
+            self.hedge_alternate_model = DEFAULT_APP_SETTINGS["hedge_alternate_model"]
+            self.translation_backend_name.set(DEFAULT_APP_SETTINGS["translation_backend"])
+            self.local_url.set(DEFAULT_APP_SETTINGS["local_url"])
+            self.local_model.set(DEFAULT_APP_SETTINGS["local_model"])
+            self.warm_up_backend = DEFAULT_APP_SETTINGS["warm_up_backend"]
+            self.pool_api_keys = DEFAULT_APP_SETTINGS["pool_api_keys"]
+            self.pool_models = DEFAULT_APP_SETTINGS["pool_models"]
             self.use_resize.set(DEFAULT_APP_SETTINGS["use_resize"])
             self.resize_percentage.set(DEFAULT_APP_SETTINGS["resize_percentage"])
+            self.resample_filter.set(DEFAULT_APP_SETTINGS["resample_filter"])
+            self.image_format.set(DEFAULT_APP_SETTINGS["image_format"])
+            self.image_quality.set(DEFAULT_APP_SETTINGS["image_quality"])
+            self.grayscale.set(DEFAULT_APP_SETTINGS["grayscale"])
+            self.autocontrast.set(DEFAULT_APP_SETTINGS["autocontrast"])
+            self.binarize.set(DEFAULT_APP_SETTINGS["binarize"])
+            self.auto_crop.set(DEFAULT_APP_SETTINGS["auto_crop"])
+            self.change_method.set(DEFAULT_APP_SETTINGS["change_method"])
+            self.change_threshold.set(DEFAULT_APP_SETTINGS["change_threshold"])
+            self.ignore_regions.set(DEFAULT_APP_SETTINGS["ignore_regions"])
+            self.settle_time.set(DEFAULT_APP_SETTINGS["settle_time"])
+            self.max_settle_time = DEFAULT_APP_SETTINGS["max_settle_time"]
+            self.use_cache.set(DEFAULT_APP_SETTINGS["use_cache"])
+            self.ocr_engine.set(DEFAULT_APP_SETTINGS["ocr_engine"])
+            self.ocr_language.set(DEFAULT_APP_SETTINGS["ocr_language"])
+            self.ocr_text_only.set(DEFAULT_APP_SETTINGS["ocr_text_only"])
+            self.capture_backend_name.set(DEFAULT_APP_SETTINGS["capture_backend"])
+            self.replay_dir.set(DEFAULT_APP_SETTINGS["replay_dir"])
+            self.cache_max_entries = DEFAULT_APP_SETTINGS["cache_max_entries"]
+            self.cache_max_age_days = DEFAULT_APP_SETTINGS["cache_max_age_days"]
+            self.model_quotas = {model: dict(quota) for model, quota in GEMINI_MODEL_QUOTAS.items()}
+            self.use_translation_memory.set(DEFAULT_APP_SETTINGS["use_translation_memory"])
+            self.memory_fuzzy_threshold = DEFAULT_APP_SETTINGS["memory_fuzzy_threshold"]
+            self.stats_export_format = DEFAULT_APP_SETTINGS["stats_export_format"]
+            self.stats_export_path = DEFAULT_APP_SETTINGS["stats_export_path"]
+            self.stats_export_interval = DEFAULT_APP_SETTINGS["stats_export_interval"]
+            self.history_max_lines = DEFAULT_APP_SETTINGS["history_max_lines"]
+            self.session_log_format = DEFAULT_APP_SETTINGS["session_log_format"]
+            self.session_log_dir = DEFAULT_APP_SETTINGS["session_log_dir"]
             self.overlay_font_family.set(DEFAULT_APP_SETTINGS["overlay_font_family"])
             self.overlay_font_size.set(DEFAULT_APP_SETTINGS["overlay_font_size"])
             self.overlay_font_color.set(DEFAULT_APP_SETTINGS["overlay_font_color"])
@@ -235,6 +486,9 @@ class App:
                 self.overlay_window.apply_config(self.overlay_window.current_config)
             self.save_config()
             self.toggle_resize_options_state()
+            self.toggle_replay_options_state()
+            self.toggle_ocr_options_state()
+            self.toggle_backend_options_state()
             self.apply_overlay_settings()
             self.update_start_button_state()
             messagebox.showinfo("초기화 완료", "모든 설정이 기본값으로 초기화되었습니다.")
@@ -247,6 +501,7 @@ class App:
         self.update_start_button_state()
         self.save_config()
         print("API 키가 업데이트되었습니다.")
+        self.warm_up_translation_backend()
 
     def open_prompt_edit_popup(self):
         PromptEditPopup(self.root, self.custom_prompt.get(), self.save_prompt_from_popup)
@@ -260,6 +515,26 @@ class App:
         if self.use_resize.get(): self.resize_spinbox.config(state=tk.NORMAL)
         else: self.resize_spinbox.config(state=tk.DISABLED)
 
+    def toggle_replay_options_state(self):
+        state = tk.NORMAL if self.capture_backend_name.get() == "replay" and not self.is_translating else tk.DISABLED
+        self.replay_dir_entry.config(state=state); self.replay_dir_button.config(state=state)
+
+    def toggle_ocr_options_state(self):
+        state = tk.NORMAL if self.ocr_engine.get() != "none" and not self.is_translating else tk.DISABLED
+        self.ocr_language_entry.config(state=state); self.ocr_text_only_checkbutton.config(state=state)
+
+    def toggle_backend_options_state(self):
+        state = tk.NORMAL if self.translation_backend_name.get() == "openai" and not self.is_translating else tk.DISABLED
+        self.local_url_entry.config(state=state); self.local_model_entry.config(state=state)
+
+    def choose_replay_dir(self):
+        selected_dir = filedialog.askdirectory(title="리플레이 이미지 폴더 선택", initialdir=self.replay_dir.get() or None)
+        if selected_dir: self.replay_dir.set(selected_dir)
+
+    def create_capture_backend(self):
+        try: return create_capture_backend(self.capture_backend_name.get(), self.replay_dir.get())
+        except Exception as e: messagebox.showerror("캡처 오류", f"캡처 방식 초기화 실패: {e}"); return None
+
     def choose_color(self, target):
         color_code = colorchooser.askcolor(title=f"{target} 색상 선택")
         if color_code and color_code[1]:
@@ -271,10 +546,11 @@ class App:
         if hasattr(self, 'overlay_window') and self.overlay_window:
             try:
                 font_size = self.overlay_font_size.get(); alpha = self.overlay_alpha.get()
-                self.overlay_window.update_appearance(
-                    self.overlay_font_family.get(), font_size,
-                    self.overlay_font_color.get(), self.overlay_bg_color.get(), alpha
-                )
+                for overlay in [self.overlay_window] + self.region_overlays:
+                    overlay.update_appearance(
+                        self.overlay_font_family.get(), font_size,
+                        self.overlay_font_color.get(), self.overlay_bg_color.get(), alpha
+                    )
                 self.font_color_preview.config(bg=self.overlay_font_color.get())
                 self.bg_color_preview.config(bg=self.overlay_bg_color.get())
             except tk.TclError as e: print(f"오버레이 설정 적용 중 오류: {e}")
@@ -287,8 +563,70 @@ class App:
             saved_model = config.get('Gemini', 'model', fallback=DEFAULT_APP_SETTINGS["model"])
             self.selected_model.set(saved_model if saved_model in GEMINI_MODELS else DEFAULT_APP_SETTINGS["model"])
             self.translation_interval.set(config.getfloat('Gemini', 'interval', fallback=DEFAULT_APP_SETTINGS["interval"]))
+            self.max_concurrent_requests.set(config.getint('Gemini', 'max_concurrent_requests', fallback=DEFAULT_APP_SETTINGS["max_concurrent_requests"]))
+            self.use_streaming.set(config.getboolean('Gemini', 'use_streaming', fallback=DEFAULT_APP_SETTINGS["use_streaming"]))
+            self.hedge_requests.set(config.getboolean('Hedging', 'enabled', fallback=DEFAULT_APP_SETTINGS["hedge_requests"]))
+            self.hedge_percentile = config.getint('Hedging', 'percentile', fallback=DEFAULT_APP_SETTINGS["hedge_percentile"])
+            self.hedge_max_extra_rate = config.getfloat('Hedging', 'max_extra_rate', fallback=DEFAULT_APP_SETTINGS["hedge_max_extra_rate"])
+            self.hedge_alternate_model = config.get('Hedging', 'alternate_model', fallback=DEFAULT_APP_SETTINGS["hedge_alternate_model"])
+            saved_backend = config.get('Backend', 'name', fallback=DEFAULT_APP_SETTINGS["translation_backend"])
+            self.translation_backend_name.set(saved_backend if saved_backend in TRANSLATION_BACKENDS else DEFAULT_APP_SETTINGS["translation_backend"])
+            self.local_url.set(config.get('Backend', 'local_url', fallback=DEFAULT_APP_SETTINGS["local_url"]))
+            self.local_model.set(config.get('Backend', 'local_model', fallback=DEFAULT_APP_SETTINGS["local_model"]))
+            self.warm_up_backend = config.getboolean('Backend', 'warm_up', fallback=DEFAULT_APP_SETTINGS["warm_up_backend"])
+            self.pool_api_keys = config.get('Pool', 'api_keys', fallback=DEFAULT_APP_SETTINGS["pool_api_keys"])
+            self.pool_models = config.get('Pool', 'models', fallback=DEFAULT_APP_SETTINGS["pool_models"])
             self.use_resize.set(config.getboolean('ImageProcessing', 'use_resize', fallback=DEFAULT_APP_SETTINGS["use_resize"]))
             self.resize_percentage.set(config.getint('ImageProcessing', 'resize_percentage', fallback=DEFAULT_APP_SETTINGS["resize_percentage"]))
+            saved_filter = config.get('ImageProcessing', 'resample_filter', fallback=DEFAULT_APP_SETTINGS["resample_filter"])
+            self.resample_filter.set(saved_filter if saved_filter in RESAMPLE_FILTERS else DEFAULT_APP_SETTINGS["resample_filter"])
+            saved_format = config.get('ImageProcessing', 'image_format', fallback=DEFAULT_APP_SETTINGS["image_format"])
+            self.image_format.set(saved_format if saved_format in IMAGE_FORMATS else DEFAULT_APP_SETTINGS["image_format"])
+            self.image_quality.set(config.getint('ImageProcessing', 'image_quality', fallback=DEFAULT_APP_SETTINGS["image_quality"]))
+            self.grayscale.set(config.getboolean('ImageProcessing', 'grayscale', fallback=DEFAULT_APP_SETTINGS["grayscale"]))
+            self.autocontrast.set(config.getboolean('ImageProcessing', 'autocontrast', fallback=DEFAULT_APP_SETTINGS["autocontrast"]))
+            self.binarize.set(config.getboolean('ImageProcessing', 'binarize', fallback=DEFAULT_APP_SETTINGS["binarize"]))
+            self.auto_crop.set(config.getboolean('ImageProcessing', 'auto_crop', fallback=DEFAULT_APP_SETTINGS["auto_crop"]))
+            saved_method = config.get('ChangeDetection', 'method', fallback=DEFAULT_APP_SETTINGS["change_method"])
+            self.change_method.set(saved_method if saved_method in CHANGE_DETECTION_METHODS else DEFAULT_APP_SETTINGS["change_method"])
+            self.change_threshold.set(config.getint('ChangeDetection', 'threshold', fallback=DEFAULT_APP_SETTINGS["change_threshold"]))
+            self.ignore_regions.set(config.get('ChangeDetection', 'ignore_regions', fallback=DEFAULT_APP_SETTINGS["ignore_regions"]))
+            self.settle_time.set(config.getfloat('ChangeDetection', 'settle_time', fallback=DEFAULT_APP_SETTINGS["settle_time"]))
+            self.max_settle_time = config.getfloat('ChangeDetection', 'max_settle_time', fallback=DEFAULT_APP_SETTINGS["max_settle_time"])
+            saved_ocr_engine = config.get('OCR', 'engine', fallback=DEFAULT_APP_SETTINGS["ocr_engine"])
+            self.ocr_engine.set(saved_ocr_engine if saved_ocr_engine in OCR_ENGINES else DEFAULT_APP_SETTINGS["ocr_engine"])
+            self.ocr_language.set(config.get('OCR', 'language', fallback=DEFAULT_APP_SETTINGS["ocr_language"]))
+            self.ocr_text_only.set(config.getboolean('OCR', 'text_only', fallback=DEFAULT_APP_SETTINGS["ocr_text_only"]))
+            saved_backend = config.get('Capture', 'backend', fallback=DEFAULT_APP_SETTINGS["capture_backend"])
+            self.capture_backend_name.set(saved_backend if saved_backend in CAPTURE_BACKENDS else DEFAULT_APP_SETTINGS["capture_backend"])
+            self.replay_dir.set(config.get('Capture', 'replay_dir', fallback=DEFAULT_APP_SETTINGS["replay_dir"]))
+            self.use_cache.set(config.getboolean('Cache', 'use_cache', fallback=DEFAULT_APP_SETTINGS["use_cache"]))
+            self.cache_max_entries = config.getint('Cache', 'max_entries', fallback=DEFAULT_APP_SETTINGS["cache_max_entries"])
+            self.cache_max_age_days = config.getint('Cache', 'max_age_days', fallback=DEFAULT_APP_SETTINGS["cache_max_age_days"])
+            self.use_translation_memory.set(config.getboolean('TranslationMemory', 'enabled', fallback=DEFAULT_APP_SETTINGS["use_translation_memory"]))
+            self.memory_fuzzy_threshold = config.getfloat('TranslationMemory', 'fuzzy_threshold', fallback=DEFAULT_APP_SETTINGS["memory_fuzzy_threshold"])
+            saved_export_format = config.get('Stats', 'export_format', fallback=DEFAULT_APP_SETTINGS["stats_export_format"])
+            self.stats_export_format = saved_export_format if saved_export_format in STATS_EXPORT_FORMATS else DEFAULT_APP_SETTINGS["stats_export_format"]
+            self.stats_export_path = config.get('Stats', 'export_path', fallback=DEFAULT_APP_SETTINGS["stats_export_path"])
+            self.stats_export_interval = config.getint('Stats', 'export_interval', fallback=DEFAULT_APP_SETTINGS["stats_export_interval"])
+            self.history_max_lines = config.getint('History', 'max_lines', fallback=DEFAULT_APP_SETTINGS["history_max_lines"])
+            saved_log_format = config.get('History', 'session_log_format', fallback=DEFAULT_APP_SETTINGS["session_log_format"])
+            self.session_log_format = saved_log_format if saved_log_format in SESSION_LOG_FORMATS else DEFAULT_APP_SETTINGS["session_log_format"]
+            self.session_log_dir = config.get('History', 'session_log_dir', fallback=DEFAULT_APP_SETTINGS["session_log_dir"])
+            if config.has_section('Regions'):
+                # regionN = left,top,width,height,이름 / overlayN = x,y,width,height (N번째 영역 오버레이, 2부터)
+                regions = {}
+                for key, value in config.items('Regions'):
+                    try:
+                        if key.startswith('region'): regions[int(key[6:])] = parse_region(value)
+                        elif key.startswith('overlay'):
+                            x, y, width, height = (int(v) for v in value.split(','))
+                            self.region_overlay_geometry[int(key[7:]) - 1] = {'x': x, 'y': y, 'width': width, 'height': height}
+                    except ValueError: print(f"[Regions] 설정 형식 오류 (건너뜀): {key} = {value}")
+                self.selected_regions = [regions[index] for index in sorted(regions)]
+                assign_region_names(self.selected_regions, ",".join(region['name'] for region in self.selected_regions))
+                self.region_names.set(", ".join(region['name'] for region in self.selected_regions))
+            parse_quota_section(config, self.model_quotas)
             self.overlay_font_family.set(config.get('Overlay', 'font_family', fallback=DEFAULT_APP_SETTINGS["overlay_font_family"]))
             self.overlay_font_size.set(config.getint('Overlay', 'font_size', fallback=DEFAULT_APP_SETTINGS["overlay_font_size"]))
             self.overlay_font_color.set(config.get('Overlay', 'font_color', fallback=DEFAULT_APP_SETTINGS["overlay_font_color"]))
@@ -304,10 +642,56 @@ class App:
         config = configparser.ConfigParser()
         config['Gemini'] = {
             'api_key': self.api_key.get(), 'prompt': self.custom_prompt.get(),
-            'model': self.selected_model.get(), 'interval': round(self.translation_interval.get(), 2)
+            'model': self.selected_model.get(), 'interval': round(self.translation_interval.get(), 2),
+            'max_concurrent_requests': self.max_concurrent_requests.get(), 'use_streaming': self.use_streaming.get()
+        }
+        config['Backend'] = {
+            'name': self.translation_backend_name.get(), 'local_url': self.local_url.get(), 'local_model': self.local_model.get(),
+            'warm_up': self.warm_up_backend
         }
         config['ImageProcessing'] = {
-            'use_resize': self.use_resize.get(), 'resize_percentage': self.resize_percentage.get()
+            'use_resize': self.use_resize.get(), 'resize_percentage': self.resize_percentage.get(),
+            'resample_filter': self.resample_filter.get(), 'image_format': self.image_format.get(),
+            'image_quality': self.image_quality.get(), 'grayscale': self.grayscale.get(),
+            'autocontrast': self.autocontrast.get(), 'binarize': self.binarize.get(), 'auto_crop': self.auto_crop.get()
+        }
+        config['ChangeDetection'] = {
+            'method': self.change_method.get(), 'threshold': self.change_threshold.get(),
+            'ignore_regions': self.ignore_regions.get(), 'settle_time': round(self.settle_time.get(), 2),
+            'max_settle_time': self.max_settle_time
+        }
+        config['OCR'] = {
+            'engine': self.ocr_engine.get(), 'language': self.ocr_language.get(), 'text_only': self.ocr_text_only.get()
+        }
+        config['Capture'] = {'backend': self.capture_backend_name.get(), 'replay_dir': self.replay_dir.get()}
+        config['TranslationMemory'] = {
+            'enabled': self.use_translation_memory.get(), 'fuzzy_threshold': self.memory_fuzzy_threshold
+        }
+        assign_region_names(self.selected_regions, self.region_names.get())
+        config['Regions'] = {f"region{index + 1}": format_region(region) for index, region in enumerate(self.selected_regions)}
+        for index, overlay in enumerate(self.region_overlays, start=1):
+            if overlay.winfo_exists(): self.region_overlay_geometry[index] = dict(
+                (key, overlay.get_current_config()[key]) for key in ('x', 'y', 'width', 'height')
+            )
+        for index, geometry in self.region_overlay_geometry.items():
+            config['Regions'][f"overlay{index + 1}"] = f"{geometry['x']},{geometry['y']},{geometry['width']},{geometry['height']}"
+        config['History'] = {
+            'max_lines': self.history_max_lines, 'session_log_format': self.session_log_format,
+            'session_log_dir': self.session_log_dir
+        }
+        config['Stats'] = {
+            'export_format': self.stats_export_format, 'export_path': self.stats_export_path,
+            'export_interval': self.stats_export_interval
+        }
+        config['Hedging'] = {
+            'enabled': self.hedge_requests.get(), 'percentile': self.hedge_percentile,
+            'max_extra_rate': self.hedge_max_extra_rate, 'alternate_model': self.hedge_alternate_model
+        }
+        config['Pool'] = {'api_keys': self.pool_api_keys, 'models': self.pool_models}
+        config['Quota'] = {model: f"{q['rpm']},{q['tpm']},{q['rpd']}" for model, q in self.model_quotas.items()}
+        config['Cache'] = {
+            'use_cache': self.use_cache.get(), 'max_entries': self.cache_max_entries,
+            'max_age_days': self.cache_max_age_days
         }
         current_overlay_geom = {}
         if hasattr(self, 'overlay_window') and self.overlay_window.winfo_exists():
@@ -323,27 +707,77 @@ class App:
         with open(CONFIG_FILE, 'w', encoding='utf-8') as configfile: config.write(configfile)
         print("설정이 저장되었습니다.")
 
-    def open_region_selector(self):
-        self.root.withdraw(); ScreenRegionSelector(self.root, self.on_region_selected)
+    def open_region_selector(self, append=False):
+        capture_backend = self.create_capture_backend()
+        if not capture_backend: return
+        assign_region_names(self.selected_regions, self.region_names.get())
+        self.root.withdraw()
+        ScreenRegionSelector(
+            self.root, lambda region: self.on_region_selected(region, append), capture_backend=capture_backend,
+            existing_regions=self.selected_regions if append else None
+        )
 
-    def on_region_selected(self, region):
+    def on_region_selected(self, region, append=False):
         self.root.deiconify(); self.root.focus_force()
         if region:
-            self.selected_region = region
-            self.region_label.config(text=f"선택된 영역: X={region['left']}, Y={region['top']}, W={region['width']}, H={region['height']}")
-        else:
-            self.selected_region = None; self.region_label.config(text="선택된 영역: 없음 (취소됨)")
+            if append: self.selected_regions.append(region)
+            else: self.selected_regions = [region]
+            names = [r.get('name', '') for r in self.selected_regions]
+            assign_region_names(self.selected_regions, ",".join(names))
+            self.region_names.set(", ".join(r['name'] for r in self.selected_regions))
+            self.update_region_label()
+        elif not append:
+            self.selected_regions = []; self.region_names.set("")
+            self.region_label.config(text="선택된 영역: 없음 (취소됨)")
         self.update_start_button_state()
 
+    def update_region_label(self):
+        regions = self.selected_regions
+        if not regions: text = "선택된 영역: 없음"
+        elif len(regions) == 1:
+            region = regions[0]
+            text = f"선택된 영역: X={region['left']}, Y={region['top']}, W={region['width']}, H={region['height']}"
+        else: text = f"선택된 영역: {len(regions)}개 (한 요청으로 묶어 전송) / 이름:"
+        self.region_label.config(text=text)
+
+    def overlay_for_region(self, index):
+        """index번째 영역의 오버레이. 두 번째 영역부터는 필요할 때 만들고 저장된 위치(없으면 첫 오버레이 아래)에 배치"""
+        if index == 0: return self.overlay_window
+        while len(self.region_overlays) < index:
+            region_index = len(self.region_overlays) + 1
+            base = self.overlay_window.get_current_config()
+            geometry = self.region_overlay_geometry.get(region_index) or {
+                'x': base['x'], 'y': base['y'] + region_index * (base['height'] + 10),
+                'width': base['width'], 'height': base['height']
+            }
+            overlay_cfg = {key: base[key] for key in ('font_family', 'font_size', 'font_color', 'bg_color', 'alpha')}
+            overlay_cfg.update(geometry)
+            self.region_overlays.append(OverlayWindow(self.root, initial_config=overlay_cfg))
+        return self.region_overlays[index - 1]
+
+    def show_overlay_text(self, text):
+        """번역문을 오버레이에 표시. 영역이 여러 개면 '[이름]' 표시로 나눠 각 영역의 오버레이에 표시"""
+        names = self.active_region_names
+        if len(names) < 2: self.overlay_window.show_text(text); return
+        region_texts = split_region_translations(text, names)
+        for index, name in enumerate(names):
+            if region_texts[name]: self.overlay_for_region(index).show_text(region_texts[name])
+
     def update_start_button_state(self):
-        can_start = self.api_key.get() and self.selected_region and not self.is_translating
+        needs_api_key = self.translation_backend_name.get() == "gemini"
+        can_start = (self.api_key.get() or not needs_api_key) and self.selected_regions and not self.is_translating
         self.start_button.config(state=tk.NORMAL if can_start else tk.DISABLED)
         if hasattr(self, 'api_key_status_label'):
             self.api_key_status_label.config(text="API 키: " + ("설정됨" if self.api_key.get() else "미설정"))
         controls_to_disable_during_translation = [
-            self.select_region_button, self.api_key_button, self.prompt_edit_button,
-            self.model_menu, self.interval_spinbox,
-            self.resize_checkbutton, self.resize_spinbox, self.reset_settings_button
+            self.select_region_button, self.add_region_button, self.region_names_entry, self.api_key_button, self.prompt_edit_button,
+            self.model_menu, self.interval_spinbox, self.concurrency_spinbox, self.streaming_checkbutton, self.hedge_checkbutton,
+            self.resize_checkbutton, self.resize_spinbox, self.reset_settings_button,
+            self.change_method_menu, self.change_threshold_spinbox, self.settle_time_spinbox, self.ignore_regions_entry,
+            self.cache_checkbutton, self.capture_backend_menu,
+            self.resample_menu, self.image_format_menu, self.image_quality_spinbox,
+            self.grayscale_checkbutton, self.autocontrast_checkbutton, self.binarize_checkbutton, self.auto_crop_checkbutton,
+            self.ocr_engine_menu, self.memory_checkbutton, self.backend_menu
         ]
         if self.is_translating:
             self.stop_button.config(state=tk.NORMAL)
@@ -354,137 +788,234 @@ class App:
             for widget in controls_to_disable_during_translation:
                 if widget and widget != self.resize_spinbox : widget.config(state=tk.NORMAL)
             self.toggle_resize_options_state()
+        self.toggle_replay_options_state()
+        self.toggle_ocr_options_state()
+        self.toggle_backend_options_state()
 
     def toggle_overlay_visibility(self):
-        if self.overlay_window.winfo_viewable(): self.overlay_window.hide()
+        if self.overlay_window.winfo_viewable():
+            self.overlay_window.hide()
+            for overlay in self.region_overlays: overlay.hide()
         else:
             self.apply_overlay_settings()
             self.overlay_window.show_text(self.overlay_window.current_config.get('text', '번역 대기 중...'))
+            for overlay in self.region_overlays[:max(0, len(self.active_region_names) - 1)]:
+                overlay.show_text(overlay.current_config.get('text', '...'))
 
     def start_translation(self):
-        if not self.api_key.get(): messagebox.showerror("오류", "Gemini API 키를 먼저 설정해주세요."); return
-        if not self.selected_region: messagebox.showerror("오류", "번역할 화면 영역을 먼저 지정해주세요."); return
+        use_gemini = self.translation_backend_name.get() == "gemini"
+        if use_gemini and not self.api_key.get(): messagebox.showerror("오류", "Gemini API 키를 먼저 설정해주세요."); return
+        if not self.selected_regions: messagebox.showerror("오류", "번역할 화면 영역을 먼저 지정해주세요."); return
         if not self.custom_prompt.get(): messagebox.showerror("오류", "프롬프트가 비어있습니다. 프롬프트를 설정해주세요."); return
         self.save_config()
         try:
-            genai.configure(api_key=self.api_key.get())
-            self.gemini_client = genai.GenerativeModel(self.selected_model.get())
-        except Exception as e: messagebox.showerror("API 오류", f"Gemini 클라이언트 초기화 실패: {e}"); return
+            self.translation_backend = create_planned_backend(self.translation_backend_plan()) # 이전에 만든 클라이언트/연결 재사용
+            if self.hedge_requests.get(): self.translation_backend = self.create_hedged_backend(self.translation_backend)
+        except Exception as e: messagebox.showerror("API 오류", f"번역 백엔드 초기화 실패: {e}"); return
+        capture_backend = self.create_capture_backend()
+        if not capture_backend: return
+        try: ocr_engine = create_ocr_engine(self.ocr_engine.get(), self.ocr_language.get())
+        except ImportError as e: messagebox.showerror("OCR 오류", f"OCR 엔진을 사용할 수 없습니다 (pip install pytesseract): {e}"); return
+        if self.use_cache.get() and not self.translation_cache:
+            try: self.translation_cache = TranslationCache(CACHE_FILE, max_entries=self.cache_max_entries, max_age_days=self.cache_max_age_days)
+            except Exception as e: print(f"번역 캐시를 열 수 없습니다 (캐시 없이 진행): {e}")
+        if self.use_translation_memory.get() and self.translation_memory is None:
+            try: self.translation_memory = TranslationMemory(MEMORY_FILE, fuzzy_threshold=self.memory_fuzzy_threshold)
+            except Exception as e: print(f"번역 메모리를 열 수 없습니다 (메모리 없이 진행): {e}")
         self.is_translating = True; self.update_start_button_state()
         self.translated_text_area.config(state=tk.NORMAL); self.translated_text_area.delete('1.0', tk.END)
         self.translated_text_area.insert(tk.END, "번역을 시작합니다...\n"); self.translated_text_area.config(state=tk.DISABLED)
         self.apply_overlay_settings(); self.overlay_window.show_text("번역 준비 중...")
-        self.translation_thread = threading.Thread(target=self.translation_loop, daemon=True)
-        self.translation_thread.start()
+        self.last_displayed_seq = -1; self.streaming_seq = -1; self.stream_active = False
+        from TranslationPipeline import TranslationPipeline # 보통은 시작 직후 백그라운드에서 이미 불러온 상태
+        self.pipeline = TranslationPipeline(
+            self.collect_pipeline_settings(), self.translation_backend, self.update_translated_text,
+            cache=self.translation_cache if self.use_cache.get() else None,
+            on_cache_lookup=lambda: self.root.after(0, self.update_cache_stats_label),
+            capture_backend=capture_backend, ocr_engine=ocr_engine,
+            translation_memory=self.translation_memory if self.use_translation_memory.get() else None,
+            on_memory_lookup=lambda: self.root.after(0, self.update_memory_stats_label),
+            on_partial=self.update_partial_text,
+            on_stage_timing=self.pipeline_stats.record,
+            on_frame_encoded=lambda size, ms: self.root.after(0, lambda: self.update_encode_stats_label(size, ms)),
+            on_schedule_update=lambda scheduler: self.root.after(
+                0, lambda: self.update_schedule_status_label(scheduler.effective_interval, scheduler.daily_count, scheduler.rpd)
+            )
+        )
+        for overlay in self.region_overlays[max(0, len(self.active_region_names) - 1):]: overlay.hide() # 이전보다 영역이 줄어든 경우
+        if self.session_log_format != "none":
+            try: self.session_log = SessionLogWriter(session_log_path(self.session_log_dir, self.session_log_format), self.session_log_format)
+            except (OSError, ValueError) as e: print(f"세션 기록 파일을 열 수 없습니다 (기록 없이 진행): {e}")
+        self.pipeline_stats.reset(); self._last_stats_export = time.monotonic()
+        self.pipeline.start()
+        self.update_stats_panel()
+
+    def collect_pipeline_settings(self):
+        # 워커 스레드에서 Tk 변수를 읽지 않도록 시작 시점의 설정을 복사해 전달
+        current_prompt = self.custom_prompt.get()
+        if not current_prompt: current_prompt = DEFAULT_PROMPT; self.custom_prompt.set(DEFAULT_PROMPT)
+        regions = assign_region_names([dict(region) for region in self.selected_regions], self.region_names.get())
+        self.active_region_names = [region['name'] for region in regions]
+        quota = plan_quota(self.translation_backend_plan(), self.model_quotas) # 로컬 서버는 할당량 없음 (요청 간격만 적용)
+        return {
+            'regions': regions, 'prompt': current_prompt,
+            'model': self.translation_backend.model if self.translation_backend else self.selected_model.get(),
+            'interval': self.translation_interval.get(), 'max_concurrent_requests': self.max_concurrent_requests.get(),
+            'use_streaming': self.use_streaming.get(),
+            'use_resize': self.use_resize.get(), 'resize_percentage': self.resize_percentage.get(),
+            'resample_filter': self.resample_filter.get(), 'image_format': self.image_format.get(),
+            'image_quality': self.image_quality.get(), 'grayscale': self.grayscale.get(),
+            'autocontrast': self.autocontrast.get(), 'binarize': self.binarize.get(), 'auto_crop': self.auto_crop.get(),
+            'change_method': self.change_method.get(), 'change_threshold': self.change_threshold.get(),
+            'ignore_regions': parse_ignore_regions(self.ignore_regions.get()),
+            'settle_time': max(0.0, self.settle_time.get()), 'max_settle_time': self.max_settle_time,
+            'capture_backend': self.capture_backend_name.get(), 'replay_dir': self.replay_dir.get(),
+            'ocr_engine': self.ocr_engine.get(), 'ocr_language': self.ocr_language.get(),
+            'ocr_text_only': self.ocr_text_only.get(), 'text_prompt': DEFAULT_TEXT_PROMPT,
+            'quota': quota,
+        }
 
     def stop_translation(self):
         self.is_translating = False; self.update_start_button_state()
+        if self._stats_after_id: self.root.after_cancel(self._stats_after_id); self._stats_after_id = None
+        if self.pipeline: self.update_stats_panel(); self.pipeline.stop(); self.pipeline = None
+        if self.session_log: self.session_log.close(); self.session_log = None
         self.update_translated_text("번역이 중지되었습니다.\n", on_overlay=True)
         if self.overlay_window: self.overlay_window.show_text("번역 중지됨")
 
-    def translation_loop(self):
-        current_prompt = self.custom_prompt.get()
-        if not current_prompt: current_prompt = DEFAULT_PROMPT; self.root.after(0, lambda: self.custom_prompt.set(DEFAULT_PROMPT))
-        last_image_hash = None; no_change_count = 0
-        current_interval = self.translation_interval.get()
-        if current_interval <= 0: current_interval = 0.2
-        should_resize = self.use_resize.get()
-        resize_percent = self.resize_percentage.get() / 100.0
-
-        while self.is_translating:
-            if not self.selected_region: break
-            try:
-                screenshot_pil = pyautogui.screenshot(region=(
-                    self.selected_region['left'], self.selected_region['top'],
-                    self.selected_region['width'], self.selected_region['height']
-                ))
-                if screenshot_pil.mode == 'RGBA': screenshot_pil = screenshot_pil.convert('RGB')
-                if should_resize and resize_percent > 0 and resize_percent < 1.0:
-                    original_width, original_height = screenshot_pil.size
-                    new_width = int(original_width * resize_percent); new_height = int(original_height * resize_percent)
-                    if new_width > 0 and new_height > 0: screenshot_pil = screenshot_pil.resize((new_width, new_height), Image.LANCZOS)
-                current_image_hash = hash(screenshot_pil.tobytes())
-                if current_image_hash == last_image_hash:
-                    no_change_count += 1
-                    if no_change_count >= 3: time.sleep(current_interval); continue
-                else: last_image_hash = current_image_hash; no_change_count = 0
-                img_byte_arr = io.BytesIO(); screenshot_pil.save(img_byte_arr, format='JPEG')
-                img_bytes = img_byte_arr.getvalue()
-                image_parts = [{"mime_type": "image/jpeg", "data": img_bytes}]
-
-                if self.gemini_client:
-                    response = self.gemini_client.generate_content([current_prompt] + image_parts, stream=False)
-                    translated_text = "번역 실패"
-                    if response.parts: translated_text = response.text.strip()
-                    elif response.prompt_feedback and response.prompt_feedback.block_reason:
-                        translated_text = f"차단됨: {response.prompt_feedback.block_reason_message}"
-                    elif not response.candidates: translated_text = "응답 후보 없음"
-                    self.update_translated_text(translated_text + "\n---\n", on_overlay=True)
-                time.sleep(current_interval)
-
-            except ResourceExhausted as e:
-                error_message_detail = str(e)
-                parsed_details = self.parse_quota_error_details(error_message_detail)
-                user_message = f"API 할당량 초과: {error_message_detail}\n"
-                wait_time_for_user_info = "정보 없음"
-                if parsed_details:
-                    quota_id_str = parsed_details.get("quota_id", "정보 없음")
-                    quota_value_str = parsed_details.get("quota_value", "정보 없음")
-                    retry_delay_str = parsed_details.get("retry_delay", "정보 없음")
-                    user_message = (
-                        "API 할당량 초과\n"
-                        f"초과 사항 : {quota_id_str}\n할당량 : {quota_value_str}\n"
-                    )
-                    if retry_delay_str and retry_delay_str != "정보 없음":
-                         wait_time_for_user_info = f"{retry_delay_str}초"
-                user_message += f"권장 재시도 대기: {wait_time_for_user_info}."
-                print(user_message); self.update_translated_text(user_message + "\n", on_overlay=True)
-                time.sleep(max(2.0, current_interval))
-
-            except Exception as e:
-                error_message = f"번역 중 오류: {type(e).__name__} - {e}\n"
-                print(error_message); self.update_translated_text(error_message, on_overlay=True)
-                if "rate limit" in str(e).lower():
-                    self.update_translated_text("API 요청 빈도 제한. 잠시 후 재시도.\n", on_overlay=True)
-                    time.sleep(max(10.0, current_interval * 2))
-                else: time.sleep(max(2.0, current_interval))
-        print("번역 루프 종료.")
-
-    def parse_quota_error_details(self, error_message_string):
-        details = {}
-        try:
-            quota_id_match = re.search(r'quota_id:\s*"([^"]+)"', error_message_string, re.IGNORECASE)
-            if quota_id_match: details["quota_id"] = quota_id_match.group(1)
-            quota_value_match = re.search(r'quota_value:\s*(\d+)', error_message_string, re.IGNORECASE)
-            if quota_value_match: details["quota_value"] = quota_value_match.group(1)
-            retry_delay_match = re.search(r'retry_delay\s*{\s*seconds:\s*(\d+)\s*}', error_message_string, re.IGNORECASE)
-            if retry_delay_match: details["retry_delay"] = retry_delay_match.group(1)
+    def update_partial_text(self, text, seq):
+        # 워커 스레드에서 청크마다 호출됨. 최신 내용만 보관하고 STREAM_UPDATE_INTERVAL_MS마다 한 번만 화면에 반영
+        self._pending_partial = (text, seq)
+        if not self._partial_flush_scheduled:
+            self._partial_flush_scheduled = True
+            self.root.after(STREAM_UPDATE_INTERVAL_MS, self._flush_partial_text)
+
+    def _flush_partial_text(self):
+        self._partial_flush_scheduled = False
+        pending, self._pending_partial = self._pending_partial, None
+        if not pending or not self.is_translating: return
+        text, seq = pending
+        if seq <= self.last_displayed_seq or seq < self.streaming_seq: return
+        if self.translated_text_area.winfo_exists():
+            self.translated_text_area.config(state=tk.NORMAL)
+            if self.stream_active: self.translated_text_area.delete("stream_start", "end-1c") # 더 새 프레임이면 이전 부분 번역문을 대체
             else:
-                retry_delay_simple_match = re.search(r'retry_delay[:\s]*(\d+)', error_message_string, re.IGNORECASE)
-                if retry_delay_simple_match : details["retry_delay"] = retry_delay_simple_match.group(1)
-            return details if details else None
-        except Exception as parse_error: print(f"할당량 오류 메시지 파싱 중 에러: {parse_error}"); return None
-
-    def update_translated_text(self, text, on_overlay=False):
+                # 스트리밍 시작: 부분 번역문이 들어갈 위치를 표시 (뒤에 삽입해도 움직이지 않도록 왼쪽 gravity)
+                self.translated_text_area.mark_set("stream_start", "end-1c")
+                self.translated_text_area.mark_gravity("stream_start", tk.LEFT)
+            self.translated_text_area.insert(tk.END, text)
+            self.translated_text_area.see(tk.END); self.translated_text_area.config(state=tk.DISABLED)
+        self.streaming_seq = seq; self.stream_active = True
+        if hasattr(self, 'overlay_window') and self.overlay_window: self.show_overlay_text(text.strip() or '...')
+
+    def update_stats_panel(self):
+        # 번역 중에는 STATS_UPDATE_INTERVAL_MS마다 갱신하고, 설정된 주기마다 파일로 내보냄
+        if not self.pipeline: return
+        snapshot = self.pipeline_stats.snapshot(self.pipeline.counters)
+        lines = [f"요청/분 {snapshot['requests_per_min']:.1f} · 건너뛴 프레임 {snapshot['skip_rate'] * 100:.0f}%"
+                 f" · 할당량 오류 {snapshot['quota_errors']} · 기타 오류 {snapshot['errors']}"]
+        for stage, stats in snapshot['stages'].items():
+            lines.append(f"{stage:<10} p50 {stats['p50'] * 1000:7.1f}  p95 {stats['p95'] * 1000:7.1f}  p99 {stats['p99'] * 1000:7.1f} ms  ({stats['count']})")
+        backend = self.translation_backend
+        if isinstance(backend, HedgedBackend):
+            hedge = backend.status()
+            delay = f"{hedge['delay'] * 1000:.0f} ms 초과 시" if hedge['delay'] is not None else "응답 시간 수집 중"
+            lines.append(f"중복 요청 {hedge['hedged']} / {hedge['requests']} (먼저 도착 {hedge['hedge_wins']}) · {delay}")
+            backend = backend.backend
+        if isinstance(backend, BackendPool):
+            for member in backend.status():
+                cooldown = f"  대기 {member['cooldown']:.0f}초" if member['cooldown'] else ""
+                lines.append(f"{member['label']:<26} 요청 {member['requests']:>4}  실패 {member['failures']:>3}  오류율 {member['error_rate'] * 100:3.0f}%{cooldown}")
+        self.stats_label.config(text="\n".join(lines))
+        now = time.monotonic()
+        if self.stats_export_format != "none" and self.stats_export_path and now - self._last_stats_export >= self.stats_export_interval:
+            self._last_stats_export = now
+            try: export_stats(snapshot, self.stats_export_path, self.stats_export_format)
+            except OSError as e: print(f"통계 내보내기 실패: {e}")
+        if self.is_translating: self._stats_after_id = self.root.after(STATS_UPDATE_INTERVAL_MS, self.update_stats_panel)
+
+    def update_cache_stats_label(self):
+        cache = self.translation_cache
+        hits, total = (cache.hits, cache.hits + cache.misses) if cache else (0, 0)
+        ratio = hits / total * 100 if total else 0
+        self.cache_stats_label.config(text=f"캐시 적중: {hits} / 요청: {total} ({ratio:.0f}%)")
+
+    def update_encode_stats_label(self, size, encode_ms):
+        self.encode_stats_label.config(text=f"전송 크기: {size / 1024:.1f} KB / 인코딩: {encode_ms:.1f} ms")
+
+    def update_schedule_status_label(self, effective_interval, daily_count, daily_limit):
+        self.schedule_status_label.config(text=f"요청 간격: {effective_interval:.2f}초 / 오늘 요청: {daily_count} / {daily_limit or '무제한'}")
+
+    def update_memory_stats_label(self):
+        memory = self.translation_memory
+        if memory is None: return
+        self.memory_stats_label.config(text=f"저장 문장: {len(memory)} / 메모리 적중: {memory.hits} (유사 {memory.fuzzy_hits})")
+
+    def clear_translation_cache(self):
+        if not messagebox.askyesno("캐시 비우기", "저장된 번역 캐시를 모두 삭제하시겠습니까?"): return
+        try:
+            if self.translation_cache: self.translation_cache.clear()
+            elif os.path.exists(CACHE_FILE): TranslationCache(CACHE_FILE).clear()
+        except Exception as e: messagebox.showerror("오류", f"캐시 삭제 실패: {e}"); return
+        self.update_cache_stats_label()
+
+    def update_translated_text(self, text, on_overlay=False, seq=None):
+        show_on_overlay = on_overlay and hasattr(self, 'overlay_window') and self.overlay_window
+        posted = time.perf_counter()
         def _update_main_window():
+            if seq is not None:
+                # 동시 요청의 응답은 순서가 뒤바뀌어 도착할 수 있으므로 이미 표시된 것보다 오래된 프레임의 결과는 버림
+                if seq <= self.last_displayed_seq or seq < self.streaming_seq: return
+                self.last_displayed_seq = seq
             if self.translated_text_area.winfo_exists():
-                self.translated_text_area.config(state=tk.NORMAL); self.translated_text_area.insert(tk.END, text)
+                self.translated_text_area.config(state=tk.NORMAL)
+                if self.stream_active and seq is not None:
+                    # 스트리밍 중 표시하던 부분 번역문을 최종 결과로 교체 (더 새 프레임의 결과가 먼저 끝난 경우에도 지움.
+                    # 남겨 두면 다음 부분 번역문이 stream_start부터 지우면서 이 결과까지 지워 버림)
+                    self.translated_text_area.delete("stream_start", "end-1c")
+                    self.translated_text_area.mark_unset("stream_start"); self.stream_active = False
+                elif seq is None: self.stream_active = False # 오류 메시지 뒤에 오는 부분 번역문이 메시지를 지우지 않도록
+                self.translated_text_area.insert(tk.END, text)
+                self.trim_translated_text()
                 self.translated_text_area.see(tk.END); self.translated_text_area.config(state=tk.DISABLED)
+            if self.session_log:
+                self.session_log.write(text.replace("\n---\n", "").strip(), seq=seq, kind="translation" if seq is not None else "message")
+            if show_on_overlay:
+                overlay_text = text.replace("\n---\n", "").strip()
+                if not overlay_text: overlay_text = self.overlay_window.current_config.get('text', '...')
+                if seq is not None: self.show_overlay_text(overlay_text)
+                else: self.overlay_window.show_text(overlay_text) # 상태/오류 메시지는 첫 오버레이에만
+            # Tk 이벤트 루프 대기 시간까지 포함한 화면 반영 시간
+            if seq is not None: self.pipeline_stats.record('render', time.perf_counter() - posted)
         if self.root.winfo_exists(): self.root.after(0, _update_main_window)
-        if on_overlay and hasattr(self, 'overlay_window') and self.overlay_window:
-            overlay_text = text.replace("\n---\n", "").strip()
-            if not overlay_text: overlay_text = self.overlay_window.current_config.get('text', '...')
-            self.root.after(0, lambda: self.overlay_window.show_text(overlay_text))
+
+    def trim_translated_text(self):
+        # 오래된 줄을 앞에서부터 지워 위젯 크기를 일정하게 유지 (전체 기록은 세션 파일에 남음)
+        line_count = int(self.translated_text_area.index("end-1c").split('.')[0])
+        excess = line_count - self.history_max_lines
+        if self.history_max_lines > 0 and excess > 0: self.translated_text_area.delete("1.0", f"{excess + 1}.0")
 
     def on_closing(self):
         if self.is_translating:
-            if messagebox.askokcancel("종료 확인", "번역 중입니다. 정말로 종료하시겠습니까?"): self.is_translating = False
+            if messagebox.askokcancel("종료 확인", "번역 중입니다. 정말로 종료하시겠습니까?"):
+                self.is_translating = False
+                if self.pipeline: self.pipeline.stop()
             else: return
         self.save_config()
+        if self.session_log: self.session_log.close()
+        if self.translation_cache: self.translation_cache.close()
+        if self.translation_memory is not None: self.translation_memory.close()
         if hasattr(self, 'overlay_window') and self.overlay_window.winfo_exists(): self.overlay_window.destroy()
+        for overlay in self.region_overlays:
+            if overlay.winfo_exists(): overlay.destroy()
         self.root.destroy()
 
 if __name__ == '__main__':
+    startup_profiler.mark("모듈 import")
     main_root = tk.Tk()
+    startup_profiler.mark("Tk 초기화")
     app = App(main_root)
+    main_root.update_idletasks()
+    startup_profiler.mark("첫 화면 표시")
+    startup_profiler.report()
     main_root.mainloop()
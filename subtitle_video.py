@@ -0,0 +1,101 @@
+# subtitle_video.py
+"""녹화한 게임 영상(또는 GIF/APNG)의 대사를 번역해 SRT 자막으로 저장
+
+--interval초 간격으로 읽은 프레임 중 번역 영역의 글자가 바뀌고 화면이 멈춘 키프레임만 요청 (변화 감지/출력 대기는
+실시간 번역과 같은 설정을 영상 시간 기준으로 적용). 요청, 중복 제거, 이어서 실행은 batch_translate.py와 같음
+
+예) python subtitle_video.py gameplay.mp4 --region 100,700,1200,250 --settle-time 0.4 --concurrency 4
+    python subtitle_video.py clip.gif --backend openai --local-url http://127.0.0.1:8080/v1
+동영상은 opencv-python 패키지가 필요 (GIF/APNG/WebP는 Pillow만으로 읽음)
+"""
+import os
+import sys
+import json
+import argparse
+
+from FrameChangeDetector import FrameChangeDetector
+from VideoSource import VideoFrameReader, detect_keyframes
+from TranslationCache import TranslationCache
+from SessionLogWriter import SRT_DEFAULT_DURATION, srt_entry
+from RegionLayout import assign_region_names, parse_region, split_region_translations
+from AppSettings import CACHE_FILE, GEMINI_MODEL_QUOTAS, parse_quota_section
+from batch_translate import BatchTranslator, FramePreparer
+from headless import add_pipeline_arguments, add_backend_arguments, build_pipeline_settings, create_backend, load_config, load_prompt
+
+def keyframe_key(video_name, start):
+    return f"{video_name}@{start:.3f}"
+
+def keyframe_items(reader, detector, preparer, translator, starts):
+    """키프레임마다 (매니페스트 항목, 전처리 결과). 키프레임 시작 시각은 starts에 모으고, 이전 실행에서 끝난 키프레임은 건너뜀"""
+    stat = os.stat(reader.path)
+    video_name = os.path.basename(reader.path)
+    for start, image in detect_keyframes(reader.frames(), detector, preparer.compose):
+        starts.append(start)
+        item = {'file': keyframe_key(video_name, start), 'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'extra': {'start': round(start, 3)}}
+        if translator.is_done(item): translator.count('skipped'); continue
+        yield item, preparer(image)
+
+def subtitle_text(text, region_names):
+    if not region_names: return text.strip()
+    return "\n".join(part for part in split_region_translations(text, region_names).values() if part)
+
+def write_subtitles(path, video_name, starts, end_time, records, region_names):
+    """키프레임 순서로 SRT 기록. 각 자막은 다음 키프레임까지 표시하고, 글자가 없거나 번역하지 못한 구간은 비움.
+    이어지는 키프레임의 번역문이 같으면 한 자막으로 합침. 기록한 자막 수 반환"""
+    cues = []
+    for position, start in enumerate(starts):
+        end = starts[position + 1] if position + 1 < len(starts) else max(end_time, start + SRT_DEFAULT_DURATION)
+        record = records.get(keyframe_key(video_name, start))
+        text = subtitle_text(record['text'] or "", region_names) if record else ""
+        if not text: continue
+        if cues and cues[-1][2] == text and cues[-1][1] == start: cues[-1][1] = end; continue
+        cues.append([start, end, text])
+    with open(path, 'w', encoding='utf-8') as f:
+        for index, (start, end, text) in enumerate(cues, 1): f.write(srt_entry(index, start, end, text))
+    return len(cues)
+
+def run(args):
+    if args.ocr_engine != "none" or args.ocr_text_only: raise SystemExit("영상 번역은 이미지 요청만 지원합니다. (OCR 옵션 없이 실행하세요)")
+    try: reader = VideoFrameReader(args.video, args.interval)
+    except ValueError as e: raise SystemExit(str(e))
+    config = load_config()
+    model_quotas = parse_quota_section(config, {model: dict(quota) for model, quota in GEMINI_MODEL_QUOTAS.items()})
+    backend, quota = create_backend(args, config, model_quotas)
+    regions = [parse_region(value) for value in args.region or []]
+    regions = assign_region_names(regions, ",".join(region['name'] for region in regions)) if regions else [None]
+    settings = build_pipeline_settings(args, quota, regions=regions, prompt=load_prompt(args), model=backend.model)
+    base_path = os.path.splitext(args.video)[0]
+    cache = TranslationCache(CACHE_FILE) if args.cache else None
+    translator = BatchTranslator(
+        settings, backend, args.manifest or args.video + ".translations.jsonl", os.path.dirname(os.path.abspath(args.video)), cache=cache
+    )
+    if not args.restart: translator.load_manifest()
+    detector = FrameChangeDetector(
+        method=settings['change_method'], threshold=settings['change_threshold'], ignore_regions=settings['ignore_regions'],
+        settle_time=settings['settle_time'], max_settle_time=settings['max_settle_time']
+    )
+    preparer = FramePreparer(settings, skip_blank=not args.translate_blank)
+    starts = []
+    try: counters = translator.translate_prepared(keyframe_items(reader, detector, preparer, translator, starts), resume=not args.restart)
+    finally:
+        if cache: cache.close()
+    output_path = args.output or base_path + ".srt"
+    subtitles = write_subtitles(output_path, os.path.basename(args.video), starts, reader.end_time, translator.completed, translator.region_names)
+    print(f"키프레임 {len(starts)}개 ({reader.end_time:.1f}초), 자막 {subtitles}개 → {output_path}", file=sys.stderr)
+    print(json.dumps(dict(counters, keyframes=len(starts), subtitles=subtitles, duration=round(reader.end_time, 1)), ensure_ascii=False))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="게임 영상/GIF의 대사 키프레임만 번역해 SRT 자막으로 저장 (중단 후 이어서 실행 가능)")
+    parser.add_argument('video', help="동영상 또는 움직이는 이미지 파일")
+    parser.add_argument('--output', help="SRT 파일 (기본: 영상 이름.srt)")
+    parser.add_argument('--manifest', help="번역 기록 파일 (기본: 영상 파일 이름.translations.jsonl)")
+    parser.add_argument('--region', action='append', help="영상에서 번역할 영역 'left,top,width,height[,이름]' (지정하지 않으면 전체)")
+    parser.add_argument('--translate-blank', action='store_true', help="글자가 없어 보이는 키프레임도 요청")
+    parser.add_argument('--cache', action='store_true', help="번역 캐시 사용 (실시간 번역과 공유)")
+    parser.add_argument('--restart', action='store_true', help="이전 번역 기록을 무시하고 처음부터 번역")
+    add_backend_arguments(parser)
+    add_pipeline_arguments(parser)
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    run(parse_args())